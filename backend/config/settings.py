@@ -33,6 +33,25 @@ class Settings(BaseSettings):
     GEMINI_API_KEY: str = os.getenv("GEMINI_API_KEY", "")
     GEMINI_MODEL: str = os.getenv("GEMINI_MODEL", "gemini-2.5-pro")
 
+    # LLM Throughput Settings (batch note generation)
+    LLM_BATCH_WORKERS: int = int(os.getenv("LLM_BATCH_WORKERS", "4"))
+    # Shared by the API and the job worker processes (kept in the job database)
+    LLM_REQUESTS_PER_MINUTE: int = int(os.getenv("LLM_REQUESTS_PER_MINUTE", "20"))
+    LLM_MAX_RETRIES: int = int(os.getenv("LLM_MAX_RETRIES", "3"))
+
+    # LLM Response Cache Settings
+    LLM_CACHE_ENABLED: bool = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+    LLM_CACHE_DIR: Path = Path(os.getenv("LLM_CACHE_DIR", "data/.llm_cache"))
+    LLM_CACHE_MAX_MB: int = int(os.getenv("LLM_CACHE_MAX_MB", "200"))
+    LLM_CACHE_MAX_AGE_DAYS: int = int(os.getenv("LLM_CACHE_MAX_AGE_DAYS", "30"))
+
+    # Job Queue Settings (JOB_WORKERS=0 leaves jobs to a standalone worker pool)
+    JOB_DB_PATH: Path = Path(os.getenv("JOB_DB_PATH", "data/.jobs/jobs.sqlite3"))
+    JOB_WORKERS: int = int(os.getenv("JOB_WORKERS", "2"))
+    JOB_MAX_PER_ENTITY: int = int(os.getenv("JOB_MAX_PER_ENTITY", "1"))
+    JOB_STALE_SECONDS: int = int(os.getenv("JOB_STALE_SECONDS", "60"))
+    JOB_MAX_ATTEMPTS: int = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+
     # Directory Settings
     CONFIG_DIR: Path = Path(os.getenv("CONFIG_DIR", "config"))
     DATA_DIR: Path = Path(os.getenv("DATA_DIR", "data"))
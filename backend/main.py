@@ -1,16 +1,15 @@
 
 from pathlib import Path
+import asyncio
 import json
 import logging
 import os
 import traceback
-import uuid
 import time
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import List, Optional
 
-import pandas as pd
-from fastapi import BackgroundTasks, FastAPI, File, Form, HTTPException, UploadFile, Request
+from fastapi import FastAPI, File, Form, HTTPException, UploadFile, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse, JSONResponse
 from fastapi.exceptions import RequestValidationError
@@ -37,12 +36,21 @@ from backend.routes.period_routes import router as period_router
 from backend.services.ai_orchestrator_service import AIOrchestratorService
 
 # Import Note Generation services and models
-from backend.services.company_service import CompanyService
+from backend.services.company_service import CompanyService, config_index
 from backend.services.file_service import FileService
 from backend.services.financial_statement_service import FinancialStatementService
+from backend.services.job_queue_service import current_period_payload, job_queue, job_workers
+from backend.services.group_consolidation_service import (
+    GroupConsolidationService,
+    clear_translation_cache,
+    translation_cache_stats,
+)
 from backend.services.mapping_service import MappingService
 from backend.services.path_service import PathService
 from backend.services.validation_service import ValidationService
+from backend.utils.sheet_preview import close_workbooks, preview_sheet, release_workbook
+from backend.utils.upload_sidecar import write_sidecar
+from backend.utils.workbook_cache import read_excel_cached, workbook_cache
 from backend.routes import pnl_finalyzer_routes
 from backend.routes import pnl_schedule_finalyzer_routes
 from backend.routes.bs_finalyzer_routes import router as bs_finalyzer_router
@@ -57,6 +65,7 @@ from backend.routes.currency_routes import router as currency_router
 from backend.routes.sap_routes import router as sap_router
 from backend.routes.note_excel_routes import router as note_excel_generator
 from backend.routes.statement_viewer_routes import router as statement_viewer_router
+from backend.routes.job_routes import router as job_router
 
 # ============================================================================
 # LOGGING CONFIGURATION
@@ -116,8 +125,22 @@ mapping_service = MappingService()
 # Application startup timestamp for monitoring and health checks
 app_start_time = time.time()
 
-# In-memory storage for processing status (in production, use Redis or database)
-processing_status: Dict[str, ProcessingStatus] = {}
+# Job status -> ProcessingStatus.status reported to the frontend
+_PROCESSING_STATUS_NAMES = {"queued": "started", "running": "processing"}
+
+
+def _processing_status_from_job(job: dict) -> ProcessingStatus:
+    """Map a queued/running/finished job to the ProcessingStatus polled by the frontend"""
+    return ProcessingStatus(
+        id=job["id"],
+        status=_PROCESSING_STATUS_NAMES.get(job["status"], job["status"]),
+        progress=job["progress"],
+        message=job["message"],
+        entity=job["entity"],
+        start_time=job["started_at"] or job["created_at"],
+        end_time=job["finished_at"],
+        result=job["result"],
+    )
 
 # Include authentication and note generation routes with /api prefix
 app.include_router(api_router, prefix="/api")
@@ -155,6 +178,7 @@ app.include_router(adjustments_router, prefix="/api", tags=["Adjustments Analysi
 app.include_router(sap_router, prefix="/api", tags=["SAP Integration"])
 app.include_router(note_excel_generator, prefix="/api/notes", tags=["Note Excel generation"])
 app.include_router(statement_viewer_router, prefix="/api", tags=["Statement Viewer"])
+app.include_router(job_router, prefix="/api", tags=["Jobs"])
 
 
 @app.middleware("http")
@@ -239,6 +263,32 @@ async def health_check():
         )
 
 
+@app.get("/api/cache/workbooks")
+async def workbook_cache_stats():
+    """Parsed-workbook cache metrics (hits, misses, evictions, memory use)"""
+    return workbook_cache.stats()
+
+
+@app.delete("/api/cache/workbooks")
+async def clear_workbook_cache():
+    """Drop all parsed workbooks from the cache"""
+    workbook_cache.clear()
+    return {"message": "Workbook cache cleared"}
+
+
+@app.get("/api/cache/group-translations")
+async def group_translation_cache_stats():
+    """Cached per-entity FX translations used by the group consolidation"""
+    return translation_cache_stats()
+
+
+@app.delete("/api/cache/group-translations")
+async def clear_group_translation_cache():
+    """Force every entity to be re-translated on the next group consolidation"""
+    clear_translation_cache()
+    return {"message": "Group translation cache cleared"}
+
+
 # Startup event
 @app.on_event("startup")
 async def startup_event():
@@ -273,7 +323,12 @@ async def startup_event():
         print(f"   ✅ {entity}")
 
     # Print startup information
+    # Job workers (adjustments, note batches, statements)
+    workers = job_workers.start()
+    print(f"👷 Job workers: {workers} (queue: {settings.JOB_DB_PATH})")
+
     print("🔍 Discovering companies...")
+    config_index.refresh()
     companies = CompanyService.discover_companies()
     
     print(f"\n{'=' * 70}")
@@ -291,6 +346,13 @@ async def startup_event():
     print(f"{'=' * 70}\n")
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop job workers (their running jobs are re-queued on the next start) and close preview workbooks"""
+    job_workers.stop()
+    close_workbooks()
+
+
 # Entity Management
 @app.get("/api/entities")
 async def get_entities():
@@ -363,42 +425,45 @@ async def delete_file(
         raise HTTPException(status_code=500, detail=str(e)) from e
 
 
+def _preview_columns(columns: Optional[str]) -> Optional[List[str]]:
+    """Parse a comma-separated column list from a preview query"""
+    if not columns:
+        return None
+    return [c.strip() for c in columns.split(",") if c.strip()] or None
+
+
 @app.get("/api/files/{entity}/preview")
 async def preview_file(
     entity: str,
     folder_type: str,
     filename: str,
-    rows: int = 50
+    rows: int = 50,
+    offset: int = 0,
+    columns: Optional[str] = None
 ):
-    """Preview file content (first N rows)"""
+    """Preview file content: `rows` rows from `offset`, optionally only the comma-separated `columns`"""
     try:
         file_path = file_service.get_file_path(filename, folder_type, entity)
         if not os.path.exists(file_path):
             raise HTTPException(status_code=404, detail="File not found")
 
-        # Read Excel file
-        df = pd.read_excel(file_path)
-
-        # Replace NaN and infinity values with None for JSON serialization
-        df = df.replace([float('inf'), float('-inf')], None)
-        df = df.where(pd.notnull(df), None)
-        
-        # Clean column names - replace NaN with empty string or index
-        df.columns = [str(col) if pd.notna(col) else f"Column_{i}" for i, col in enumerate(df.columns)]
-
-        # Limit rows for preview
-        preview_df = df.head(rows)
-
-        # Convert to list of lists for easier rendering
-        rows_data = preview_df.values.tolist()
+        # Streams just this page of the sheet (or slices it from the workbook cache)
+        try:
+            page = await asyncio.to_thread(preview_sheet, file_path, offset, rows, _preview_columns(columns))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e)) from e
 
         return {
             "filename": filename,
-            "total_rows": len(df),
-            "total_columns": len(df.columns),
-            "columns": df.columns.tolist(),
-            "rows": rows_data,
-            "preview_count": len(preview_df)
+            "total_rows": page["total_rows"],
+            "total_columns": len(page["all_columns"]),
+            "columns": page["columns"],
+            "all_columns": page["all_columns"],
+            "rows": page["rows"],
+            "preview_count": len(page["rows"]),
+            "offset": page["offset"],
+            "limit": page["limit"],
+            "has_more": page["has_more"]
         }
     except HTTPException:
         raise
@@ -516,6 +581,10 @@ async def upload_trial_balance(
         file_path = await file_service.save_trial_balance(file, entity)
         print(f"   ✅ File saved to: {file_path}")
 
+        # Parse once into a normalized sidecar for the pipeline steps
+        if await asyncio.to_thread(write_sidecar, file_path):
+            print("   ✅ Columnar sidecar written")
+
         # Validate trial balance
         print("   Validating trial balance...")
         try:
@@ -580,6 +649,7 @@ async def upload_config_file(
         file_path = config_dir / standard_filename
         
         contents = await file.read()
+        release_workbook(file_path)
         with open(file_path, 'wb') as f:
             f.write(contents)
 
@@ -617,6 +687,7 @@ async def upload_adjustments(
                 continue
 
             file_path = await file_service.save_adjustment_file(file, entity)
+            await asyncio.to_thread(write_sidecar, file_path)
             saved_files.append({
                 "filename": file.filename,
                 "path": file_path,
@@ -634,16 +705,79 @@ async def upload_adjustments(
 # Processing Endpoints
 
 
+@app.post("/api/process/consolidate")
+async def consolidate_trial_balance(
+    entity: str = Form(...),
+    period_key: Optional[str] = Form(None),
+    period_column: Optional[str] = Form(None)
+):
+    """Generate the adjusted trial balance in-process from the manual adjustment files"""
+    try:
+        entity = EntityConfig.normalize_entity_code(entity)
+        result = await AIOrchestratorService(entity).consolidate_trial_balance(
+            entity, period_key or period_column
+        )
+        if not result["success"]:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Failed to generate adjusted trial balance for {entity}"
+            )
+        return result
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e)) from e
+
+
+@app.post("/api/process/group-consolidate")
+async def consolidate_group(
+    entities: Optional[str] = Form(None),
+    period: Optional[str] = Form(None)
+):
+    """Translate entity final TBs into the group currency, eliminate intercompany and build the group TB"""
+    try:
+        entity_list = [e.strip() for e in entities.split(",") if e.strip()] if entities else None
+        result = await asyncio.to_thread(GroupConsolidationService().consolidate, entity_list, period)
+        if not result["success"]:
+            raise HTTPException(status_code=400, detail=result["error"])
+        return result
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e)) from e
+
+
+@app.post("/api/process/group-consolidate/queue")
+async def queue_group_consolidation(
+    entities: Optional[str] = Form(None),
+    period: Optional[str] = Form(None),
+    priority: int = Form(5)
+):
+    """Queue the group consolidation; follow /api/jobs/{job_id}/events for per-step progress"""
+    try:
+        entity_list = [e.strip() for e in entities.split(",") if e.strip()] if entities else None
+        job = job_queue.enqueue(
+            "group_consolidation",
+            "group",
+            {"entities": entity_list, "period": period},
+            priority=priority
+        )
+        return {"job_id": job["id"], "status": job["status"], "status_url": f"/api/jobs/{job['id']}",
+                "events_url": f"/api/jobs/{job['id']}/events"}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e)) from e
+
+
 @app.post("/api/process/adjustments")
 async def process_adjustments(
-    background_tasks: BackgroundTasks,
     entity: str = Form(...),
     period_key: Optional[str] = Form(None),
-    period_column: Optional[str] = Form(None)
+    period_column: Optional[str] = Form(None),
+    priority: int = Form(10)
 ):
-    """Start AI-powered adjustment processing"""
+    """Queue AI-powered adjustment processing"""
     try:
-        # Apply period selection if provided (so subprocess sees correct period)
+        # Apply period selection if provided (the job carries it to the worker too)
         from backend.config.period_config import period_config
         if period_key:
             try:
@@ -656,30 +790,20 @@ async def process_adjustments(
             except Exception:
                 pass
 
-        # Generate unique processing ID
-        processing_id = str(uuid.uuid4())
-
-        # Initialize processing status
-        processing_status[processing_id] = ProcessingStatus(
-            id=processing_id,
-            status="started",
-            progress=0,
-            message="Starting adjustment processing...",
-            entity=entity,
-            start_time=datetime.now().isoformat()
-        )
-
-        # Start background processing
-        background_tasks.add_task(
-            run_adjustment_processing,
-            processing_id,
-            entity
+        # Queue for the job workers (status survives restarts)
+        job = job_queue.enqueue(
+            "adjustments",
+            entity,
+            current_period_payload(),
+            priority=priority,
+            message="Starting adjustment processing..."
         )
 
         return {
-            "processing_id": processing_id,
+            "processing_id": job["id"],
             "status": "started",
-            "message": "Adjustment processing started"
+            "message": "Adjustment processing started",
+            "events_url": f"/api/jobs/{job['id']}/events"
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e)) from e
@@ -688,19 +812,21 @@ async def process_adjustments(
 @app.get("/api/process/status/{processing_id}")
 async def get_processing_status(processing_id: str):
     """Get processing status"""
-    if processing_id not in processing_status:
+    job = job_queue.get(processing_id)
+    if job is None:
         raise HTTPException(status_code=404, detail="Processing ID not found")
 
-    return processing_status[processing_id]
+    return _processing_status_from_job(job)
 
 
 @app.get("/api/adjustments/details/{processing_id}")
 async def get_adjustment_details(processing_id: str):
     """Get detailed information about adjustments after processing"""
-    if processing_id not in processing_status:
+    job = job_queue.get(processing_id)
+    if job is None:
         raise HTTPException(status_code=404, detail="Processing ID not found")
 
-    status = processing_status[processing_id]
+    status = _processing_status_from_job(job)
 
     if status.status != "completed":
         raise HTTPException(status_code=400, detail="Processing not completed yet")
@@ -777,7 +903,7 @@ async def get_adjustment_details(processing_id: str):
 
             # Try to read the file to get row count
             try:
-                df = pd.read_excel(final_tb_path)
+                df = read_excel_cached(final_tb_path)
                 row_count = len(df)
                 column_count = len(df.columns)
                 columns = df.columns.tolist()
@@ -887,7 +1013,7 @@ async def get_adjustment_summary(entity: str):
         # Check final adjusted trial balance
         if final_tb_exists:
             file_stat = final_tb_path.stat()
-            df = pd.read_excel(final_tb_path)
+            df = read_excel_cached(final_tb_path)
             row_count = len(df)
             column_count = len(df.columns)
             columns = df.columns.tolist()
@@ -972,8 +1098,9 @@ async def download_adjustment_file(entity: str, filename: str):
 
 
 @app.get("/api/adjustments/preview/{entity}/{filename}")
-async def preview_adjustment_file(entity: str, filename: str, rows: int = 50):
-    """Preview adjustment output file (first N rows)"""
+async def preview_adjustment_file(entity: str, filename: str, rows: int = 50, offset: int = 0,
+                                  columns: Optional[str] = None):
+    """Preview adjustment output file: `rows` rows from `offset`, optionally only the comma-separated `columns`"""
     try:
         path_service = PathService(entity)
 
@@ -988,32 +1115,26 @@ async def preview_adjustment_file(entity: str, filename: str, rows: int = 50):
         if not file_path.exists():
             raise HTTPException(status_code=404, detail="File not found")
 
-        # Read Excel file
-        df = pd.read_excel(file_path)
-
-        # Replace NaN and infinity values with None for JSON serialization
-        df = df.replace([float('inf'), float('-inf')], None)
-        df = df.where(pd.notnull(df), None)
-        
-        # Clean column names - replace NaN with empty string or index
-        df.columns = [str(col) if pd.notna(col) else f"Column_{i}" for i, col in enumerate(df.columns)]
-
-        # Limit rows
-        preview_df = df.head(rows)
-
-        # Convert to JSON-serializable format
-        preview_data = preview_df.to_dict(orient='records')
+        # Streams just this page of the sheet (or slices it from the workbook cache)
+        try:
+            page = await asyncio.to_thread(preview_sheet, file_path, offset, rows, _preview_columns(columns))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e)) from e
 
         return {
             "filename": filename,
-            "total_rows": len(df),
-            "total_columns": len(df.columns),
-            "columns": df.columns.tolist(),
-            "preview_rows": len(preview_df),
-            "data": preview_data,
+            "total_rows": page["total_rows"],
+            "total_columns": len(page["all_columns"]),
+            "columns": page["columns"],
+            "all_columns": page["all_columns"],
+            "preview_rows": len(page["rows"]),
+            "offset": page["offset"],
+            "limit": page["limit"],
+            "has_more": page["has_more"],
+            "data": [dict(zip(page["columns"], row)) for row in page["rows"]],
             "summary": {
-                "numeric_columns": df.select_dtypes(include=['float64', 'int64']).columns.tolist(),
-                "text_columns": df.select_dtypes(include=['object']).columns.tolist(),
+                "numeric_columns": page["numeric_columns"],
+                "text_columns": [c for c in page["columns"] if c not in page["numeric_columns"]],
             }
         }
     except HTTPException:
@@ -1021,56 +1142,6 @@ async def preview_adjustment_file(entity: str, filename: str, rows: int = 50):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e)) from e
 
-# Background processing function
-
-
-async def run_adjustment_processing(processing_id: str, entity: str):
-    """Run adjustment processing in background"""
-    try:
-        # Update status
-        processing_status[processing_id].status = "processing"
-        processing_status[processing_id].progress = 10
-        processing_status[processing_id].message = "Initializing AI orchestrator..."
-        
-        print(f"🚀 Starting adjustment processing for {entity} (ID: {processing_id})")
-
-        # Create AI service instance for this entity
-        ai_service = AIOrchestratorService(entity)
-        
-        # Update status before starting
-        processing_status[processing_id].progress = 15
-        processing_status[processing_id].message = "Starting AI-powered adjustment processing..."
-
-        # Run AI orchestrator with progress callback
-        result = await ai_service.process_all_adjustments(
-            entity, 
-            processing_status=processing_status, 
-            processing_id=processing_id
-        )
-
-        if result.get("success"):
-            processing_status[processing_id].status = "completed"
-            processing_status[processing_id].progress = 100
-            processing_status[processing_id].message = "All adjustments processed successfully"
-            processing_status[processing_id].result = result
-            print(f"✅ Adjustment processing completed for {entity}")
-        else:
-            processing_status[processing_id].status = "failed"
-            error_msg = result.get("error", "Processing failed")
-            processing_status[processing_id].message = f"Failed: {error_msg}"
-            processing_status[processing_id].result = result
-            print(f"❌ Adjustment processing failed for {entity}: {error_msg}")
-            if "stdout" in result:
-                print(f"📋 STDOUT: {result['stdout'][:500]}...")  # Print first 500 chars
-            if "stderr" in result:
-                print(f"📋 STDERR: {result['stderr'][:500]}...")
-
-    except Exception as e:
-        processing_status[processing_id].status = "failed"
-        processing_status[processing_id].message = f"Exception: {str(e)}"
-        print(f"❌ Exception in adjustment processing for {entity}: {str(e)}")
-        traceback.print_exc()
-
 # Category Mapping
 
 
@@ -1597,6 +1668,43 @@ async def generate_all_statements(
         raise HTTPException(status_code=500, detail=str(e)) from e
 
 
+@app.post("/api/statements/generate-all/queue")
+async def queue_all_statements(
+    entity: str = Form(...),
+    period_ended: Optional[str] = Form(None),
+    as_at_date: Optional[str] = Form(None),
+    priority: int = Form(5)
+):
+    """Queue generation of all financial statements; follow /api/jobs/{job_id}/events"""
+    try:
+        ack_status = await validation_service.check_acknowledgment_status(entity)
+
+        if not ack_status.get('can_proceed', True):
+            raise HTTPException(
+                status_code=400,
+                detail={
+                    "error": "Validation acknowledgment required",
+                    "message": ack_status.get('message'),
+                    "has_failures": ack_status.get('has_failures'),
+                    "failed_rules_count": ack_status.get('failed_rules_count', 0),
+                    "action_required": "Please acknowledge validation exceptions before generating financial statements"
+                }
+            )
+
+        job = job_queue.enqueue(
+            "statements",
+            entity,
+            {"period_ended": period_ended, "as_at_date": as_at_date, **current_period_payload()},
+            priority=priority
+        )
+        return {"job_id": job["id"], "status": job["status"], "status_url": f"/api/jobs/{job['id']}",
+                "events_url": f"/api/jobs/{job['id']}/events"}
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e)) from e
+
+
 @app.post("/api/upload/notes-trial-balance")
 async def upload_notes_trial_balance(
     entity: str = Form(...),
@@ -39,7 +39,7 @@ async def financial_reporting_exception_handler(
     
     return JSONResponse(
         status_code=exc.status_code,
-        content=error_response.model_dump()
+        content=error_response.model_dump(mode="json")
     )
 
 
@@ -75,7 +75,7 @@ async def validation_exception_handler(
     
     return JSONResponse(
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-        content=error_response.model_dump()
+        content=error_response.model_dump(mode="json")
     )
 
 
@@ -102,7 +102,7 @@ async def http_exception_handler(
     
     return JSONResponse(
         status_code=exc.status_code,
-        content=error_response.model_dump()
+        content=error_response.model_dump(mode="json")
     )
 
 
@@ -131,7 +131,7 @@ async def general_exception_handler(
     
     return JSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        content=error_response.model_dump()
+        content=error_response.model_dump(mode="json")
     )
 
 
@@ -14,10 +14,12 @@ class NoteGenerationRequest(BaseModel):
     Attributes:
         company_name: Name of the company.
         note_number: Number of the note to generate.
+        use_cache: Reuse a cached LLM response when the prompts are unchanged.
     """
 
     company_name: str
     note_number: str
+    use_cache: bool = True
 
 
 class BatchGenerationRequest(BaseModel):
@@ -29,10 +31,12 @@ class BatchGenerationRequest(BaseModel):
     Attributes:
         company_name: Name of the company.
         category_id: Optional category filter (e.g., "profit-loss").
+        use_cache: Reuse cached LLM responses for notes whose prompts are unchanged.
     """
 
     company_name: str
     category_id: Optional[str] = None
+    use_cache: bool = True
 
 
 class GenerationResponse(BaseModel):
@@ -66,12 +70,16 @@ class BatchGenerationStatus(BaseModel):
         status: Current status (pending, running, completed, failed).
         total_notes: Total number of notes to generate.
         completed_notes: Number of notes completed so far.
-        current_note: Note number currently being processed.
+        failed_notes: Number of completed notes that failed.
+        current_note: Note number most recently started.
+        running_notes: Note numbers currently being processed.
         results: List of generation results for completed notes.
     """
 
     status: str
     total_notes: int
     completed_notes: int
+    failed_notes: int = 0
     current_note: Optional[str] = None
+    running_notes: List[str] = []
     results: List[GenerationResponse] = []
@@ -29,7 +29,7 @@ async def login(login_request: LoginRequest):
     Returns:
         Access token and refresh token
     """
-    user = AuthService.authenticate_user(login_request.username, login_request.password)
+    user = await AuthService.authenticate_user_async(login_request.username, login_request.password)
 
     if not user:
         raise HTTPException(
@@ -107,7 +107,7 @@ async def register_user(
         Created user details
     """
     try:
-        user = AuthService.create_user(user_create)
+        user = await AuthService.create_user_async(user_create)
         return UserResponse(
             id=user.id,
             username=user.username,
@@ -3,9 +3,10 @@
 # ============================================================================
 """Note generation API routes."""
 
+import uuid
 from datetime import datetime
 
-from fastapi import APIRouter, BackgroundTasks, HTTPException
+from fastapi import APIRouter, HTTPException
 
 from backend.models.generation import (
     BatchGenerationRequest,
@@ -15,6 +16,8 @@ from backend.models.generation import (
 )
 from backend.services.company_service import CompanyService
 from backend.services.generation_service import GenerationService
+from backend.services.job_queue_service import current_period_payload, job_queue
+from backend.services.llm_cache_service import LLMCacheService
 
 router = APIRouter()
 
@@ -36,7 +39,7 @@ async def generate_single_note(request: NoteGenerationRequest):
         )
 
     result = GenerationService.generate_single_note(
-        company_name_match, request.note_number
+        company_name_match, request.note_number, request.use_cache
     )
 
     if not result.success:
@@ -46,10 +49,8 @@ async def generate_single_note(request: NoteGenerationRequest):
 
 
 @router.post("/generate/batch")
-async def generate_all_notes(
-    request: BatchGenerationRequest, background_tasks: BackgroundTasks
-):
-    """Generate notes for a company in the background. Optionally filter by category_id."""
+async def generate_all_notes(request: BatchGenerationRequest):
+    """Queue note generation for a company. Optionally filter by category_id."""
     print("🎯 Batch generation endpoint called!")
     print(f"   Request: company_name={request.company_name}, category_id={request.category_id}")
 
@@ -72,34 +73,44 @@ async def generate_all_notes(
     print(f"   ✅ Matched company: {company_name_match}")
 
     batch_id = f"{company_name_match}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    if job_queue.get(batch_id) is not None:
+        batch_id = f"{batch_id}_{uuid.uuid4().hex[:6]}"
 
-    GenerationService.batch_status[batch_id] = BatchGenerationStatus(
-        status="pending", total_notes=0, completed_notes=0, results=[]
-    )
-
-    background_tasks.add_task(
-        GenerationService.batch_generate_notes,
+    job_queue.enqueue(
+        "note_batch",
         company_name_match,
-        batch_id,
-        request.category_id,
+        {
+            "company_name": company_name_match,
+            "category_id": request.category_id,
+            "use_cache": request.use_cache,
+            **current_period_payload(),
+        },
+        job_id=batch_id,
+        state=BatchGenerationStatus(
+            status="pending", total_notes=0, completed_notes=0, results=[]
+        ).model_dump(mode="json"),
     )
 
     return {
         "message": f"Batch generation started for {company_name_match}",
         "batch_id": batch_id,
         "status_url": f"/api/generate/batch/{batch_id}/status",
+        "events_url": f"/api/jobs/{batch_id}/events",
     }
 
 
 @router.get("/generate/batch/{batch_id}/status", response_model=BatchGenerationStatus)
 async def get_batch_status(batch_id: str):
     """Get the status of a batch generation process."""
-    if batch_id not in GenerationService.batch_status:
+    job = job_queue.get(batch_id)
+    if job is None or job["kind"] != "note_batch":
         print(f"⚠️  Batch ID not found: {batch_id}")
-        print(f"   Available batch IDs: {list(GenerationService.batch_status.keys())}")
         raise HTTPException(status_code=404, detail=f"Batch ID '{batch_id}' not found")
 
-    current_status = GenerationService.batch_status[batch_id]
+    current_status = BatchGenerationStatus(**job["state"])
+    # Worker died before the batch could record its own failure
+    if job["status"] == "failed" and current_status.status not in ("completed", "failed"):
+        current_status.status = "failed"
     print(f"📊 Batch status check: {batch_id}")
     print(f"   Status: {current_status.status}")
     print(f"   Progress: {current_status.completed_notes}/{current_status.total_notes}")
@@ -107,6 +118,19 @@ async def get_batch_status(batch_id: str):
     return current_status
 
 
+@router.get("/generate/cache/stats")
+async def get_llm_cache_stats():
+    """Get LLM response cache hit/miss counters (across API and job workers) and size."""
+    return LLMCacheService.get_stats()
+
+
+@router.delete("/generate/cache")
+async def clear_llm_cache():
+    """Delete all cached LLM responses."""
+    removed = LLMCacheService.clear()
+    return {"message": f"Cleared {removed} cached response(s)", "removed": removed}
+
+
 @router.get("/generated-notes/{company_name}")
 async def list_generated_notes(company_name: str, category_id: str = None):
     """
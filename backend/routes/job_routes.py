@@ -0,0 +1,112 @@
+"""
+API routes for the job queue.
+Read-only status of queued, running and finished pipeline jobs, plus a
+server-sent events stream of each job's progress and log lines.
+"""
+
+import asyncio
+import json
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from fastapi import APIRouter, Header, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+
+from backend.services.job_queue_service import JOB_STATUSES, job_queue, job_workers
+
+router = APIRouter()
+
+# How often the stream checks the job's event log, and sends a keep-alive comment when idle
+JOB_STREAM_POLL_SECONDS = 0.5
+JOB_STREAM_KEEPALIVE_SECONDS = 15.0
+FINISHED_STATUSES = ("completed", "failed")
+
+
+def _sse(event: str, data: Dict[str, Any], event_id: Optional[int] = None) -> str:
+    """Format one server-sent event"""
+    lines = [f"id: {event_id}"] if event_id is not None else []
+    lines += [f"event: {event}", f"data: {json.dumps(data, default=str)}"]
+    return "\n".join(lines) + "\n\n"
+
+
+async def _job_event_stream(request: Request, job_id: str, after: int) -> AsyncIterator[str]:
+    """
+    Replay a job's events after `after`, then push new ones until the job finishes
+
+    Sends a `snapshot` of the job first, one event per event-log entry (SSE id = seq,
+    so EventSource reconnects resume via Last-Event-ID), and `end` with the final job.
+    """
+    job = job_queue.get(job_id)
+    yield _sse("snapshot", {k: v for k, v in job.items() if k != "result"})
+    yield f"retry: {int(JOB_STREAM_POLL_SECONDS * 4000)}\n\n"
+
+    last_sent = time.monotonic()
+    while not await request.is_disconnected():
+        # Read status before events so nothing written in between is missed at the end
+        job = job_queue.get(job_id)
+        events = job_queue.events(job_id, after=after)
+        for event in events:
+            after = event["seq"]
+            yield _sse(event["type"], event, event_id=event["seq"])
+        if events:
+            last_sent = time.monotonic()
+            continue
+
+        if job is None or job["status"] in FINISHED_STATUSES:
+            yield _sse("end", job or {"id": job_id, "status": "deleted"})
+            return
+        if time.monotonic() - last_sent >= JOB_STREAM_KEEPALIVE_SECONDS:
+            yield ": keep-alive\n\n"
+            last_sent = time.monotonic()
+        await asyncio.sleep(JOB_STREAM_POLL_SECONDS)
+
+
+@router.get("/jobs")
+async def list_jobs(
+    entity: Optional[str] = Query(None, description="Only jobs for this entity"),
+    status: Optional[str] = Query(None, description="queued, running, completed or failed"),
+    kind: Optional[str] = Query(None, description="adjustments, note_batch, statements or group_consolidation"),
+    limit: int = Query(50, ge=1, le=500),
+) -> Dict[str, Any]:
+    """List the most recent jobs, newest first."""
+    if status and status not in JOB_STATUSES:
+        raise HTTPException(status_code=400, detail=f"Unknown status '{status}'")
+
+    jobs: List[Dict[str, Any]] = job_queue.list_jobs(entity=entity, status=status, kind=kind, limit=limit)
+    return {
+        "jobs": [{k: v for k, v in job.items() if k != "result"} for job in jobs],
+        "count": len(jobs),
+        "local_workers": job_workers.alive(),
+    }
+
+
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: str) -> Dict[str, Any]:
+    """Get status, progress and result of a job."""
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' not found")
+    return job
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_job_events(
+    job_id: str,
+    request: Request,
+    after: int = Query(0, ge=0, description="Only events after this seq (replays the whole log by default)"),
+    last_event_id: Optional[int] = Header(None),
+) -> StreamingResponse:
+    """
+    Stream a job's progress as server-sent events
+
+    Event types: snapshot, status, progress, state, stage, note, log and end.
+    Use with EventSource instead of polling the status endpoints.
+    """
+    if job_queue.get(job_id) is None:
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' not found")
+    return StreamingResponse(
+        _job_event_stream(request, job_id, max(after, last_event_id or 0)),
+        media_type="text/event-stream",
+        # Keep nginx from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -20,6 +20,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from backend.sap_connect.connectivity_manager import ConnectivityManager
 from backend.sap_connect.data_extractor import DataExtractor
+from backend.sap_connect.ledger_store import LedgerStore
 from backend.services.path_service import PathService
 
 router = APIRouter()
@@ -167,7 +168,7 @@ async def extract_trial_balance_from_sap(request: SAPExtractionRequest):
         
         # Initialize managers
         conn_mgr = ConnectivityManager()
-        data_extractor = DataExtractor(conn_mgr)
+        data_extractor = DataExtractor(conn_mgr, ledger_store=LedgerStore())
         
         # Get entity configuration
         sap_entity = conn_mgr.get_entity_by_id(sap_entity_id)
@@ -0,0 +1,74 @@
+"""
+Concurrency Helpers Module
+Bounded thread-pool execution with per-task timeouts for multi-entity work
+"""
+
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Hashable
+
+
+def run_tasks_with_timeouts(tasks: Dict[Hashable, Callable[[], Any]], max_workers: int = 4,
+                            task_timeout: float = None) -> Dict[Hashable, Dict[str, Any]]:
+    """
+    Run independent tasks on a bounded thread pool, each with its own time limit
+
+    A task's clock starts when a worker picks it up, so queued tasks are not
+    penalised by the concurrency cap. Timed-out tasks are reported and no
+    longer waited for; their worker threads finish in the background since
+    Python threads cannot be killed.
+
+    Args:
+        tasks: Dict of key -> zero-argument callable
+        max_workers: Global concurrency cap
+        task_timeout: Seconds each task may run, None for no limit
+
+    Returns:
+        Dict of key -> {'status': 'success'|'failed'|'timeout',
+                        'result', 'error', 'elapsed'} in the order of tasks
+    """
+    started_at: Dict[Hashable, float] = {}
+    outcomes: Dict[Hashable, Dict[str, Any]] = {}
+
+    def _wrap(key, func):
+        def _run():
+            started_at[key] = time.monotonic()
+            return func()
+        return _run
+
+    executor = ThreadPoolExecutor(max_workers=max(1, max_workers))
+    try:
+        futures: Dict[Future, Hashable] = {
+            executor.submit(_wrap(key, func)): key for key, func in tasks.items()
+        }
+        pending = set(futures)
+
+        while pending:
+            done, pending = wait(pending, timeout=0.5, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                key = futures[future]
+                elapsed = time.monotonic() - started_at.get(key, time.monotonic())
+                try:
+                    outcomes[key] = {'status': 'success', 'result': future.result(),
+                                     'error': None, 'elapsed': elapsed}
+                except Exception as e:
+                    outcomes[key] = {'status': 'failed', 'result': None,
+                                     'error': str(e), 'elapsed': elapsed}
+
+            if task_timeout is None:
+                continue
+
+            now = time.monotonic()
+            for future in list(pending):
+                key = futures[future]
+                if key in started_at and now - started_at[key] > task_timeout:
+                    pending.discard(future)
+                    future.cancel()
+                    outcomes[key] = {'status': 'timeout', 'result': None,
+                                     'error': f"Timed out after {task_timeout:.0f}s",
+                                     'elapsed': now - started_at[key]}
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    return {key: outcomes[key] for key in tasks}
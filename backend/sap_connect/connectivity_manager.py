@@ -6,15 +6,128 @@ Supports multiple entities with different connection types
 
 import json
 import os
+import queue
+import threading
+import time
+import pandas as pd
 import pyodbc
 import requests
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Tuple
 import urllib3
 
+from backend.sap_connect.concurrency import run_tasks_with_timeouts
+
 # Suppress SSL warnings for API connections
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
+# Key each Service Layer endpoint is ordered by when its pages are fetched concurrently.
+# OData only keeps $skip windows from overlapping or missing rows with an explicit
+# $orderby; other endpoints can set one via api_fetch.order_by in entities.json
+API_ORDER_KEYS = {
+    'JournalEntries': 'JdtNum',
+    'Invoices': 'DocEntry',
+    'ChartOfAccounts': 'Code',
+    'BusinessPartners': 'CardCode',
+}
+
+
+class SQLConnectionPool:
+    """
+    Bounded pool of pyodbc connections for one SQL entity
+    
+    Connections idle for longer than health_check_after seconds are checked
+    with a trivial query before being handed out, and replaced if dead.
+    """
+    
+    def __init__(self, conn_str: str, max_size: int = 4, timeout: int = 30,
+                 health_check_after: float = 60):
+        """
+        Initialize the pool
+        
+        Args:
+            conn_str: ODBC connection string
+            max_size: Maximum number of open connections
+            timeout: Login timeout for new connections (seconds)
+            health_check_after: Idle seconds after which a connection is re-validated
+        """
+        self.conn_str = conn_str
+        self.max_size = max_size
+        self.timeout = timeout
+        self.health_check_after = health_check_after
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(max_size)
+    
+    def _is_healthy(self, conn) -> bool:
+        """Check a connection with a trivial round trip"""
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1")
+            cursor.fetchone()
+            cursor.close()
+            return True
+        except pyodbc.Error:
+            return False
+    
+    def _checkout(self):
+        """Get an idle healthy connection or open a new one"""
+        while True:
+            try:
+                conn, idle_since = self._idle.get_nowait()
+            except queue.Empty:
+                return pyodbc.connect(self.conn_str, timeout=self.timeout)
+            
+            if time.monotonic() - idle_since < self.health_check_after or self._is_healthy(conn):
+                return conn
+            
+            try:
+                conn.close()
+            except pyodbc.Error:
+                pass
+    
+    @contextmanager
+    def connection(self):
+        """Borrow a connection for the duration of a with-block"""
+        self._slots.acquire()
+        conn = None
+        try:
+            conn = self._checkout()
+            yield conn
+        except pyodbc.Error:
+            # Connection state is unknown after a driver error - don't reuse it
+            if conn is not None:
+                try:
+                    conn.close()
+                except pyodbc.Error:
+                    pass
+                conn = None
+            raise
+        finally:
+            if conn is not None:
+                self._idle.put((conn, time.monotonic()))
+            self._slots.release()
+    
+    def close_all(self):
+        """Close every idle connection"""
+        while True:
+            try:
+                conn, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                conn.close()
+            except pyodbc.Error:
+                pass
+
+
+# Process-wide SQL pools keyed by entity ID (ConnectivityManager is created per request)
+_sql_pools: Dict[str, SQLConnectionPool] = {}
+_sql_pools_lock = threading.Lock()
+
 
 class ConnectivityManager:
     """
@@ -163,11 +276,16 @@ class ConnectivityManager:
         Returns:
             pyodbc.Connection object
         """
+        self.connection = pyodbc.connect(self._get_sql_conn_str(entity), timeout=30)
+        return self.connection
+    
+    def _get_sql_conn_str(self, entity: Dict) -> str:
+        """Build the ODBC connection string for an entity"""
         driver = self._get_best_sql_driver()
         if not driver:
             raise Exception("No SQL Server ODBC driver found. Please install ODBC Driver for SQL Server.")
         
-        conn_str = (
+        return (
             f"DRIVER={{{driver}}};"
             f"SERVER={entity['sql_server']};"
             f"DATABASE={entity['database']};"
@@ -175,9 +293,22 @@ class ConnectivityManager:
             f"PWD={entity['password']};"
             f"TrustServerCertificate=yes;"
         )
+    
+    def get_sql_pool(self, entity: Dict) -> SQLConnectionPool:
+        """
+        Get the shared connection pool for a SQL entity, creating it on first use
         
-        self.connection = pyodbc.connect(conn_str, timeout=30)
-        return self.connection
+        Pool size comes from the entity's optional 'sql_pool_size' (default 4).
+        """
+        with _sql_pools_lock:
+            pool = _sql_pools.get(entity['id'])
+            if pool is None:
+                pool = SQLConnectionPool(
+                    self._get_sql_conn_str(entity),
+                    max_size=entity.get('sql_pool_size', 4)
+                )
+                _sql_pools[entity['id']] = pool
+            return pool
     
     def execute_sql_query(self, entity: Dict, query: str) -> List[Dict]:
         """
@@ -188,25 +319,52 @@ class ConnectivityManager:
             query: SQL query to execute
             
         Returns:
-            List of dictionaries representing query results
+            List of dictionaries representing query results (driver values, NULL as None)
         """
-        conn = self.connect_sql(entity)
-        cursor = conn.cursor()
-        
-        cursor.execute(query)
-        
-        # Get column names
-        columns = [column[0] for column in cursor.description]
-        
-        # Fetch all rows and convert to list of dicts
         results = []
-        for row in cursor.fetchall():
-            results.append(dict(zip(columns, row)))
+        for columns, rows in self._iter_sql_rows(entity, query):
+            results.extend(dict(zip(columns, row)) for row in rows)
+        return results
+    
+    def _iter_sql_rows(self, entity: Dict, query: str,
+                       batch_size: int = 5000) -> Iterator[Tuple[List[str], list]]:
+        """
+        Execute SQL query on a pooled connection and yield (columns, fetchmany rows)
+        """
+        with self.get_sql_pool(entity).connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(query)
+                
+                # Get column names
+                columns = [column[0] for column in cursor.description]
+                
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    yield columns, rows
+            finally:
+                cursor.close()
+    
+    def iter_sql_batches(self, entity: Dict, query: str,
+                         batch_size: int = 5000) -> Iterator[pd.DataFrame]:
+        """
+        Execute SQL query on a pooled connection and yield results in batches
         
-        cursor.close()
-        conn.close()
+        Rows are pulled with cursor.fetchmany and converted to NumPy-backed
+        DataFrames, so large result sets never exist as one list of rows.
         
-        return results
+        Args:
+            entity: Entity configuration dictionary
+            query: SQL query to execute
+            batch_size: Rows per fetchmany call
+            
+        Yields:
+            DataFrame per batch
+        """
+        for columns, rows in self._iter_sql_rows(entity, query, batch_size):
+            yield pd.DataFrame.from_records([tuple(row) for row in rows], columns=columns)
     
     # ========== API Connection Methods ==========
     
@@ -311,7 +469,9 @@ class ConnectivityManager:
                 self.session = None
     
     def fetch_api_data(self, entity: Dict, endpoint: str, filter_query: str = None, 
-                       select_fields: str = None, top: int = 1000) -> List[Dict]:
+                       select_fields: str = None, top: int = 1000,
+                       parallel: bool = False, max_workers: int = 4,
+                       max_retries: int = 3) -> List[Dict]:
         """
         Fetch data from SAP Service Layer API
         
@@ -321,10 +481,36 @@ class ConnectivityManager:
             filter_query: OData filter query
             select_fields: Comma-separated list of fields to select
             top: Number of records to fetch per request
+            parallel: Read $count first and fetch pages concurrently, ordered by the
+                endpoint's key (API_ORDER_KEYS or api_fetch.order_by)
+            max_workers: Maximum concurrent page requests in parallel mode
+            max_retries: Attempts per page before giving up
             
         Returns:
             List of dictionaries representing the data
         """
+        all_data = []
+        for records in self.iter_api_pages(entity, endpoint, filter_query, select_fields,
+                                           top, parallel, max_workers, max_retries):
+            all_data.extend(records)
+        return all_data
+    
+    def iter_api_pages(self, entity: Dict, endpoint: str, filter_query: str = None,
+                       select_fields: str = None, top: int = 1000,
+                       parallel: bool = False, max_workers: int = 4,
+                       max_retries: int = 3) -> Iterator[List[Dict]]:
+        """
+        Yield pages of records from SAP Service Layer API in $skip order
+        
+        Only the pages currently in flight are held in memory, so callers can
+        fold each page into running totals and drop it.
+        
+        Args:
+            Same as fetch_api_data
+            
+        Yields:
+            List of records for each page
+        """
         # Ensure we have an active session
         if not self.session:
             try:
@@ -344,36 +530,140 @@ class ConnectivityManager:
         if select_fields:
             params["$select"] = select_fields
         
-        all_data = []
+        # Entities can opt into parallel paging from entities.json
+        fetch_config = entity.get('api_fetch', {})
+        parallel = parallel or fetch_config.get('parallel', False)
+        max_workers = fetch_config.get('max_workers', max_workers)
+        
+        if parallel:
+            order_by = fetch_config.get('order_by', {}).get(endpoint, API_ORDER_KEYS.get(endpoint))
+            if order_by:
+                params["$orderby"] = order_by
+            else:
+                print(f"⚠️ No $orderby key for {endpoint}; fetching its pages sequentially")
+                parallel = False
+        
         skip = 0
+        if parallel:
+            total = self._fetch_api_count(entity, url, filter_query)
+            if total is not None:
+                yield from self._iter_api_pages_parallel(
+                    entity, url, params, total, top, max_workers, max_retries
+                )
+                # Pick up any records posted between $count and the last page
+                skip = -(-total // top) * top
+            # $count unsupported for this endpoint - fall back to sequential paging
         
         while True:
-            params["$skip"] = skip
-            
-            response = self.session.get(
-                url,
-                params=params,
-                verify=entity.get('verify_ssl', False),
-                timeout=120
-            )
-            
-            if response.status_code != 200:
-                raise Exception(f"API request failed: {response.status_code} - {response.text}")
-            
-            data = response.json()
-            records = data.get('value', [])
+            records = self._fetch_api_page(entity, url, params, skip, max_retries)
             
             if not records:
                 break
             
-            all_data.extend(records)
+            yield records
             skip += top
             
             # Break if we got fewer records than requested (last page)
             if len(records) < top:
                 break
+    
+    def _fetch_api_page(self, entity: Dict, url: str, params: Dict, skip: int,
+                        max_retries: int = 3) -> List[Dict]:
+        """
+        Fetch a single OData page, retrying transient failures
         
-        return all_data
+        Args:
+            entity: Entity configuration dictionary
+            url: Full endpoint URL
+            params: Base OData query parameters ($top, $filter, $select)
+            skip: Value for $skip
+            max_retries: Number of attempts before raising
+            
+        Returns:
+            Records in the page
+        """
+        page_params = dict(params)
+        page_params["$skip"] = skip
+        
+        last_error = None
+        for attempt in range(max_retries):
+            try:
+                response = self.session.get(
+                    url,
+                    params=page_params,
+                    verify=entity.get('verify_ssl', False),
+                    timeout=120
+                )
+                
+                if response.status_code == 200:
+                    return response.json().get('value', [])
+                
+                last_error = f"API request failed: {response.status_code} - {response.text}"
+                
+                # Client errors (bad filter/select) will not succeed on retry
+                if 400 <= response.status_code < 500 and response.status_code != 429:
+                    break
+                    
+            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+                last_error = f"API request failed: {str(e)}"
+            
+            if attempt < max_retries - 1:
+                time.sleep(2 ** attempt)
+        
+        raise Exception(last_error)
+    
+    def _fetch_api_count(self, entity: Dict, url: str, filter_query: str = None) -> Optional[int]:
+        """
+        Read the total record count for an endpoint via OData $count
+        
+        Returns:
+            Record count, or None if the endpoint does not support $count
+        """
+        params = {}
+        if filter_query:
+            params["$filter"] = filter_query
+        
+        try:
+            response = self.session.get(
+                f"{url}/$count",
+                params=params,
+                verify=entity.get('verify_ssl', False),
+                timeout=120
+            )
+            if response.status_code != 200:
+                return None
+            return int(response.text.strip())
+        except (requests.exceptions.RequestException, ValueError):
+            return None
+    
+    def _iter_api_pages_parallel(self, entity: Dict, url: str, params: Dict, total: int,
+                                 top: int, max_workers: int, max_retries: int) -> Iterator[List[Dict]]:
+        """
+        Fetch the pages of an endpoint concurrently over the shared session
+        
+        Pages are requested through a bounded thread pool with at most
+        max_workers requests in flight, and yielded in $skip order so the
+        result matches sequential paging.
+        """
+        skips = iter(range(0, total, top))
+        
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            pending = deque(
+                executor.submit(self._fetch_api_page, entity, url, params, skip, max_retries)
+                for skip in islice(skips, max(1, max_workers))
+            )
+            
+            while pending:
+                records = pending.popleft().result()
+                
+                next_skip = next(skips, None)
+                if next_skip is not None:
+                    pending.append(executor.submit(
+                        self._fetch_api_page, entity, url, params, next_skip, max_retries
+                    ))
+                
+                if records:
+                    yield records
     
     # ========== Universal Connection Test ==========
     
@@ -401,17 +691,35 @@ class ConnectivityManager:
         else:
             return False, "Unknown connection type", None, "unknown"
     
-    def test_all_connections(self) -> List[Dict]:
+    def test_all_connections(self, max_workers: int = 8,
+                             entity_timeout: float = 60) -> List[Dict]:
         """
-        Test connections to all entities
+        Test connections to all entities concurrently
+        
+        Args:
+            max_workers: Maximum number of entities tested at once
+            entity_timeout: Seconds allowed per entity before it is reported as failed
         
         Returns:
-            List of test results for each entity
+            List of test results for each entity (in configuration order)
         """
+        entities = self.get_all_entities()
+        outcomes = run_tasks_with_timeouts(
+            {entity['id']: (lambda entity_id=entity['id']: self.test_connection(entity_id))
+             for entity in entities},
+            max_workers=max_workers,
+            task_timeout=entity_timeout
+        )
+        
         results = []
         
-        for entity in self.get_all_entities():
-            success, message, response_time, conn_type = self.test_connection(entity['id'])
+        for entity in entities:
+            outcome = outcomes[entity['id']]
+            if outcome['status'] == 'success':
+                success, message, response_time, conn_type = outcome['result']
+            else:
+                success, message, response_time = False, outcome['error'], None
+                conn_type = entity.get('connection_type', 'unknown')
             
             results.append({
                 'entity_id': entity['id'],
@@ -6,8 +6,10 @@ Supports Trial Balance, P&L, Balance Sheet, Cash Flow, and Sales Reports
 
 import pandas as pd
 from datetime import datetime
-from typing import Dict, List, Optional
+from itertools import chain
+from typing import Dict, Iterable, Iterator, List, Optional
 from backend.sap_connect.connectivity_manager import ConnectivityManager
+from backend.sap_connect.ledger_store import LedgerStore
 
 
 class DataExtractor:
@@ -15,15 +17,19 @@ class DataExtractor:
     Extract financial data from SAP B1 via SQL or API
     """
     
-    def __init__(self, connectivity_manager: ConnectivityManager):
+    def __init__(self, connectivity_manager: ConnectivityManager,
+                 ledger_store: Optional[LedgerStore] = None):
         """
         Initialize data extractor
         
         Args:
             connectivity_manager: ConnectivityManager instance
+            ledger_store: Optional local store; when given, API entities only
+                fetch journal entries newer than the last sync
         """
         self.conn_mgr = connectivity_manager
         self.config = connectivity_manager.config
+        self.ledger_store = ledger_store
     
     # ========== SQL Server Data Extraction ==========
     
@@ -55,8 +61,7 @@ class DataExtractor:
         ORDER BY t0.AcctCode
         """
         
-        results = self.conn_mgr.execute_sql_query(entity, query)
-        df = pd.DataFrame(results)
+        df = self.conn_mgr.query_sql_dataframe(entity, query)
         
         if not df.empty:
             # Convert numeric columns to proper types
@@ -92,8 +97,7 @@ class DataExtractor:
         ORDER BY t0.AcctCode
         """
         
-        results = self.conn_mgr.execute_sql_query(entity, query)
-        df = pd.DataFrame(results)
+        df = self.conn_mgr.query_sql_dataframe(entity, query)
         
         if not df.empty:
             # Convert numeric columns to proper types
@@ -128,8 +132,7 @@ class DataExtractor:
         ORDER BY t0.AcctCode
         """
         
-        results = self.conn_mgr.execute_sql_query(entity, query)
-        df = pd.DataFrame(results)
+        df = self.conn_mgr.query_sql_dataframe(entity, query)
         
         if not df.empty:
             # Convert numeric columns to proper types
@@ -167,8 +170,7 @@ class DataExtractor:
         ORDER BY t0.DocDate DESC, t0.DocNum
         """
         
-        results = self.conn_mgr.execute_sql_query(entity, query)
-        df = pd.DataFrame(results)
+        df = self.conn_mgr.query_sql_dataframe(entity, query)
         
         if not df.empty:
             # Convert numeric columns to proper types
@@ -198,8 +200,7 @@ class DataExtractor:
         FROM OACT
         ORDER BY AcctCode
         """
-        results = self.conn_mgr.execute_sql_query(entity, query)
-        return pd.DataFrame(results)
+        return self.conn_mgr.query_sql_dataframe(entity, query)
     
     def _get_business_partners_sql(self, entity: Dict) -> pd.DataFrame:
         """Get Business Partners from SQL"""
@@ -221,8 +222,7 @@ class DataExtractor:
         FROM OCRD
         ORDER BY CardCode
         """
-        results = self.conn_mgr.execute_sql_query(entity, query)
-        return pd.DataFrame(results)
+        return self.conn_mgr.query_sql_dataframe(entity, query)
     
     def _get_business_partner_groups_sql(self, entity: Dict) -> pd.DataFrame:
         """Get Business Partner Groups from SQL"""
@@ -234,8 +234,7 @@ class DataExtractor:
         FROM OCRG
         ORDER BY GroupCode
         """
-        results = self.conn_mgr.execute_sql_query(entity, query)
-        return pd.DataFrame(results)
+        return self.conn_mgr.query_sql_dataframe(entity, query)
     
     def _get_payment_terms_sql(self, entity: Dict) -> pd.DataFrame:
         """Get Payment Terms from SQL"""
@@ -248,8 +247,7 @@ class DataExtractor:
         FROM OCTG
         ORDER BY GroupNum
         """
-        results = self.conn_mgr.execute_sql_query(entity, query)
-        return pd.DataFrame(results)
+        return self.conn_mgr.query_sql_dataframe(entity, query)
     
     def _get_withholding_tax_sql(self, entity: Dict) -> pd.DataFrame:
         """Get Withholding Tax Codes from SQL"""
@@ -264,8 +262,7 @@ class DataExtractor:
         FROM OWHT
         ORDER BY WTCode
         """
-        results = self.conn_mgr.execute_sql_query(entity, query)
-        return pd.DataFrame(results)
+        return self.conn_mgr.query_sql_dataframe(entity, query)
     
     def _get_banks_sql(self, entity: Dict) -> pd.DataFrame:
         """Get Bank Master from SQL"""
@@ -281,8 +278,7 @@ class DataExtractor:
         FROM ODSC
         ORDER BY BankCode
         """
-        results = self.conn_mgr.execute_sql_query(entity, query)
-        return pd.DataFrame(results)
+        return self.conn_mgr.query_sql_dataframe(entity, query)
     
     def _get_item_groups_sql(self, entity: Dict) -> pd.DataFrame:
         """Get Item Groups from SQL"""
@@ -294,8 +290,7 @@ class DataExtractor:
         FROM OITB
         ORDER BY ItmsGrpCod
         """
-        results = self.conn_mgr.execute_sql_query(entity, query)
-        return pd.DataFrame(results)
+        return self.conn_mgr.query_sql_dataframe(entity, query)
     
     def _get_currencies_sql(self, entity: Dict) -> pd.DataFrame:
         """Get Currencies from SQL"""
@@ -308,8 +303,7 @@ class DataExtractor:
         FROM OCRN
         ORDER BY CurrCode
         """
-        results = self.conn_mgr.execute_sql_query(entity, query)
-        return pd.DataFrame(results)
+        return self.conn_mgr.query_sql_dataframe(entity, query)
     
     def _get_tax_codes_sql(self, entity: Dict) -> pd.DataFrame:
         """Get Sales Tax Codes from SQL"""
@@ -323,8 +317,7 @@ class DataExtractor:
         FROM OVTG
         ORDER BY Code
         """
-        results = self.conn_mgr.execute_sql_query(entity, query)
-        return pd.DataFrame(results)
+        return self.conn_mgr.query_sql_dataframe(entity, query)
     
     def _get_cost_centers_sql(self, entity: Dict) -> pd.DataFrame:
         """Get Cost Centers (Profit Centers) from SQL"""
@@ -338,8 +331,7 @@ class DataExtractor:
         FROM OPRC
         ORDER BY PrcCode
         """
-        results = self.conn_mgr.execute_sql_query(entity, query)
-        return pd.DataFrame(results)
+        return self.conn_mgr.query_sql_dataframe(entity, query)
     
     def _get_warehouse_locations_sql(self, entity: Dict) -> pd.DataFrame:
         """Get Warehouse Locations from SQL"""
@@ -353,8 +345,7 @@ class DataExtractor:
         FROM OLCT
         ORDER BY Code
         """
-        results = self.conn_mgr.execute_sql_query(entity, query)
-        return pd.DataFrame(results)
+        return self.conn_mgr.query_sql_dataframe(entity, query)
     
     def _get_journal_entries_sql(self, entity: Dict, start_date: str, end_date: str) -> pd.DataFrame:
         """Get Journal Entries from SQL Server (JDT1)"""
@@ -384,8 +375,7 @@ class DataExtractor:
         WHERE t0.RefDate BETWEEN '{start_date}' AND '{end_date}'
         ORDER BY t0.TransId, t0.Line_ID
         """
-        results = self.conn_mgr.execute_sql_query(entity, query)
-        df = pd.DataFrame(results)
+        df = self.conn_mgr.query_sql_dataframe(entity, query)
         
         if not df.empty:
             # Convert numeric columns to proper types
@@ -410,24 +400,32 @@ class DataExtractor:
             select_fields = default_fields
         
         try:
-            try:
-                data = self.conn_mgr.fetch_api_data(
-                    entity,
-                    'ChartOfAccounts',
-                    select_fields=select_fields
-                )
-            except Exception as e:
-                # If default fields fail, try without Levels field
-                if 'Levels' in str(e) and select_fields == default_fields:
-                    print(f"⚠️  ChartOfAccounts API failed with Levels field for {entity.get('id')}, retrying without it")
-                    select_fields = 'Code,Name,AccountType,FatherAccountKey'
+            data = None
+            if self.ledger_store is not None:
+                data = self.ledger_store.get_chart_of_accounts(entity['id'])
+            
+            if data is None:
+                try:
                     data = self.conn_mgr.fetch_api_data(
                         entity,
                         'ChartOfAccounts',
                         select_fields=select_fields
                     )
-                else:
-                    raise
+                except Exception as e:
+                    # If default fields fail, try without Levels field
+                    if 'Levels' in str(e) and select_fields == default_fields:
+                        print(f"⚠️  ChartOfAccounts API failed with Levels field for {entity.get('id')}, retrying without it")
+                        select_fields = 'Code,Name,AccountType,FatherAccountKey'
+                        data = self.conn_mgr.fetch_api_data(
+                            entity,
+                            'ChartOfAccounts',
+                            select_fields=select_fields
+                        )
+                    else:
+                        raise
+                
+                if self.ledger_store is not None:
+                    self.ledger_store.replace_chart_of_accounts(entity['id'], data)
             
             df = pd.DataFrame(data)
             
@@ -452,6 +450,12 @@ class DataExtractor:
         filter_query = f"ReferenceDate ge '{start_date}' and ReferenceDate le '{end_date}'"
         
         try:
+            if self.ledger_store is not None:
+                self._sync_journal_entries_api(entity, start_date, end_date)
+                return pd.DataFrame(
+                    self.ledger_store.get_journal_entries(entity['id'], start_date, end_date)
+                )
+            
             data = self.conn_mgr.fetch_api_data(
                 entity,
                 'JournalEntries',
@@ -462,6 +466,51 @@ class DataExtractor:
             # Always disconnect after the operation
             self.conn_mgr.disconnect_api(entity)
     
+    def _iter_journal_entry_pages_api(self, entity: Dict, start_date: str,
+                                      end_date: str) -> Iterator[List[Dict]]:
+        """Yield JournalEntries pages from API for a date range"""
+        filter_query = f"ReferenceDate ge '{start_date}' and ReferenceDate le '{end_date}'"
+        return self.conn_mgr.iter_api_pages(entity, 'JournalEntries', filter_query=filter_query)
+    
+    def _sync_journal_entries_api(self, entity: Dict, start_date: str, end_date: str):
+        """
+        Bring the local ledger store up to date for a date range
+        
+        Fetches documents created or updated since the last sync (JdtNum /
+        UpdateDate high-water marks), then downloads only the parts of the
+        requested range the store has never held.
+        
+        Args:
+            entity: Entity configuration
+            start_date: Start date (YYYY-MM-DD)
+            end_date: End date (YYYY-MM-DD)
+        """
+        entity_id = entity['id']
+        state = self.ledger_store.get_state(entity_id)
+        
+        if state['covered_from'] and state['covered_to']:
+            if state['max_jdt_num']:
+                delta_filter = f"JdtNum gt {state['max_jdt_num']}"
+                if state['max_update_date']:
+                    delta_filter += f" or UpdateDate ge '{state['max_update_date']}'"
+            else:
+                # Covered range held no entries yet - re-read it
+                delta_filter = (f"ReferenceDate ge '{state['covered_from']}' "
+                                f"and ReferenceDate le '{state['covered_to']}'")
+            
+            count = 0
+            for page in self.conn_mgr.iter_api_pages(entity, 'JournalEntries', filter_query=delta_filter):
+                count += self.ledger_store.upsert_journal_entries(entity_id, page)
+            print(f"✓ Ledger store for {entity_id}: {count} new/updated journal entries")
+        
+        for gap_start, gap_end in self.ledger_store.missing_ranges(entity_id, start_date, end_date):
+            count = 0
+            for page in self._iter_journal_entry_pages_api(entity, gap_start, gap_end):
+                count += self.ledger_store.upsert_journal_entries(entity_id, page)
+            self.ledger_store.extend_coverage(entity_id, gap_start, gap_end)
+            print(f"✓ Ledger store for {entity_id}: downloaded {count} journal entries "
+                  f"for {gap_start} to {gap_end}")
+    
     def _get_trial_balance_api(self, entity: Dict, start_date: str, end_date: str) -> pd.DataFrame:
         """
         Generate Trial Balance from API data
@@ -474,35 +523,33 @@ class DataExtractor:
         # Get chart of accounts
         coa_df = self._get_chart_of_accounts_api(entity)
         
-        # Get journal entries
-        je_df = self._get_journal_entries_api(entity, start_date, end_date)
+        if self.ledger_store is not None:
+            # Sync the store, then aggregate lines locally
+            try:
+                self._sync_journal_entries_api(entity, start_date, end_date)
+            finally:
+                self.conn_mgr.disconnect_api(entity)
+            summary = pd.DataFrame(
+                self.ledger_store.get_account_totals(entity['id'], start_date, end_date),
+                columns=['AccountCode', 'Debit', 'Credit']
+            )
+        else:
+            # Stream journal entry pages into per-account totals
+            try:
+                summary = self._aggregate_journal_pages(
+                    self._iter_journal_entry_pages_api(entity, start_date, end_date)
+                )
+            finally:
+                self.conn_mgr.disconnect_api(entity)
         
         # Process journal entries to calculate debits and credits
-        if je_df.empty:
+        if summary.empty:
             # Return COA with zero balances
             coa_df['Debit'] = 0
             coa_df['Credit'] = 0
             coa_df['Balance'] = 0
             return coa_df[['Code', 'Name', 'AccountType', 'Debit', 'Credit', 'Balance']]
         
-        # Flatten journal entry lines
-        all_lines = []
-        for _, je in je_df.iterrows():
-            for line in je.get('JournalEntryLines', []):
-                all_lines.append({
-                    'AccountCode': line.get('AccountCode'),
-                    'Debit': line.get('Debit', 0),
-                    'Credit': line.get('Credit', 0)
-                })
-        
-        lines_df = pd.DataFrame(all_lines)
-        
-        # Aggregate by account
-        summary = lines_df.groupby('AccountCode').agg({
-            'Debit': 'sum',
-            'Credit': 'sum'
-        }).reset_index()
-        
         # Merge with chart of accounts
         trial_balance = coa_df.merge(
             summary,
@@ -528,6 +575,69 @@ class DataExtractor:
         
         return trial_balance[columns]
     
+    def _aggregate_journal_lines(self, je_df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Sum Debit/Credit per AccountCode across JournalEntryLines
+        
+        Args:
+            je_df: JournalEntries DataFrame with a JournalEntryLines column
+        """
+        if je_df.empty or 'JournalEntryLines' not in je_df.columns:
+            return pd.DataFrame(columns=['AccountCode', 'Debit', 'Credit'])
+        
+        return self._sum_journal_lines(je_df['JournalEntryLines'])
+    
+    def _aggregate_journal_pages(self, pages: Iterable[List[Dict]]) -> pd.DataFrame:
+        """
+        Fold JournalEntries pages into running Debit/Credit totals per AccountCode
+        
+        Each page is reduced to per-account totals and dropped, so memory is
+        bounded by the number of accounts rather than the number of entries.
+        
+        Args:
+            pages: Iterable of JournalEntries pages (e.g. ConnectivityManager.iter_api_pages)
+        """
+        totals = None
+        for page in pages:
+            page_totals = self._sum_journal_lines(
+                entry.get('JournalEntryLines') for entry in page
+            ).set_index('AccountCode')
+            
+            if totals is None:
+                totals = page_totals
+            else:
+                totals = totals.add(page_totals, fill_value=0)
+        
+        if totals is None:
+            return pd.DataFrame(columns=['AccountCode', 'Debit', 'Credit'])
+        
+        return totals.sort_index().reset_index()
+    
+    def _sum_journal_lines(self, line_lists: Iterable) -> pd.DataFrame:
+        """
+        Sum Debit/Credit per AccountCode for a sequence of JournalEntryLines lists
+        
+        Lines are flattened column-wise (chained straight into a three-column
+        frame) rather than building a dict per line.
+        """
+        columns = ['AccountCode', 'Debit', 'Credit']
+        
+        # Flatten journal entry lines
+        lines = chain.from_iterable(
+            entry_lines for entry_lines in line_lists
+            if isinstance(entry_lines, list)
+        )
+        lines_df = pd.DataFrame(lines, columns=columns)
+        
+        if lines_df.empty:
+            return pd.DataFrame(columns=columns)
+        
+        lines_df['Debit'] = pd.to_numeric(lines_df['Debit'], errors='coerce').fillna(0)
+        lines_df['Credit'] = pd.to_numeric(lines_df['Credit'], errors='coerce').fillna(0)
+        
+        # Aggregate by account
+        return lines_df.groupby('AccountCode', as_index=False)[['Debit', 'Credit']].sum()
+    
     def _get_profit_loss_api(self, entity: Dict, start_date: str, end_date: str) -> pd.DataFrame:
         """Generate P&L from API data"""
         trial_balance = self._get_trial_balance_api(entity, start_date, end_date)
@@ -949,6 +1059,36 @@ class DataExtractor:
         else:
             raise ValueError(f"Unknown connection type: {entity['connection_type']}")
         
+    def iter_journal_entry_pages(self, entity_id: str, start_date: str = None,
+                                 end_date: str = None) -> Iterator[List[Dict]]:
+        """
+        Stream General Ledger Journal Entries page by page (API entities)
+        
+        Args:
+            entity_id: Entity ID
+            start_date: Start date (YYYY-MM-DD), defaults to config
+            end_date: End date (YYYY-MM-DD), defaults to config
+        
+        Yields:
+            List of JournalEntries records per OData page
+        """
+        if not start_date:
+            start_date = self.config['date_range']['start_date']
+        if not end_date:
+            end_date = self.config['date_range']['end_date']
+        
+        entity = self.conn_mgr.get_entity_by_id(entity_id)
+        if not entity:
+            raise ValueError(f"Entity '{entity_id}' not found")
+        
+        if entity['connection_type'] != 'api':
+            raise ValueError("Paged journal entry extraction is only available for API entities")
+        
+        try:
+            yield from self._iter_journal_entry_pages_api(entity, start_date, end_date)
+        finally:
+            self.conn_mgr.disconnect_api(entity)
+    
     def save_to_csv(self, df: pd.DataFrame, filename: str):
         """Save DataFrame to CSV"""
         df.to_csv(filename, index=False)
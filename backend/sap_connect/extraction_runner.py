@@ -0,0 +1,188 @@
+"""
+Extraction Runner Module
+Runs connectivity checks and full extractions for many SAP entities at once
+Each entity gets its own ConnectivityManager (API sessions are per instance),
+with a global concurrency cap and a per-entity timeout
+"""
+
+import os
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from backend.sap_connect.concurrency import run_tasks_with_timeouts
+from backend.sap_connect.connectivity_manager import ConnectivityManager
+from backend.sap_connect.data_extractor import DataExtractor
+from backend.sap_connect.ledger_store import LedgerStore
+
+
+# Report name -> DataExtractor method and whether it takes a date range
+EXTRACTION_REPORTS = {
+    'trial_balance': ('extract_trial_balance', 'range'),
+    'profit_loss': ('extract_profit_loss', 'range'),
+    'balance_sheet': ('extract_balance_sheet', 'as_of'),
+    'chart_of_accounts': ('extract_chart_of_accounts', None),
+    'business_partners': ('extract_business_partners', None),
+}
+
+DEFAULT_REPORTS = ['trial_balance', 'profit_loss', 'balance_sheet']
+
+
+class MultiEntityRunner:
+    """
+    Concurrent connectivity checks and extractions across configured entities
+    """
+
+    def __init__(self, config_path: str = None, max_workers: int = 4,
+                 entity_timeout: float = 1800, ledger_store: Optional[LedgerStore] = None):
+        """
+        Initialize the runner
+
+        Args:
+            config_path: Path to the entities configuration file
+            max_workers: Maximum number of entities processed at once
+            entity_timeout: Seconds allowed per entity for a full extraction
+            ledger_store: Optional ledger store shared by API entity extractions
+        """
+        self.config_path = config_path
+        self.max_workers = max_workers
+        self.entity_timeout = entity_timeout
+        self.ledger_store = ledger_store
+        self.conn_mgr = ConnectivityManager(config_path)
+
+    def _resolve_entities(self, entity_ids: List[str] = None) -> List[Dict]:
+        """Get entity configs for the given IDs, or all online entities"""
+        if entity_ids:
+            entities = []
+            for entity_id in entity_ids:
+                entity = self.conn_mgr.get_entity_by_id(entity_id)
+                if not entity:
+                    raise ValueError(f"Entity '{entity_id}' not found")
+                entities.append(entity)
+            return entities
+
+        return [e for e in self.conn_mgr.get_all_entities() if e.get('status') != 'offline']
+
+    def test_connections(self, connection_timeout: float = 60) -> List[Dict]:
+        """
+        Test connections to all entities concurrently
+
+        Args:
+            connection_timeout: Seconds allowed per entity
+
+        Returns:
+            List of test results for each entity
+        """
+        return self.conn_mgr.test_all_connections(
+            max_workers=self.max_workers,
+            entity_timeout=connection_timeout
+        )
+
+    def _extract_entity(self, entity: Dict, reports: List[str], start_date: str,
+                        end_date: str, output_dir: Optional[str]) -> Dict:
+        """Run every requested report for one entity on its own connection manager"""
+        with ConnectivityManager(self.config_path) as conn_mgr:
+            extractor = DataExtractor(conn_mgr, ledger_store=self.ledger_store)
+            report_results = {}
+
+            for report in reports:
+                method_name, date_kind = EXTRACTION_REPORTS[report]
+                method = getattr(extractor, method_name)
+
+                start = time.monotonic()
+                try:
+                    if date_kind == 'range':
+                        df = method(entity['id'], start_date, end_date)
+                    elif date_kind == 'as_of':
+                        df = method(entity['id'], end_date)
+                    else:
+                        df = method(entity['id'])
+
+                    file_path = None
+                    if output_dir:
+                        file_path = os.path.join(output_dir, f"{entity['id']}_{report}.csv")
+                        extractor.save_to_csv(df, file_path)
+
+                    report_results[report] = {
+                        'success': True,
+                        'rows': len(df),
+                        'file_path': file_path,
+                        'elapsed': time.monotonic() - start,
+                    }
+                except Exception as e:
+                    report_results[report] = {
+                        'success': False,
+                        'error': str(e),
+                        'elapsed': time.monotonic() - start,
+                    }
+
+            return report_results
+
+    def run_extractions(self, entity_ids: List[str] = None, reports: List[str] = None,
+                        start_date: str = None, end_date: str = None,
+                        output_dir: str = None) -> Dict:
+        """
+        Run full extractions for many entities concurrently
+
+        Args:
+            entity_ids: Entity IDs, defaults to all online entities
+            reports: Report names from EXTRACTION_REPORTS, defaults to TB, P&L and BS
+            start_date: Start date (YYYY-MM-DD), defaults to config
+            end_date: End date / Balance Sheet date (YYYY-MM-DD), defaults to config
+            output_dir: If given, each report is saved there as {entity}_{report}.csv
+
+        Returns:
+            Merged report with per-entity status, timings and per-report results
+        """
+        reports = reports or DEFAULT_REPORTS
+        unknown = [r for r in reports if r not in EXTRACTION_REPORTS]
+        if unknown:
+            raise ValueError(f"Unknown report(s): {', '.join(unknown)}")
+
+        start_date = start_date or self.conn_mgr.config['date_range']['start_date']
+        end_date = end_date or self.conn_mgr.config['date_range']['end_date']
+
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+
+        entities = self._resolve_entities(entity_ids)
+        run_start = time.monotonic()
+
+        outcomes = run_tasks_with_timeouts(
+            {
+                entity['id']: (lambda entity=entity: self._extract_entity(
+                    entity, reports, start_date, end_date, output_dir
+                ))
+                for entity in entities
+            },
+            max_workers=self.max_workers,
+            task_timeout=self.entity_timeout
+        )
+
+        entity_results = []
+        for entity in entities:
+            outcome = outcomes[entity['id']]
+            report_results = outcome['result'] or {}
+            success = outcome['status'] == 'success' and all(
+                r['success'] for r in report_results.values()
+            )
+            entity_results.append({
+                'entity_id': entity['id'],
+                'entity_name': entity['name'],
+                'connection_type': entity['connection_type'],
+                'status': outcome['status'],
+                'success': success,
+                'error': outcome['error'],
+                'elapsed': outcome['elapsed'],
+                'reports': report_results,
+            })
+
+        return {
+            'run_at': datetime.now().isoformat(),
+            'period': {'start_date': start_date, 'end_date': end_date},
+            'reports': reports,
+            'total_elapsed': time.monotonic() - run_start,
+            'entities_total': len(entity_results),
+            'entities_succeeded': sum(1 for r in entity_results if r['success']),
+            'entities': entity_results,
+        }
@@ -0,0 +1,277 @@
+"""
+Ledger Store Module
+Persistent local store for SAP B1 Journal Entries and Chart of Accounts
+Lets API entities sync only new/updated documents instead of re-downloading
+the full date range on every extraction
+"""
+
+import json
+import os
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class LedgerStore:
+    """
+    SQLite-backed store of already-fetched ledger data, one database per entity
+    """
+
+    def __init__(self, store_dir: str = None):
+        """
+        Initialize the ledger store
+
+        Args:
+            store_dir: Directory holding the per-entity SQLite files
+        """
+        if store_dir is None:
+            # Default to <project root>/data/sap_ledger, overridable via env
+            project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+            store_dir = os.getenv("SAP_LEDGER_DIR", os.path.join(project_root, "data", "sap_ledger"))
+
+        self.store_dir = store_dir
+        os.makedirs(self.store_dir, exist_ok=True)
+
+    def _db_path(self, entity_id: str) -> str:
+        """Get SQLite file path for an entity"""
+        return os.path.join(self.store_dir, f"{entity_id}.sqlite")
+
+    @contextmanager
+    def _connect(self, entity_id: str):
+        """Open a connection to the entity database, creating the schema if needed"""
+        conn = sqlite3.connect(self._db_path(entity_id), timeout=30)
+        try:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS journal_entries (
+                    jdt_num INTEGER PRIMARY KEY,
+                    reference_date TEXT,
+                    update_date TEXT,
+                    payload TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS ix_je_reference_date
+                    ON journal_entries (reference_date);
+                CREATE TABLE IF NOT EXISTS journal_lines (
+                    jdt_num INTEGER NOT NULL,
+                    line_id INTEGER,
+                    account_code TEXT,
+                    reference_date TEXT,
+                    debit REAL DEFAULT 0,
+                    credit REAL DEFAULT 0
+                );
+                CREATE INDEX IF NOT EXISTS ix_jl_jdt_num ON journal_lines (jdt_num);
+                CREATE INDEX IF NOT EXISTS ix_jl_reference_date ON journal_lines (reference_date);
+                CREATE TABLE IF NOT EXISTS chart_of_accounts (
+                    code TEXT PRIMARY KEY,
+                    payload TEXT NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS sync_state (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                );
+            """)
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _as_date(value) -> Optional[str]:
+        """Normalize SAP date values ('2024-04-01T00:00:00Z') to YYYY-MM-DD"""
+        if not value:
+            return None
+        return str(value)[:10]
+
+    # ========== Sync State ==========
+
+    def get_state(self, entity_id: str) -> Dict[str, Optional[str]]:
+        """
+        Get sync state for an entity
+
+        Returns:
+            Dict with covered_from, covered_to, max_update_date, max_jdt_num
+            and coa_synced_at (values are None when never synced)
+        """
+        state = {
+            'covered_from': None,
+            'covered_to': None,
+            'max_update_date': None,
+            'max_jdt_num': None,
+            'coa_synced_at': None,
+        }
+        with self._connect(entity_id) as conn:
+            for key, value in conn.execute("SELECT key, value FROM sync_state"):
+                state[key] = value
+        return state
+
+    def set_state(self, entity_id: str, **values):
+        """Update sync state keys for an entity"""
+        with self._connect(entity_id) as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO sync_state (key, value) VALUES (?, ?)",
+                [(key, None if value is None else str(value)) for key, value in values.items()]
+            )
+
+    def missing_ranges(self, entity_id: str, start_date: str, end_date: str) -> List[Tuple[str, str]]:
+        """
+        Get the date ranges of [start_date, end_date] not yet held in the store
+
+        Coverage is kept as one contiguous interval, so at most two gaps are
+        returned (before and after the covered interval).
+        """
+        state = self.get_state(entity_id)
+        covered_from, covered_to = state['covered_from'], state['covered_to']
+
+        if not covered_from or not covered_to:
+            return [(start_date, end_date)]
+
+        gaps = []
+        if start_date < covered_from:
+            gaps.append((start_date, _shift_date(covered_from, -1)))
+        if end_date > covered_to:
+            gaps.append((_shift_date(covered_to, 1), end_date))
+        return gaps
+
+    def extend_coverage(self, entity_id: str, start_date: str, end_date: str):
+        """Record that [start_date, end_date] is fully held in the store"""
+        state = self.get_state(entity_id)
+        covered_from = min(filter(None, [state['covered_from'], start_date]))
+        covered_to = max(filter(None, [state['covered_to'], end_date]))
+        self.set_state(entity_id, covered_from=covered_from, covered_to=covered_to)
+
+    # ========== Journal Entries ==========
+
+    def upsert_journal_entries(self, entity_id: str, entries: Iterable[Dict]) -> int:
+        """
+        Insert or replace journal entries and their lines
+
+        Args:
+            entity_id: SAP entity ID
+            entries: JournalEntries records as returned by the Service Layer
+
+        Returns:
+            Number of entries written
+        """
+        entries = [e for e in entries if e.get('JdtNum') is not None]
+        if not entries:
+            return 0
+
+        state = self.get_state(entity_id)
+        max_update_date = state['max_update_date']
+        max_jdt_num = int(state['max_jdt_num']) if state['max_jdt_num'] else None
+
+        with self._connect(entity_id) as conn:
+            jdt_nums = [(int(e['JdtNum']),) for e in entries]
+            conn.executemany("DELETE FROM journal_lines WHERE jdt_num = ?", jdt_nums)
+
+            conn.executemany(
+                "INSERT OR REPLACE INTO journal_entries "
+                "(jdt_num, reference_date, update_date, payload) VALUES (?, ?, ?, ?)",
+                [
+                    (
+                        int(e['JdtNum']),
+                        self._as_date(e.get('ReferenceDate')),
+                        self._as_date(e.get('UpdateDate')),
+                        json.dumps(e, default=str),
+                    )
+                    for e in entries
+                ]
+            )
+
+            conn.executemany(
+                "INSERT INTO journal_lines "
+                "(jdt_num, line_id, account_code, reference_date, debit, credit) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        int(e['JdtNum']),
+                        line.get('Line_ID'),
+                        line.get('AccountCode'),
+                        self._as_date(e.get('ReferenceDate')),
+                        line.get('Debit') or 0,
+                        line.get('Credit') or 0,
+                    )
+                    for e in entries
+                    for line in (e.get('JournalEntryLines') or [])
+                ]
+            )
+
+        for e in entries:
+            update_date = self._as_date(e.get('UpdateDate'))
+            if update_date and (max_update_date is None or update_date > max_update_date):
+                max_update_date = update_date
+            if max_jdt_num is None or int(e['JdtNum']) > max_jdt_num:
+                max_jdt_num = int(e['JdtNum'])
+
+        self.set_state(entity_id, max_update_date=max_update_date, max_jdt_num=max_jdt_num)
+        return len(entries)
+
+    def get_journal_entries(self, entity_id: str, start_date: str, end_date: str) -> List[Dict]:
+        """Get stored journal entries with ReferenceDate in [start_date, end_date]"""
+        with self._connect(entity_id) as conn:
+            rows = conn.execute(
+                "SELECT payload FROM journal_entries "
+                "WHERE reference_date BETWEEN ? AND ? ORDER BY jdt_num",
+                (start_date, end_date)
+            ).fetchall()
+        return [json.loads(payload) for (payload,) in rows]
+
+    def get_account_totals(self, entity_id: str, start_date: str, end_date: str) -> List[Dict]:
+        """
+        Get Debit/Credit totals per account for [start_date, end_date]
+
+        Returns:
+            List of dicts with AccountCode, Debit and Credit
+        """
+        with self._connect(entity_id) as conn:
+            rows = conn.execute(
+                "SELECT account_code, SUM(debit), SUM(credit) FROM journal_lines "
+                "WHERE reference_date BETWEEN ? AND ? GROUP BY account_code",
+                (start_date, end_date)
+            ).fetchall()
+        return [
+            {'AccountCode': code, 'Debit': debit or 0, 'Credit': credit or 0}
+            for code, debit, credit in rows
+        ]
+
+    # ========== Chart of Accounts ==========
+
+    def replace_chart_of_accounts(self, entity_id: str, accounts: List[Dict]):
+        """Replace the stored Chart of Accounts for an entity"""
+        with self._connect(entity_id) as conn:
+            conn.execute("DELETE FROM chart_of_accounts")
+            conn.executemany(
+                "INSERT OR REPLACE INTO chart_of_accounts (code, payload) VALUES (?, ?)",
+                [(str(a.get('Code')), json.dumps(a, default=str)) for a in accounts]
+            )
+        self.set_state(entity_id, coa_synced_at=datetime.now().isoformat())
+
+    def get_chart_of_accounts(self, entity_id: str, max_age_hours: float = 12) -> Optional[List[Dict]]:
+        """
+        Get the stored Chart of Accounts if it was synced recently enough
+
+        Returns:
+            List of account records, or None if missing or stale
+        """
+        synced_at = self.get_state(entity_id)['coa_synced_at']
+        if not synced_at:
+            return None
+
+        age = datetime.now() - datetime.fromisoformat(synced_at)
+        if age.total_seconds() > max_age_hours * 3600:
+            return None
+
+        with self._connect(entity_id) as conn:
+            rows = conn.execute("SELECT payload FROM chart_of_accounts ORDER BY code").fetchall()
+        return [json.loads(payload) for (payload,) in rows]
+
+    def clear(self, entity_id: str):
+        """Remove all stored data for an entity (forces a full re-download)"""
+        path = self._db_path(entity_id)
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def _shift_date(date_str: str, days: int) -> str:
+    """Shift a YYYY-MM-DD date string by a number of days"""
+    return (datetime.strptime(date_str, "%Y-%m-%d") + timedelta(days=days)).strftime("%Y-%m-%d")
@@ -17,6 +17,8 @@ from typing import Dict, List, Optional, Tuple
 import pandas as pd
 import numpy as np
 
+from backend.utils.sheet_loader import HEADER_SNIFF_ROWS, load_sheet
+
 
 class AdjustmentImpactService:
     """Service for analyzing adjustment impacts on trial balance"""
@@ -65,7 +67,21 @@ class AdjustmentImpactService:
             return 'Expenses'
         else:
             return 'Uncategorized'
-    
+
+    @staticmethod
+    def _find_gl_code_header_row(grid: pd.DataFrame) -> int:
+        """
+        Find the row containing "GL Code" in the first rows of a raw sheet grid
+
+        Returns:
+            Header row index, or 0 (first row) if none is found
+        """
+        for idx in range(min(HEADER_SNIFF_ROWS, len(grid))):
+            row_vals = [str(val).lower() for val in grid.iloc[idx].values if pd.notna(val)]
+            if any('gl code' in val or 'gl_code' in val for val in row_vals):
+                return idx
+        return 0
+
     def detect_period_columns(self, df: pd.DataFrame) -> Tuple[Optional[str], Optional[str]]:
         """
         Detect unaudited and adjusted period columns from the dataframe
@@ -152,25 +168,10 @@ class AdjustmentImpactService:
             
             print(f"[AdjustmentImpactService] Reading final  trial balance: {final_tb_path}")
             
-            # First, detect where the actual data starts (skip header rows)
-            # Read first few rows to find the header row with "GL Code"
-            test_df = pd.read_excel(final_tb_path, header=None, nrows=10)
-            header_row = None
-            for idx, row in test_df.iterrows():
-                # Check if this row contains "GL Code" (case insensitive)
-                row_vals = [str(val).lower() for val in row.values if pd.notna(val)]
-                if any('gl code' in val or 'gl_code' in val for val in row_vals):
-                    header_row = idx
-                    print(f"[AdjustmentImpactService] Found header at row {idx}")
-                    break
-            
-            # Read the Excel file with the correct header row
-            if header_row is not None:
-                df = pd.read_excel(final_tb_path, header=header_row, engine='openpyxl')
-            else:
-                # If no header row found, assume first row is header
-                df = pd.read_excel(final_tb_path, engine='openpyxl')
-            
+            # Read the sheet once and apply the row containing "GL Code" as header
+            df, header_row = load_sheet(final_tb_path, detect=self._find_gl_code_header_row)
+            print(f"[AdjustmentImpactService] Using header at row {header_row}")
+
             print(f"[AdjustmentImpactService] Loaded {len(df)} rows")
             print(f"[AdjustmentImpactService] Columns: {df.columns.tolist()}")
             
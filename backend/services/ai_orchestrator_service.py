@@ -2,15 +2,61 @@
 AI Orchestrator Service - Wraps the existing ai_orchestrator functionality
 """
 
+import asyncio
 import json
 import os
-import subprocess
 import sys
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
 
 from .path_service import PathService
 from backend.config.period_config import period_config
+from backend.utils.generate_consolidate_tb import consolidate
+
+
+# Orchestrator runs allowed at once across all entities (each is a separate process)
+MAX_CONCURRENT_ORCHESTRATORS = int(os.getenv("MAX_CONCURRENT_ORCHESTRATORS", "4"))
+ORCHESTRATOR_TIMEOUT_SECONDS = 600
+
+# Output markers from ai_orchestrator.py / generate_consolidate_tb.py -> (progress, message)
+_PROGRESS_MARKERS = [
+    ("PROCESSING ADJUSTMENT #", 35, None),
+    ("GENERATING ADJUSTED TRIAL BALANCE", 60, "Generating adjusted trial balance..."),
+    ("ADJUSTED TRIAL BALANCE GENERATOR", 65, "Loading trial balance and adjustments..."),
+    ("Loaded Trial Balance", 70, None),
+    ("Adjusted Trial Balance created successfully", 88, "Adjusted trial balance created"),
+]
+
+# In-process adjusted-TB consolidations allowed at once (each runs on a worker thread)
+MAX_CONCURRENT_CONSOLIDATIONS = int(os.getenv("MAX_CONCURRENT_CONSOLIDATIONS", "4"))
+
+_orchestrator_slots: Optional[asyncio.Semaphore] = None
+_consolidation_slots: Optional[asyncio.Semaphore] = None
+
+
+def _get_orchestrator_slots() -> asyncio.Semaphore:
+    """Semaphore bounding concurrent orchestrator subprocesses (created on the running loop)"""
+    global _orchestrator_slots
+    if _orchestrator_slots is None:
+        _orchestrator_slots = asyncio.Semaphore(MAX_CONCURRENT_ORCHESTRATORS)
+    return _orchestrator_slots
+
+
+def _get_consolidation_slots() -> asyncio.Semaphore:
+    """Semaphore bounding concurrent in-process consolidations (created on the running loop)"""
+    global _consolidation_slots
+    if _consolidation_slots is None:
+        _consolidation_slots = asyncio.Semaphore(MAX_CONCURRENT_CONSOLIDATIONS)
+    return _consolidation_slots
+
+
+def _progress_from_line(line: str) -> Optional[Tuple[int, str]]:
+    """Map an orchestrator output line to (progress, message), if it marks a milestone"""
+    text = line.strip()
+    for marker, progress, message in _PROGRESS_MARKERS:
+        if text.startswith(marker) or (marker.isupper() and marker in text):
+            return progress, message or text[:200]
+    return None
 
 
 class AIOrchestratorService:
@@ -49,9 +95,7 @@ class AIOrchestratorService:
                 processing_status[processing_id].progress = 20
                 processing_status[processing_id].message = "Validating configuration and files..."
 
-            # Change to the project root directory
             project_root = Path(__file__).parent.parent.parent
-            os.chdir(project_root)
 
             # .env (ANTHROPIC_API_KEY) is optional now; consolidation does not require AI.
             # Proceed even if missing, only warn in logs.
@@ -62,37 +106,30 @@ class AIOrchestratorService:
             # Update progress: Running orchestrator
             if processing_status and processing_id:
                 processing_status[processing_id].progress = 25
-                processing_status[processing_id].message = "Starting AI orchestrator (this may take 3-5 minutes)..."
-            
-            print(f"🤖 Running AI orchestrator for {entity}...")
+                processing_status[processing_id].message = "Waiting for a free orchestrator slot..."
 
             # Run the AI orchestrator from backend/utils with entity parameter
             orchestrator_path = Path(__file__).parent.parent / "utils" / "ai_orchestrator.py"
-            
-            # Increase timeout to 10 minutes for complex entities
-            result = subprocess.run(
-                [sys.executable, str(orchestrator_path), entity],
-                capture_output=True,
-                text=True,
-                cwd=project_root,
-                env={
-                    **os.environ,
-                    'ENTITY': entity,
-                    # Propagate selected period to subprocess
-                    'PERIOD_KEY': period_config.get_current_period() or '',
-                    'PERIOD_COLUMN': period_config.get_current_period_column(default="(Unaudited) Mar'25"),
-                },
-                timeout=600  # Increased to 10 minute timeout
-            )
+
+            async with _get_orchestrator_slots():
+                if processing_status and processing_id:
+                    processing_status[processing_id].message = "Starting AI orchestrator (this may take 3-5 minutes)..."
+
+                print(f"🤖 Running AI orchestrator for {entity}...")
+
+                returncode, stdout, stderr = await self._run_orchestrator(
+                    orchestrator_path,
+                    entity,
+                    project_root,
+                    processing_status,
+                    processing_id
+                )
 
             # Log output for debugging
-            print("=" * 80)
-            print("AI Orchestrator STDOUT:")
-            print(result.stdout)
-            print("=" * 80)
-            if result.stderr:
+            if stderr:
+                print("=" * 80)
                 print("AI Orchestrator STDERR:")
-                print(result.stderr)
+                print(stderr)
                 print("=" * 80)
 
             # Update progress: Processing results
@@ -100,7 +137,7 @@ class AIOrchestratorService:
                 processing_status[processing_id].progress = 90
                 processing_status[processing_id].message = "Validating output files..."
 
-            if result.returncode == 0:
+            if returncode == 0:
                 # Check for output files
                 output_files = self.check_output_files(entity)
 
@@ -110,20 +147,20 @@ class AIOrchestratorService:
                     "output_files": output_files,
                     "execution_time": 0,  # Could be calculated from logs
                     "adjustments": self.parse_adjustment_results(entity),
-                    "stdout": result.stdout,
-                    "stderr": result.stderr
+                    "stdout": stdout,
+                    "stderr": stderr
                 }
             else:
-                error_msg = result.stderr or result.stdout or "Processing failed with no output"
+                error_msg = stderr or stdout or "Processing failed with no output"
                 return {
                     "success": False,
                     "error": error_msg,
-                    "stdout": result.stdout,
-                    "stderr": result.stderr,
-                    "returncode": result.returncode
+                    "stdout": stdout,
+                    "stderr": stderr,
+                    "returncode": returncode
                 }
 
-        except subprocess.TimeoutExpired:
+        except asyncio.TimeoutError:
             timeout_msg = "Processing timeout (exceeded 10 minutes). This usually means the AI service is taking too long or encountered an issue."
             print(f"⏱️ {timeout_msg}")
             return {
@@ -140,6 +177,94 @@ class AIOrchestratorService:
                 "error": f"{str(e)}\n{error_trace}"
             }
 
+    async def _run_orchestrator(self, orchestrator_path: Path, entity: str, project_root: Path,
+                                processing_status: dict = None,
+                                processing_id: str = None) -> Tuple[int, str, str]:
+        """Run the orchestrator as a non-blocking subprocess, streaming stdout into the status
+
+        Returns:
+            Tuple of (returncode, stdout, stderr)
+
+        Raises:
+            asyncio.TimeoutError: If the run exceeds ORCHESTRATOR_TIMEOUT_SECONDS
+        """
+        process = await asyncio.create_subprocess_exec(
+            sys.executable, str(orchestrator_path), entity,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            cwd=project_root,
+            env={
+                **os.environ,
+                'ENTITY': entity,
+                # Propagate selected period to subprocess
+                'PERIOD_KEY': period_config.get_current_period() or '',
+                'PERIOD_COLUMN': period_config.get_current_period_column(default="(Unaudited) Mar'25"),
+                # Flush each print so progress arrives line by line
+                'PYTHONUNBUFFERED': '1',
+            },
+            # Data previews in the orchestrator output can be long single lines
+            limit=1024 * 1024
+        )
+
+        stdout_lines: List[str] = []
+        stderr_lines: List[str] = []
+
+        async def _pump_stdout():
+            async for raw_line in process.stdout:
+                line = raw_line.decode('utf-8', errors='replace').rstrip()
+                stdout_lines.append(line)
+                print(f"[{entity}] {line}")
+
+                if processing_status and processing_id:
+                    status = processing_status[processing_id]
+                    milestone = _progress_from_line(line)
+                    if milestone:
+                        progress, message = milestone
+                        status.progress = max(status.progress, progress)
+                        status.message = message
+
+        async def _pump_stderr():
+            async for raw_line in process.stderr:
+                stderr_lines.append(raw_line.decode('utf-8', errors='replace').rstrip())
+
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(_pump_stdout(), _pump_stderr(), process.wait()),
+                timeout=ORCHESTRATOR_TIMEOUT_SECONDS
+            )
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            raise
+
+        return process.returncode, "\n".join(stdout_lines), "\n".join(stderr_lines)
+
+    async def consolidate_trial_balance(self, entity: str = None, period: str = None) -> Dict[str, Any]:
+        """Generate the adjusted trial balance in-process, without the orchestrator subprocess
+
+        Args:
+            entity: Entity code (defaults to the service entity)
+            period: Period key or column (defaults to the selected period)
+
+        Returns:
+            consolidate() summary: success, entity, period_label, output_file, rows, columns
+        """
+        entity = entity or self.entity
+        async with _get_consolidation_slots():
+            print(f"🧮 Consolidating adjusted trial balance for {entity}...")
+            return await asyncio.to_thread(consolidate, entity, period)
+
+    async def consolidate_entities(self, entities: List[str], period: str = None) -> Dict[str, Dict[str, Any]]:
+        """Consolidate several entities concurrently (bounded by MAX_CONCURRENT_CONSOLIDATIONS)
+
+        Returns:
+            Mapping of entity code to its consolidate() summary
+        """
+        results = await asyncio.gather(
+            *(self.consolidate_trial_balance(entity, period) for entity in entities)
+        )
+        return dict(zip(entities, results))
+
     def check_output_files(self, entity: str = None) -> List[str]:
         """Check which output files were created"""
         entity = entity or self.entity
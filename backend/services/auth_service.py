@@ -3,10 +3,17 @@
 # ============================================================================
 """Authentication and authorization service."""
 
+import asyncio
+import hashlib
 import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Callable, Dict, Optional, Tuple
 
 from jose import JWTError, jwt
 from passlib.context import CryptContext
@@ -14,6 +21,133 @@ from passlib.context import CryptContext
 from backend.config.settings import settings
 from backend.models.auth import TokenData, UserCreate, UserInDB
 
+# Decoded access/refresh token claims are reused for this long (never past the token's exp)
+TOKEN_CACHE_TTL_SECONDS = int(os.getenv("TOKEN_CACHE_TTL_SECONDS", "60"))
+TOKEN_CACHE_MAX_ENTRIES = int(os.getenv("TOKEN_CACHE_MAX_ENTRIES", "1024"))
+
+# bcrypt releases the GIL, so a small thread pool hashes/verifies in parallel off the event loop
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "4"))
+_password_pool: Optional[ThreadPoolExecutor] = None
+_password_pool_lock = threading.Lock()
+
+
+def _get_password_pool() -> ThreadPoolExecutor:
+    """Bounded pool for bcrypt work, created on first use"""
+    global _password_pool
+    with _password_pool_lock:
+        if _password_pool is None:
+            _password_pool = ThreadPoolExecutor(
+                max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash"
+            )
+        return _password_pool
+
+
+class UserStore:
+    """
+    users.json repository
+
+    Users are parsed once and re-read only when the file's mtime or size changes.
+    Writes go to a temp file that replaces users.json atomically, under a lock, so
+    concurrent requests never see a half-written file.
+    """
+
+    def __init__(self, users_file: Path):
+        self.users_file = users_file
+        self._users: Dict[str, Dict] = {}
+        self._fingerprint: Optional[Tuple[int, int]] = None
+        self._lock = threading.RLock()
+
+    def _stat(self) -> Optional[Tuple[int, int]]:
+        """(mtime_ns, size) of the users file, or None if it doesn't exist"""
+        try:
+            stat = self.users_file.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _write(self, users_data: Dict) -> None:
+        """Write via temp file + os.replace and keep the written data as the cache"""
+        temp = self.users_file.with_name(f"{self.users_file.name}.{os.getpid()}.tmp")
+        with open(temp, "w", encoding="utf-8") as f:
+            json.dump(users_data, f, indent=2)
+        os.replace(temp, self.users_file)
+        self._users = users_data
+        self._fingerprint = self._stat()
+
+    def load(self, create_default: Callable[[], Dict]) -> Dict[str, Dict]:
+        """
+        Current users (treat as read-only)
+
+        Args:
+            create_default: Builds the initial users when the file doesn't exist yet
+        """
+        with self._lock:
+            fingerprint = self._stat()
+            if fingerprint is None:
+                self._write(create_default())
+            elif fingerprint != self._fingerprint:
+                with open(self.users_file, "r", encoding="utf-8") as f:
+                    self._users = json.load(f)
+                self._fingerprint = fingerprint
+            return self._users
+
+    def save(self, users_data: Dict) -> None:
+        """Replace the users file atomically"""
+        with self._lock:
+            self._write(users_data)
+
+    @property
+    def lock(self) -> threading.RLock:
+        """Held across a load-modify-save sequence"""
+        return self._lock
+
+
+class TokenClaimsCache:
+    """Small TTL + LRU cache of successfully verified token claims"""
+
+    def __init__(self, ttl_seconds: int, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple, Tuple[TokenData, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(token: str, token_type: str) -> tuple:
+        # Keep a digest rather than the bearer token itself
+        return hashlib.sha256(token.encode("utf-8")).digest(), token_type
+
+    def get(self, token: str, token_type: str) -> Optional[TokenData]:
+        """Cached claims for a token, or None if not cached or expired"""
+        key = self._key(token, token_type)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[1] <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, token: str, token_type: str, token_data: TokenData, token_exp: Optional[float]) -> None:
+        """Cache verified claims until the TTL or the token's own exp, whichever is first"""
+        if self.ttl_seconds <= 0:
+            return
+        expires_at = time.time() + self.ttl_seconds
+        if token_exp is not None:
+            expires_at = min(expires_at, float(token_exp))
+        with self._lock:
+            key = self._key(token, token_type)
+            self._entries[key] = (token_data, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached claims"""
+        with self._lock:
+            self._entries.clear()
+
 
 class AuthService:
     """Service for authentication and user management."""
@@ -25,46 +159,43 @@ class AuthService:
 
     # Users storage file
     _users_file = Path("users.json")
+    _user_store = UserStore(_users_file)
+
+    # Verified token claims
+    _token_cache = TokenClaimsCache(TOKEN_CACHE_TTL_SECONDS, TOKEN_CACHE_MAX_ENTRIES)
 
     @staticmethod
-    def _ensure_users_file():
-        """Private: Ensure users file exists with admin user."""
-        if not AuthService._users_file.exists():
-            # Truncate password to 72 bytes for bcrypt compatibility
-            admin_password = settings.ADMIN_PASSWORD
-            if len(admin_password.encode("utf-8")) > 72:
-                admin_password = admin_password.encode("utf-8")[:72].decode(
-                    "utf-8", errors="ignore"
-                )
-
-            admin_user = {
-                "id": "admin_001",
-                "username": settings.ADMIN_USERNAME,
-                "email": settings.ADMIN_EMAIL,
-                "full_name": "Administrator",
-                "hashed_password": AuthService._get_password_hash(admin_password),
-                "is_active": True,
-                "is_admin": True,
-                "created_at": datetime.now().isoformat(),
-            }
-
-            users_data = {settings.ADMIN_USERNAME: admin_user}
-
-            with open(AuthService._users_file, "w", encoding="utf-8") as f:
-                json.dump(users_data, f, indent=2)
+    def _default_users() -> Dict:
+        """Private: Initial users file content with the admin user."""
+        # Truncate password to 72 bytes for bcrypt compatibility
+        admin_password = settings.ADMIN_PASSWORD
+        if len(admin_password.encode("utf-8")) > 72:
+            admin_password = admin_password.encode("utf-8")[:72].decode(
+                "utf-8", errors="ignore"
+            )
+
+        admin_user = {
+            "id": "admin_001",
+            "username": settings.ADMIN_USERNAME,
+            "email": settings.ADMIN_EMAIL,
+            "full_name": "Administrator",
+            "hashed_password": AuthService._get_password_hash(admin_password),
+            "is_active": True,
+            "is_admin": True,
+            "created_at": datetime.now().isoformat(),
+        }
+
+        return {settings.ADMIN_USERNAME: admin_user}
 
     @staticmethod
     def _load_users() -> Dict:
-        """Private: Load users from file."""
-        AuthService._ensure_users_file()
-        with open(AuthService._users_file, "r", encoding="utf-8") as f:
-            return json.load(f)
+        """Private: Load users (parsed once, re-read only when users.json changes)."""
+        return AuthService._user_store.load(AuthService._default_users)
 
     @staticmethod
     def _save_users(users_data: Dict):
-        """Private: Save users to file."""
-        with open(AuthService._users_file, "w", encoding="utf-8") as f:
-            json.dump(users_data, f, indent=2)
+        """Private: Save users to file atomically."""
+        AuthService._user_store.save(users_data)
 
     @staticmethod
     def _get_password_hash(password: str) -> str:
@@ -154,6 +285,26 @@ class AuthService:
 
         return UserInDB(**user_data)
 
+    @staticmethod
+    async def authenticate_user_async(username: str, password: str) -> Optional[UserInDB]:
+        """
+        Public: authenticate_user on the password pool, for async route handlers.
+
+        bcrypt takes ~250 ms per check at 12 rounds; running it here keeps the event
+        loop serving other requests while sign-ins are verified in parallel.
+
+        Args:
+            username: Username
+            password: Plain text password
+
+        Returns:
+            UserInDB object or None
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            _get_password_pool(), AuthService.authenticate_user, username, password
+        )
+
     @staticmethod
     def create_tokens(user: UserInDB) -> Dict[str, str]:
         """
@@ -188,6 +339,10 @@ class AuthService:
         Returns:
             TokenData object or None
         """
+        cached = AuthService._token_cache.get(token, token_type)
+        if cached is not None:
+            return cached
+
         try:
             payload = jwt.decode(
                 token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM]
@@ -203,7 +358,9 @@ class AuthService:
             if username is None:
                 return None
 
-            return TokenData(username=username, user_id=user_id)
+            token_data = TokenData(username=username, user_id=user_id)
+            AuthService._token_cache.put(token, token_type, token_data, payload.get("exp"))
+            return token_data
 
         except JWTError:
             return None
@@ -237,13 +394,12 @@ class AuthService:
         Returns:
             UserInDB object
         """
-        users = AuthService._load_users()
-
-        if user_create.username in users:
+        if user_create.username in AuthService._load_users():
             raise ValueError("Username already exists")
 
         user_id = f"user_{int(datetime.now().timestamp())}"
 
+        # Hash outside the store lock so concurrent reads aren't blocked by bcrypt
         user_data = {
             "id": user_id,
             "username": user_create.username,
@@ -255,11 +411,32 @@ class AuthService:
             "created_at": datetime.now().isoformat(),
         }
 
-        users[user_create.username] = user_data
-        AuthService._save_users(users)
+        with AuthService._user_store.lock:
+            users = dict(AuthService._load_users())
+            if user_create.username in users:
+                raise ValueError("Username already exists")
+
+            users[user_create.username] = user_data
+            AuthService._save_users(users)
 
         return UserInDB(**user_data)
 
+    @staticmethod
+    async def create_user_async(user_create: UserCreate) -> UserInDB:
+        """
+        Public: create_user on the password pool, for async route handlers.
+
+        Args:
+            user_create: UserCreate object
+
+        Returns:
+            UserInDB object
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            _get_password_pool(), AuthService.create_user, user_create
+        )
+
     @staticmethod
     def refresh_access_token(refresh_token: str) -> Optional[str]:
         """
@@ -1,8 +1,12 @@
 """Company discovery and management service."""
 
+import copy
 import json
 import logging
+import os
 import re
+import threading
+import time
 from collections import defaultdict
 from pathlib import Path
 from typing import Dict, List, Optional
@@ -17,10 +21,22 @@ from backend.models.company import (
 
 logger = logging.getLogger(__name__)
 
+# How often (seconds) the config index checks folder/file mtimes for changes
+CONFIG_INDEX_CHECK_SECONDS = float(os.getenv("CONFIG_INDEX_CHECK_SECONDS", "2"))
+
 
 class CompanyService:
     """Service for managing company data and configuration."""
 
+    # Statement-level config folders and the config file names looked up in them
+    _STATEMENT_FOLDERS = ["cashflow_statement", "cash_flow_statement", "cashflow"]
+    _STATEMENT_CONFIG_NAMES = [
+        "cashflow_statement_config.json",
+        "cash_flow_statement_config.json",
+        "cashflow_config.json",
+        "config.json",
+    ]
+
     @staticmethod
     def _parse_config_filename(filename: str) -> Optional[str]:
         """
@@ -80,26 +96,10 @@ class CompanyService:
         normalized_folder = category_folder.lower().replace("-", "_")
         return folder_mapping.get(normalized_folder, "profit-loss")
 
-    @staticmethod
-    def _get_note_title(config_file: Path) -> str:
-        """
-        Private: Extract note title from config file.
-
-        Args:
-            config_file: Path to config file
-
-        Returns:
-            Note title or "Untitled Note" if not found
-        """
-        config = CompanyService._load_config_file(config_file)
-        if config and "note_title" in config:
-            return config["note_title"]
-        return "Untitled Note"
-
     @staticmethod
     def discover_companies() -> Dict[str, Dict]:
         """
-        Public: Scan config directory and discover all companies and their notes.
+        Public: Get all companies and their notes from the config index.
 
         Structure:
         config/
@@ -108,114 +108,114 @@ class CompanyService:
         │   ├── balance_sheet/
         │   ├── important_notes/
         │   └── cashflow_statement/  ← NEW
-        
+
+        The config tree is scanned once into config_index and rescanned only when a
+        config folder or file changes.
+
         Returns:
             Dictionary of company data
         """
-        companies = defaultdict(
-            lambda: {
-                "notes": [],
-                "csv_file": None,
-                "notes_by_category": defaultdict(list),
-            }
-        )
+        companies = {}
+        for entity_name, entry in config_index.entities().items():
+            company = copy.deepcopy(entry["company"])
+
+            # If csv_file isn't set by any config, try the entity's notes TB folder
+            if company["csv_file"] is None:
+                company["csv_file"] = CompanyService._find_csv_in_entity_folder(entity_name)
 
-        config_path = settings.CONFIG_DIR
-        if not config_path.exists():
-            return {}
+            companies[entity_name] = company
 
-        # Iterate through entity folders
-        for entity_folder in config_path.iterdir():
-            if not entity_folder.is_dir():
+        return companies
+
+    @staticmethod
+    def _scan_entity_configs(entity_folder: Path, watched: Dict[str, int]) -> Dict:
+        """
+        Private: Scan one entity's config folders into a config index entry.
+
+        Args:
+            entity_folder: config/{entity} folder
+            watched: Updated with the mtime of every folder and config file read
+
+        Returns:
+            Index entry: company data (sorted notes, csv_file from configs), note config
+            paths by note number, statement config paths by folder name and the first
+            csv_file found in any note config
+        """
+        company = {
+            "notes": [],
+            "csv_file": None,
+            "notes_by_category": defaultdict(list),
+        }
+        note_paths: Dict[str, Path] = {}
+        statement_configs: Dict[str, Path] = {}
+        config_csv_file = None
+
+        watched[str(entity_folder)] = entity_folder.stat().st_mtime_ns
+
+        # Iterate through category folders (profit_and_loss, balance_sheet, etc.)
+        for category_folder in entity_folder.iterdir():
+            if not category_folder.is_dir():
                 continue
+            watched[str(category_folder)] = category_folder.stat().st_mtime_ns
+
+            category_name = category_folder.name
+            statement_type = CompanyService._get_statement_type_from_path(category_name)
+            is_statement_folder = category_name.lower() in CompanyService._STATEMENT_FOLDERS
+
+            # Handle statement-level configs (cashflow_statement folder)
+            if is_statement_folder:
+                for config_name in CompanyService._STATEMENT_CONFIG_NAMES:
+                    config_file = category_folder / config_name
+                    if not config_file.exists():
+                        continue
+
+                    watched[str(config_file)] = config_file.stat().st_mtime_ns
+                    statement_configs[category_name] = config_file
+
+                    config = CompanyService._load_config_file(config_file)
+                    note_info = {
+                        "number": config.get("note_number", "CASHFLOW") if config else "CASHFLOW",
+                        "title": config.get("note_title", "Cash Flow Statement") if config else "Cash Flow Statement",
+                    }
+                    company["notes"].append(note_info)
+                    company["notes_by_category"][statement_type].append(note_info)
+
+                    if config and "csv_file" in config and company["csv_file"] is None:
+                        company["csv_file"] = config["csv_file"]
+                    break  # Found config, stop looking
+
+            # Regular note configs (note24.json, note25.json, etc.)
+            for config_file in category_folder.glob("note*.json"):
+                watched[str(config_file)] = config_file.stat().st_mtime_ns
+                note_paths.setdefault(config_file.name[len("note"):-len(".json")], config_file)
 
-            entity_name = entity_folder.name
+                config = CompanyService._load_config_file(config_file)
+                if config and "csv_file" in config and config_csv_file is None:
+                    config_csv_file = config["csv_file"]
 
-            # Iterate through category folders (profit_and_loss, balance_sheet, etc.)
-            for category_folder in entity_folder.iterdir():
-                if not category_folder.is_dir():
+                # Statement folders only list their statement config as a note
+                note_number = CompanyService._parse_config_filename(config_file.name)
+                if is_statement_folder or not note_number:
                     continue
 
-                category_name = category_folder.name
-                statement_type = CompanyService._get_statement_type_from_path(
-                    category_name
-                )
+                note_info = {
+                    "number": note_number,
+                    "title": config["note_title"] if config and "note_title" in config else "Untitled Note",
+                }
+                company["notes"].append(note_info)
+                company["notes_by_category"][statement_type].append(note_info)
+
+                # CSV file from the first note config that sets one
+                if company["csv_file"] is None and config and "csv_file" in config:
+                    company["csv_file"] = config["csv_file"]
+
+        return {
+            "company": company,
+            "note_paths": note_paths,
+            "statement_configs": statement_configs,
+            "config_csv_file": config_csv_file,
+        }
 
-                # Handle statement-level configs (cashflow_statement folder)
-                if category_name.lower() in ["cashflow_statement", "cash_flow_statement", "cashflow"]:
-                    logger.info(f"   📊 Processing statement-level folder: {category_name}")
-                    
-                    # Look for the config file
-                    possible_configs = [
-                        "cashflow_statement_config.json",
-                        "cash_flow_statement_config.json", 
-                        "cashflow_config.json",
-                        "config.json"
-                    ]
-                    
-                    for config_name in possible_configs:
-                        config_file = category_folder / config_name
-                        
-                        if config_file.exists():
-                            logger.info(f"   ✅ Found statement config: {config_name}")
-                            
-                            # Load config to get title
-                            config = CompanyService._load_config_file(config_file)
-                            note_title = config.get("note_title", "Cash Flow Statement") if config else "Cash Flow Statement"
-                            note_number = config.get("note_number", "CASHFLOW") if config else "CASHFLOW"
-                            
-                            # Create note info
-                            note_info = {
-                                "number": note_number,
-                                "title": note_title
-                            }
-                            
-                            companies[entity_name]["notes"].append(note_info)
-                            companies[entity_name]["notes_by_category"][statement_type].append(note_info)
-                            
-                            # Get CSV file if specified
-                            if config and "csv_file" in config and companies[entity_name]["csv_file"] is None:
-                                companies[entity_name]["csv_file"] = config["csv_file"]
-                            
-                            break  # Found config, stop looking
-                    
-                    continue  # Skip the regular note*.json search for this folder
-
-                # Standard handling for regular note configs (note24.json, note25.json, etc.)
-                for config_file in category_folder.glob("note*.json"):
-                    note_number = CompanyService._parse_config_filename(
-                        config_file.name
-                    )
-
-                    if note_number:
-                        # Get note title from config
-                        note_title = CompanyService._get_note_title(config_file)
-
-                        # Create NoteInfo object
-                        note_info = {
-                            "number": note_number,
-                            "title": note_title
-                        }
-
-                        companies[entity_name]["notes"].append(note_info)
-                        companies[entity_name]["notes_by_category"][
-                            statement_type
-                        ].append(note_info)
-
-                        # Load config to get CSV file (only if not already set)
-                        if companies[entity_name]["csv_file"] is None:
-                            config = CompanyService._load_config_file(config_file)
-                            if config and "csv_file" in config:
-                                companies[entity_name]["csv_file"] = config["csv_file"]
-
-            # After processing all configs, if csv_file still not set, try to find it
-            if companies[entity_name]["csv_file"] is None:
-                csv_from_folder = CompanyService._find_csv_in_entity_folder(entity_name)
-                if csv_from_folder:
-                    companies[entity_name]["csv_file"] = csv_from_folder
-
-        # Sort notes numerically
-        return CompanyService._sort_company_notes(companies)
     @staticmethod
     def _sort_company_notes(companies: Dict) -> Dict:
         """
@@ -287,7 +287,7 @@ class CompanyService:
     @staticmethod
     def _find_csv_in_configs(company_name: str) -> Optional[str]:
         """
-        Private: Search config files for CSV filename.
+        Private: Get the CSV filename set in the company's note configs.
 
         Args:
             company_name: Name of the company
@@ -295,21 +295,8 @@ class CompanyService:
         Returns:
             CSV filename or None
         """
-        entity_path = settings.CONFIG_DIR / company_name
-        if not entity_path.exists():
-            return None
-
-        # Search in all category folders
-        for category_folder in entity_path.iterdir():
-            if not category_folder.is_dir():
-                continue
-
-            for config_file in category_folder.glob("note*.json"):
-                config = CompanyService._load_config_file(config_file)
-                if config and "csv_file" in config:
-                    return config["csv_file"]
-
-        return None
+        entry = config_index.get_entity(company_name)
+        return entry["config_csv_file"] if entry else None
 
     @staticmethod
     def get_csv_file_for_company(company_name: str) -> str:
@@ -345,7 +332,7 @@ class CompanyService:
         """
         Public: Get the full path to a config file for a specific note.
         
-        Searches in category folders and also handles special statement configs.
+        Looks the note up in the config index, including special statement configs.
 
         Args:
             company_name: Name of the company/entity
@@ -354,76 +341,41 @@ class CompanyService:
         Returns:
             Path to config file or None if not found
         """
-        entity_path = settings.CONFIG_DIR / company_name
-        
-        logger.info(f"🔍 Searching for config file")
-        logger.info(f"   Entity: {company_name}")
-        logger.info(f"   Note Number: {note_number}")
-        logger.info(f"   Entity Path: {entity_path}")
-        
-        if not entity_path.exists():
-            logger.error(f"   ❌ Entity path does not exist: {entity_path}")
-            return None
-
-        # Special handling for statement-level configs (CASHFLOW, etc.)
-        if note_number.upper() in ["CASHFLOW", "CASH-FLOW"]:
-            logger.info(f"   🔄 Detected statement-level note: {note_number}")
-            
-            # Look for cashflow_statement folder
-            statement_folders = ["cashflow_statement", "cash_flow_statement", "cashflow"]
-            
-            for folder_name in statement_folders:
-                statement_folder = entity_path / folder_name
-                logger.info(f"   Checking folder: {statement_folder}")
-                
-                if statement_folder.exists() and statement_folder.is_dir():
-                    logger.info(f"   ✅ Found statement folder: {folder_name}")
-                    
-                    # Look for config files in this folder
-                    possible_config_names = [
-                        "cashflow_statement_config.json",
-                        "cash_flow_statement_config.json",
-                        "cashflow_config.json",
-                        "config.json",
-                    ]
-                    
-                    for config_name in possible_config_names:
-                        config_path = statement_folder / config_name
-                        logger.info(f"      Trying: {config_name}")
-                        
-                        if config_path.exists():
-                            logger.info(f"   ✅ Found config file: {config_name}")
-                            return config_path
-        
-        # Standard search in category folders (for regular notes like note24.json)
-        logger.info(f"   🔄 Searching in category folders for note{note_number}.json")
-        
-        for category_folder in entity_path.iterdir():
-            if not category_folder.is_dir():
+        for attempt in range(2):
+            # The index is rechecked only every CONFIG_INDEX_CHECK_SECONDS, so a miss
+            # rescans once in case the config was added since
+            if attempt:
+                config_index.invalidate()
+
+            entry = config_index.get_entity(company_name)
+            if entry is None:
                 continue
-            
-            logger.info(f"   Checking category: {category_folder.name}")
-            
-            config_file = category_folder / f"note{note_number}.json"
-            
-            if config_file.exists():
-                logger.info(f"   ✅ Found config: {category_folder.name}/note{note_number}.json")
+
+            config_file = None
+
+            # Statement-level configs (CASHFLOW, etc.)
+            if note_number.upper() in ["CASHFLOW", "CASH-FLOW"]:
+                config_file = next(
+                    (entry["statement_configs"][folder] for folder in CompanyService._STATEMENT_FOLDERS
+                     if folder in entry["statement_configs"]),
+                    None,
+                )
+
+            # Regular notes (note24.json in any category folder)
+            if config_file is None:
+                config_file = entry["note_paths"].get(note_number)
+
+            if config_file is not None and config_file.exists():
+                logger.info(f"   ✅ Found config: {config_file.parent.name}/{config_file.name}")
                 return config_file
-        
-        # List all available files for debugging
-        logger.error(f"   ❌ Config file not found for note {note_number}")
-        logger.error(f"   Available folders in {entity_path}:")
-        try:
-            for folder in entity_path.iterdir():
-                if folder.is_dir():
-                    logger.error(f"      📁 {folder.name}/")
-                    json_files = list(folder.glob("*.json"))
-                    for json_file in json_files:
-                        logger.error(f"         - {json_file.name}")
-        except Exception as e:
-            logger.error(f"   Error listing folders: {e}")
-        
+
+        if entry is None:
+            logger.error(f"   ❌ Entity path does not exist: {settings.CONFIG_DIR / company_name}")
+            return None
+        logger.error(f"   ❌ Config file not found for {company_name} note {note_number}")
+        logger.error(f"   Available notes: {sorted(entry['note_paths'])}")
         return None
+
     @staticmethod
     def get_all_companies() -> List[Company]:
         """Public: Get list of all companies."""
@@ -452,20 +404,12 @@ class CompanyService:
     @staticmethod
     def get_company_by_name(company_name: str) -> Optional[Company]:
         """Public: Get company details by name."""
-        companies_dict = CompanyService.discover_companies()
-
         # Case-insensitive lookup
-        company_name_lower = company_name.lower()
-        matched_company = None
-        for key in companies_dict:
-            if key.lower() == company_name_lower:
-                matched_company = key
-                break
-
+        matched_company = config_index.match_entity_name(company_name)
         if not matched_company:
             return None
 
-        details = companies_dict[matched_company]
+        details = CompanyService.discover_companies()[matched_company]
         csv_file = details.get("csv_file") or CompanyService.get_csv_file_for_company(
             matched_company
         )
@@ -548,20 +492,12 @@ class CompanyService:
         company_name: str,
     ) -> Optional[CompanyWithCategories]:
         """Public: Get company details with notes organized by categories."""
-        companies_dict = CompanyService.discover_companies()
-
         # Case-insensitive lookup
-        company_name_lower = company_name.lower()
-        matched_company = None
-        for key in companies_dict:
-            if key.lower() == company_name_lower:
-                matched_company = key
-                break
-
+        matched_company = config_index.match_entity_name(company_name)
         if not matched_company:
             return None
 
-        details = companies_dict[matched_company]
+        details = CompanyService.discover_companies()[matched_company]
         csv_file = details.get("csv_file") or CompanyService.get_csv_file_for_company(
             matched_company
         )
@@ -582,3 +518,100 @@ class CompanyService:
             notes=notes,
             categories=categories,
         )
+
+
+class ConfigIndex:
+    """
+    In-memory index of the config/ tree (entities, note configs, statement configs)
+
+    Built once (at startup or on first use) and rebuilt only when a watched folder or
+    config file changes mtime; the mtimes are checked at most every
+    CONFIG_INDEX_CHECK_SECONDS. Lookups by entity and note number are dict lookups.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, Dict] = {}
+        self._names_lower: Dict[str, str] = {}
+        self._watched: Dict[str, int] = {}
+        self._root: Optional[Path] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self.builds = 0
+
+    def _is_current(self, root: Path) -> bool:
+        """Whether the index was built from root and nothing watched has changed"""
+        if self._root != root:
+            return False
+        if time.monotonic() - self._checked_at < CONFIG_INDEX_CHECK_SECONDS:
+            return True
+        for path, mtime_ns in self._watched.items():
+            try:
+                if os.stat(path).st_mtime_ns != mtime_ns:
+                    return False
+            except OSError:
+                return False
+        self._checked_at = time.monotonic()
+        return True
+
+    def _build(self, root: Path) -> None:
+        """Scan the config tree into the index"""
+        entries: Dict[str, Dict] = {}
+        watched: Dict[str, int] = {}
+        if root.exists():
+            watched[str(root)] = root.stat().st_mtime_ns
+            for entity_folder in root.iterdir():
+                if entity_folder.is_dir():
+                    entries[entity_folder.name] = CompanyService._scan_entity_configs(entity_folder, watched)
+            # Sort notes numerically (in place)
+            CompanyService._sort_company_notes({name: entry["company"] for name, entry in entries.items()})
+
+        names_lower: Dict[str, str] = {}
+        for name in entries:
+            names_lower.setdefault(name.lower(), name)
+
+        self._entries, self._names_lower, self._watched = entries, names_lower, watched
+        self._root = root
+        self._checked_at = time.monotonic()
+        self.builds += 1
+        logger.info(f"Config index built: {len(entries)} entities, {len(watched)} paths watched")
+
+    def _current(self) -> Dict[str, Dict]:
+        """Index entries, rebuilt first if the config tree changed"""
+        root = Path(settings.CONFIG_DIR)
+        with self._lock:
+            if not self._is_current(root):
+                self._build(root)
+            return self._entries
+
+    def refresh(self) -> int:
+        """
+        Rebuild the index now
+
+        Returns:
+            Number of entities indexed
+        """
+        with self._lock:
+            self._build(Path(settings.CONFIG_DIR))
+            return len(self._entries)
+
+    def invalidate(self) -> None:
+        """Force a rebuild on the next lookup"""
+        with self._lock:
+            self._root = None
+
+    def entities(self) -> Dict[str, Dict]:
+        """All index entries by entity folder name (treat as read-only)"""
+        return self._current()
+
+    def get_entity(self, entity_name: str) -> Optional[Dict]:
+        """Index entry for an entity folder name (exact match)"""
+        return self._current().get(entity_name)
+
+    def match_entity_name(self, entity_name: str) -> Optional[str]:
+        """Entity folder name matching entity_name case-insensitively"""
+        self._current()
+        return self._names_lower.get(entity_name.lower())
+
+
+# Process-wide instance
+config_index = ConfigIndex()
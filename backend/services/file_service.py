@@ -6,6 +6,9 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List
 
+from backend.utils.sheet_preview import release_workbook
+from backend.utils.upload_sidecar import remove_sidecar
+
 from .path_service import PathService
 
 
@@ -47,6 +50,7 @@ class FileService:
         print(f"      File exists: {file_path.exists()}")
 
         # If file exists, remove it first to ensure clean overwrite
+        release_workbook(file_path)
         if file_path.exists():
             print("      Removing existing file...")
             file_path.unlink()
@@ -72,6 +76,7 @@ class FileService:
         file_path = self.path_service.get_manual_adjustments_dir(entity) / filename
 
         # Save file
+        release_workbook(file_path)
         with open(file_path, "wb") as buffer:
             content = await file.read()
             buffer.write(content)
@@ -87,6 +92,7 @@ class FileService:
         file_path = self.path_service.get_unadjusted_tb_dir(entity) / filename
 
         # Save file
+        release_workbook(file_path)
         with open(file_path, "wb") as buffer:
             content = await file.read()
             buffer.write(content)
@@ -102,6 +108,7 @@ class FileService:
         file_path = self.path_service.get_manual_adjustments_dir(entity) / filename
 
         # Save file
+        release_workbook(file_path)
         with open(file_path, "wb") as buffer:
             content = await file.read()
             buffer.write(content)
@@ -285,13 +292,17 @@ class FileService:
         # - If it doesn't exist, still return True so UI can clean up state.
         file_info = self.check_file_exists(file_path, folder_type, entity)
         if file_info.get("exists"):
+            release_workbook(file_info["path"])
             Path(file_info["path"]).unlink()
+            remove_sidecar(file_info["path"])
             return True
         # If folder_type was invalid previously, try resolving via get_file_path
         try:
             resolved_path = Path(self.get_file_path(file_path, folder_type, entity))
             if resolved_path.exists():
+                release_workbook(resolved_path)
                 resolved_path.unlink()
+                remove_sidecar(resolved_path)
         except Exception:
             # Ignore resolution errors and treat as already deleted
             pass
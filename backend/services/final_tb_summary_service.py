@@ -12,6 +12,8 @@ from typing import Dict, List, Optional
 import pandas as pd
 import numpy as np
 
+from backend.utils.workbook_cache import read_excel_cached
+
 
 class FinalTrialBalanceSummaryService:
     """Service for analyzing final trial balance with BSPL and Ind AS categorization"""
@@ -94,7 +96,7 @@ class FinalTrialBalanceSummaryService:
                 }
             
             # Read the Excel file
-            df = pd.read_excel(tb_file, engine='openpyxl')
+            df = read_excel_cached(tb_file, engine='openpyxl')
             
             print(f"[FinalTBSummaryService] Loaded {len(df)} rows from {tb_file.name}")
             print(f"[FinalTBSummaryService] Columns: {df.columns.tolist()}")
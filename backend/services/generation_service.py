@@ -3,10 +3,12 @@
 # ============================================================================
 """Note generation service using Gemini AI - with Important Notes support and detailed logging."""
 
+import asyncio
 import json
 import logging
+import threading
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 
 import pandas as pd
@@ -21,6 +23,7 @@ from backend.config.settings import settings
 from backend.models.generation import BatchGenerationStatus, GenerationResponse
 from backend.services.company_service import CompanyService
 from backend.services.currency_service import CurrencyService
+from backend.services.llm_cache_service import LLMCacheService
 
 # Configure logger
 logger = logging.getLogger(__name__)
@@ -660,16 +663,22 @@ class GenerationService:
 
     @staticmethod
     def _generate_note_with_ai(
-        csv_data: str, system_prompt: str, config: dict, auxiliary_data: Dict[str, str] = None
+        csv_data: str, system_prompt: str, config: dict, auxiliary_data: Dict[str, str] = None,
+        use_cache: bool = True
     ) -> Optional[str]:
         """
         Private: Generate financial notes using configured LLM provider.
 
+        Responses are cached by a hash of both prompts and the provider/model, so a
+        note whose config, trial balance and auxiliary files are unchanged is served
+        without an LLM call.
+
         Args:
             csv_data: CSV content
             system_prompt: System instructions
             config: Configuration dictionary
             auxiliary_data: Optional auxiliary file contents
+            use_cache: Set False to bypass the response cache for this call
 
         Returns:
             Generated note content or None
@@ -687,6 +696,24 @@ class GenerationService:
             user_prompt = GenerationService._build_user_prompt(config, csv_data, auxiliary_data)
             
             logger.info(f"User Prompt Length: {len(user_prompt)} characters")
+
+            # Check the response cache before calling the LLM
+            cache_key = None
+            if use_cache and settings.LLM_CACHE_ENABLED:
+                provider_info = LLMService.get_provider_info()
+                provider, model = provider_info["provider"], provider_info.get("model", "")
+                cache_key = LLMCacheService.make_key(system_prompt, user_prompt, provider, model)
+
+                cached = LLMCacheService.get(cache_key)
+                if cached is not None:
+                    logger.info(f"♻️  Cache hit ({cache_key[:12]}), skipping LLM call")
+                    logger.info(f"📄 Cached content length: {len(cached)} characters")
+                    logger.info("=" * 80)
+                    return cached
+                logger.info(f"🔍 Cache miss ({cache_key[:12]})")
+            else:
+                logger.info("⏭️  Response cache bypassed")
+
             logger.info(f"🚀 Sending request to LLM service...")
 
             # Generate using configured LLM provider
@@ -695,6 +722,8 @@ class GenerationService:
             if result:
                 logger.info(f"✅ AI generation successful")
                 logger.info(f"📄 Generated content length: {len(result)} characters")
+                if cache_key:
+                    LLMCacheService.put(cache_key, result, provider, model)
             else:
                 logger.error(f"❌ AI generation returned None")
             
@@ -841,13 +870,33 @@ class GenerationService:
             return default
 
     @staticmethod
-    def generate_single_note(company_name: str, note_number: str) -> GenerationResponse:
+    def _create_note_log_handler(log_path: Path) -> logging.FileHandler:
+        """
+        Private: Create a per-note log file handler bound to the calling thread.
+
+        Args:
+            log_path: Path of the note log file
+
+        Returns:
+            FileHandler that only accepts records emitted by the current thread
+        """
+        thread_id = threading.get_ident()
+
+        file_handler = logging.FileHandler(log_path, encoding='utf-8')
+        file_handler.setLevel(logging.INFO)
+        file_handler.setFormatter(logging.Formatter('%(message)s'))
+        file_handler.addFilter(lambda record: record.thread == thread_id)
+        return file_handler
+
+    @staticmethod
+    def generate_single_note(company_name: str, note_number: str, use_cache: bool = True) -> GenerationResponse:
         """
         Public: Generate a single note for a company.
 
         Args:
             company_name: Name of the company/entity
             note_number: Note number to generate
+            use_cache: Set False to force a fresh LLM call
 
         Returns:
             GenerationResponse object
@@ -869,15 +918,12 @@ class GenerationService:
         
         # Get the generation service logger
         gen_logger = logging.getLogger('backend.services.generation_service')
-        gen_logger.handlers.clear()  # Remove all handlers
         gen_logger.propagate = False  # Don't send to parent loggers
         gen_logger.setLevel(logging.INFO)
         
-        # Create ONLY file handler with simple message-only format
-        file_handler = logging.FileHandler(log_path, encoding='utf-8')
-        file_handler.setLevel(logging.INFO)
-        formatter = logging.Formatter('%(message)s')  # Simple format - just the message
-        file_handler.setFormatter(formatter)
+        # Create ONLY file handler with simple message-only format, scoped to
+        # this thread so notes generated concurrently keep separate logs
+        file_handler = GenerationService._create_note_log_handler(log_path)
         
         # Add file handler to generation service logger
         gen_logger.addHandler(file_handler)
@@ -939,9 +985,7 @@ class GenerationService:
             log_path.rename(final_log_path)
             
             # Create new handler with final filename
-            file_handler = logging.FileHandler(final_log_path, encoding='utf-8')
-            file_handler.setLevel(logging.INFO)
-            file_handler.setFormatter(formatter)
+            file_handler = GenerationService._create_note_log_handler(final_log_path)
             gen_logger.addHandler(file_handler)
             
             gen_logger.info(f"📄 Log file renamed to: {final_log_filename}")
@@ -1043,7 +1087,7 @@ class GenerationService:
             # Generate with AI
             gen_logger.info("\n🤖 Calling AI service for content generation...")
             result = GenerationService._generate_note_with_ai(
-                csv_data, system_prompt, config, auxiliary_data
+                csv_data, system_prompt, config, auxiliary_data, use_cache
             )
             
             if result is None:
@@ -1113,31 +1157,133 @@ class GenerationService:
                 note_number=note_number,
             )
     @staticmethod
+    def _resolve_note_dependencies(company_name: str, notes: List[dict]) -> Dict[str, List[str]]:
+        """
+        Private: Work out which notes in a batch must finish before each note starts.
+
+        A note config can list prerequisites explicitly with "depends_on": [note numbers].
+        Cash flow statements are derived from the P&L and Balance Sheet figures, so they
+        implicitly wait for every profit-loss and balance-sheet note in the batch.
+        Dependencies outside the batch are ignored and cycles are broken with a warning.
+
+        Args:
+            company_name: Name of the company
+            notes: Note info dicts ({"number", "title"}) in the batch
+
+        Returns:
+            Dictionary of note number -> prerequisite note numbers
+        """
+        batch_numbers = [str(n["number"]) for n in notes]
+        statement_types = {}
+        explicit = {}
+
+        for number in batch_numbers:
+            config_file_path = CompanyService.get_config_file_path(company_name, number)
+            config = GenerationService._load_config(config_file_path) if config_file_path else None
+            config = config or {}
+            statement_types[number] = config.get("statement_type", "profit-loss")
+            explicit[number] = [str(d) for d in config.get("depends_on", [])]
+
+        statement_notes = [
+            n for n in batch_numbers
+            if statement_types[n] in ["profit-loss", "balance-sheet"]
+        ]
+
+        dependencies = {}
+        for number in batch_numbers:
+            deps = list(explicit[number])
+            if statement_types[number] in ["cash-flow", "cashflow"]:
+                deps.extend(statement_notes)
+            dependencies[number] = [
+                d for d in dict.fromkeys(deps) if d in batch_numbers and d != number
+            ]
+
+        # Break cycles: walk depth-first and drop any edge that points back into the stack
+        visiting, visited = set(), set()
+
+        def visit(number):
+            visiting.add(number)
+            for dep in list(dependencies[number]):
+                if dep in visiting:
+                    logger.warning(f"⚠️  Dependency cycle: Note {number} -> Note {dep}, ignoring")
+                    dependencies[number].remove(dep)
+                elif dep not in visited:
+                    visit(dep)
+            visiting.discard(number)
+            visited.add(number)
+
+        for number in batch_numbers:
+            if number not in visited:
+                visit(number)
+
+        return dependencies
+
+    @staticmethod
+    def _order_notes_by_dependencies(notes: List[dict], dependencies: Dict[str, List[str]]) -> List[dict]:
+        """
+        Private: Order notes so prerequisites come first, otherwise keeping the original order.
+
+        Args:
+            notes: Note info dicts in the batch
+            dependencies: Note number -> prerequisite note numbers (acyclic)
+
+        Returns:
+            Notes in dependency order
+        """
+        by_number = {str(n["number"]): n for n in notes}
+        ordered, placed = [], set()
+
+        def place(number):
+            if number in placed:
+                return
+            placed.add(number)
+            for dep in dependencies.get(number, []):
+                place(dep)
+            ordered.append(by_number[number])
+
+        for number in by_number:
+            place(number)
+
+        return ordered
+
+    @staticmethod
     async def batch_generate_notes(
-        company_name: str, batch_id: str, category_id: Optional[str] = None
+        company_name: str, batch_id: str, category_id: Optional[str] = None,
+        max_workers: Optional[int] = None, use_cache: bool = True
     ):
         """
         Public: Background task to generate notes for a company.
 
+        Notes run concurrently on worker threads, up to max_workers at a time.
+        A note starts only after its prerequisites (see _resolve_note_dependencies)
+        have finished. LLM calls are throttled and retried inside LLMService.
+
         Args:
             company_name: Name of the company
             batch_id: Unique batch identifier
             category_id: Optional category filter
+            max_workers: Notes generated at once, defaults to settings.LLM_BATCH_WORKERS
+            use_cache: Set False to force fresh LLM calls for every note
         """
+        max_workers = max(max_workers or settings.LLM_BATCH_WORKERS, 1)
+
         logger.info("=" * 80)
         logger.info("🔄 STARTING BATCH NOTE GENERATION")
         logger.info("=" * 80)
         logger.info(f"Company: {company_name}")
         logger.info(f"Batch ID: {batch_id}")
         logger.info(f"Category Filter: {category_id or 'All categories'}")
+        logger.info(f"Workers: {max_workers}")
         logger.info("=" * 80)
         
+        batch = GenerationService.batch_status[batch_id]
+
         try:
             companies = CompanyService.discover_companies()
             if company_name not in companies:
                 logger.error(f"❌ Company not found: {company_name}")
-                GenerationService.batch_status[batch_id].status = "failed"
-                GenerationService.batch_status[batch_id].results.append(
+                batch.status = "failed"
+                batch.results.append(
                     GenerationResponse(
                         success=False, message=f"Company not found: {company_name}"
                     )
@@ -1154,36 +1300,72 @@ class GenerationService:
                 notes = companies[company_name]["notes"]
                 logger.info(f"📝 Generating all {len(notes)} notes")
 
-            GenerationService.batch_status[batch_id].total_notes = len(notes)
-            GenerationService.batch_status[batch_id].status = "running"
+            dependencies = await asyncio.to_thread(
+                GenerationService._resolve_note_dependencies, company_name, notes
+            )
+            notes = GenerationService._order_notes_by_dependencies(notes, dependencies)
 
-            for idx, note_info in enumerate(notes, 1):
-                note_number = note_info["number"]
-                logger.info(f"\n{'='*80}")
-                logger.info(f"📝 Processing note {idx}/{len(notes)}: Note {note_number}")
-                logger.info(f"{'='*80}")
-                
-                GenerationService.batch_status[batch_id].current_note = note_number
+            batch.total_notes = len(notes)
+            batch.status = "running"
+
+            finished = {str(n["number"]): asyncio.Event() for n in notes}
+            failed = set()
+            worker_slots = asyncio.Semaphore(max_workers)
+
+            async def run_note(note_info):
+                note_number = str(note_info["number"])
+
+                for dep in dependencies[note_number]:
+                    await finished[dep].wait()
+
+                failed_deps = [d for d in dependencies[note_number] if d in failed]
+                if failed_deps:
+                    logger.warning(
+                        f"⚠️  Note {note_number} depends on failed note(s) {failed_deps}, generating anyway"
+                    )
+
+                async with worker_slots:
+                    logger.info(f"📝 Starting Note {note_number} "
+                                f"({batch.completed_notes}/{batch.total_notes} done)")
+                    batch.current_note = note_number
+                    batch.running_notes.append(note_number)
+
+                    try:
+                        result = await asyncio.to_thread(
+                            GenerationService.generate_single_note, company_name, note_number, use_cache
+                        )
+                    except Exception as e:
+                        result = GenerationResponse(
+                            success=False,
+                            message=f"Error generating note: {str(e)}",
+                            note_number=note_number,
+                        )
+                    finally:
+                        batch.running_notes.remove(note_number)
+
+                batch.results.append(result)
+                batch.completed_notes += 1
 
-                result = GenerationService.generate_single_note(
-                    company_name, note_number
-                )
-                GenerationService.batch_status[batch_id].results.append(result)
-                GenerationService.batch_status[batch_id].completed_notes += 1
-                
                 if result.success:
                     logger.info(f"✅ Note {note_number} completed successfully")
                 else:
+                    failed.add(note_number)
+                    batch.failed_notes += 1
                     logger.error(f"❌ Note {note_number} failed: {result.message}")
 
-            GenerationService.batch_status[batch_id].status = "completed"
-            GenerationService.batch_status[batch_id].current_note = None
+                finished[note_number].set()
+
+            await asyncio.gather(*(run_note(n) for n in notes))
+
+            batch.status = "completed"
+            batch.current_note = None
             
             logger.info("\n" + "=" * 80)
             logger.info("✅ BATCH GENERATION COMPLETED")
             logger.info("=" * 80)
             logger.info(f"Total notes: {len(notes)}")
-            logger.info(f"Completed: {GenerationService.batch_status[batch_id].completed_notes}")
+            logger.info(f"Completed: {batch.completed_notes}")
+            logger.info(f"Failed: {batch.failed_notes}")
             logger.info("=" * 80 + "\n")
 
         except Exception as e:
@@ -1195,8 +1377,9 @@ class GenerationService:
             logger.error(traceback.format_exc())
             logger.error("=" * 80 + "\n")
             
-            GenerationService.batch_status[batch_id].status = "failed"
-            GenerationService.batch_status[batch_id].results.append(
+            batch.status = "failed"
+            batch.current_note = None
+            batch.results.append(
                 GenerationResponse(
                     success=False, message=f"Batch generation failed: {str(e)}"
                 )
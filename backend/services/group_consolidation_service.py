@@ -0,0 +1,444 @@
+"""
+Group Consolidation Service
+
+Builds a group trial balance from the final trial balances of the entities:
+- Each entity's adjusted period column is translated into the presentation currency:
+  PL at the average rate, equity majors at the historical rate, other BS lines at the
+  closing rate. The translation difference is posted to a Foreign currency translation
+  reserve line so every translated TB still balances
+- Lines without a BS/PL mapping can't be assigned a rate; they are carried at the closing
+  rate with Rate Type "unmapped" and reported per entity and in the result warnings
+- Intercompany balances are eliminated by GL mapping (config/group_consolidation.json)
+- Entities are translated in parallel; translations are cached per entity and keyed by
+  the final TB fingerprint and the rates used, so a change to one entity only
+  re-translates that entity
+"""
+
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from backend.config.entities import EntityConfig
+from backend.config.settings import settings
+from backend.services.currency_service import CurrencyService
+from backend.services.fx_rate_service import FxRateService
+from backend.utils.gl_codes import normalize_gl_code
+from backend.utils.workbook_cache import file_fingerprint, read_excel_cached
+
+GROUP_CONSOLIDATION_WORKERS = int(os.getenv("GROUP_CONSOLIDATION_WORKERS", "4"))
+
+RATE_TYPES = ("closing", "average", "historical")
+CATEGORY_COLUMNS = ["BSPL", "Ind AS Major", "Ind AS Minor"]
+FCTR_GL_CODE = "FCTR"
+FCTR_DESCRIPTION = "Foreign currency translation reserve"
+IC_DIFFERENCE_GL_CODE = "ICDIFF"
+IC_DIFFERENCE_DESCRIPTION = "Intercompany elimination difference"
+UNMAPPED_RATE_TYPE = "unmapped"
+# GL codes listed per entity in the unmapped-lines report
+UNMAPPED_GL_CODES_LISTED = 20
+
+# entity -> (cache key, (translated frame, period column))
+_translations: Dict[str, Tuple[tuple, Tuple[pd.DataFrame, str]]] = {}
+_translations_lock = threading.Lock()
+_translation_stats = {'hits': 0, 'misses': 0}
+
+
+def translation_cache_stats() -> Dict[str, Any]:
+    """Hit/miss counts and cached entities of the translation cache"""
+    with _translations_lock:
+        return {**_translation_stats, 'entities': sorted(_translations)}
+
+
+def clear_translation_cache() -> None:
+    """Drop all cached entity translations"""
+    with _translations_lock:
+        _translations.clear()
+
+
+def _adjusted_column(df: pd.DataFrame, period: Optional[str]) -> Optional[str]:
+    """
+    Pick the adjusted balance column of a final TB
+
+    Args:
+        df: Final trial balance
+        period: Short period label (e.g. "Mar'25"); latest adjusted column if None
+
+    Returns:
+        Column name, or None if the TB has no adjusted column (for that period)
+    """
+    adjusted = [c for c in df.columns if str(c).strip().endswith("Adjusted")
+                and not str(c).lower().startswith("(unaudited)")]
+    if period:
+        wanted = f"{period} Adjusted"
+        return wanted if wanted in adjusted else None
+    return adjusted[-1] if adjusted else None
+
+
+def translate_trial_balance(df: pd.DataFrame, amount_column: str, rates: Dict[str, float],
+                            historical_majors: List[str]) -> pd.DataFrame:
+    """
+    Translate one entity's final TB into the presentation currency
+
+    Args:
+        df: Final trial balance (GL Code, GL Description, BSPL, Ind AS Major/Minor, amounts)
+        amount_column: Local-currency balance column to translate
+        rates: Rate per rate type ('closing', 'average', 'historical')
+        historical_majors: Ind AS Major categories translated at the historical rate
+
+    Returns:
+        Detail frame with Local Amount, Rate Type, Rate and Translated Amount, plus the
+        translation reserve line that brings the translated TB back to zero. Lines with a
+        blank or unknown BSPL get Rate Type "unmapped" at the closing rate. Lines without a
+        GL code are kept (some TBs only carry descriptions); only fully blank rows with no
+        balance are dropped
+    """
+    codes = df['GL Code'].fillna('').astype(str).str.strip().str.replace(r"\.0$", "", regex=True)
+    out = pd.DataFrame({
+        'GL Code': codes.where(~codes.str.lower().isin(['nan', 'none', 'null']), ''),
+        'GL Description': df.get('GL Description', pd.Series('', index=df.index)).fillna('').astype(str).str.strip(),
+    })
+    for col in CATEGORY_COLUMNS:
+        out[col] = df[col].fillna('').astype(str).str.strip() if col in df.columns else ''
+    out['Local Amount'] = pd.to_numeric(df[amount_column], errors='coerce').fillna(0.0)
+    out = out[(out['GL Code'] != '') | (out['GL Description'] != '') | (out['Local Amount'] != 0)]
+
+    historical = {m.strip().lower() for m in historical_majors}
+    is_pl = out['BSPL'].str.upper() == 'PL'
+    is_historical = ~is_pl & out['Ind AS Major'].str.lower().isin(historical)
+    out['Rate Type'] = 'closing'
+    out.loc[is_pl, 'Rate Type'] = 'average'
+    out.loc[is_historical, 'Rate Type'] = 'historical'
+    out.loc[~out['BSPL'].str.upper().isin(['BS', 'PL']), 'Rate Type'] = UNMAPPED_RATE_TYPE
+    out['Rate'] = out['Rate Type'].map({**rates, UNMAPPED_RATE_TYPE: rates['closing']}).astype(float)
+    out['Translated Amount'] = out['Local Amount'] * out['Rate']
+
+    # Lines translated at different rates no longer net to zero; the difference is the CTA
+    fctr = -(out['Translated Amount'].sum() - out['Local Amount'].sum() * rates['closing'])
+    reserve = pd.DataFrame([{
+        'GL Code': FCTR_GL_CODE, 'GL Description': FCTR_DESCRIPTION,
+        'BSPL': 'BS', 'Ind AS Major': 'Other equity', 'Ind AS Minor': FCTR_DESCRIPTION,
+        'Local Amount': 0.0, 'Rate Type': 'derived', 'Rate': float('nan'),
+        # Any imbalance already in the local TB is carried at the closing rate, not absorbed
+        'Translated Amount': fctr,
+    }])
+    return pd.concat([out, reserve], ignore_index=True)
+
+
+def unmapped_lines(frame: pd.DataFrame) -> pd.DataFrame:
+    """Translated lines with a balance but no BS/PL mapping"""
+    return frame[(frame['Rate Type'] == UNMAPPED_RATE_TYPE) & (frame['Local Amount'].abs() >= 0.005)]
+
+
+class GroupConsolidationService:
+    """Translate entity final TBs, eliminate intercompany balances and build the group TB"""
+
+    CONFIG_FILENAME = "group_consolidation.json"
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None, fx_service: Optional[FxRateService] = None):
+        """
+        Initialize service
+
+        Args:
+            config: Group settings; loaded from config/group_consolidation.json if None
+            fx_service: FX rate source for rates not fixed in the config
+        """
+        self.config = config if config is not None else self._load_config()
+        self.presentation_currency = str(self.config.get('presentation_currency', 'INR')).upper()
+        self.fx_service = fx_service or FxRateService()
+        self.data_root = Path(settings.DATA_DIR)
+
+    @classmethod
+    def _load_config(cls) -> Dict[str, Any]:
+        """Load group settings (empty settings if the file is missing)"""
+        config_path = Path(settings.CONFIG_DIR) / cls.CONFIG_FILENAME
+        if not config_path.exists():
+            print(f"⚠️  Group consolidation config not found at {config_path}; using defaults")
+            return {}
+        with open(config_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def final_tb_path(self, entity: str) -> Path:
+        """Path of an entity's final trial balance"""
+        return self.data_root / entity / "output" / "adjusted-trialbalance" / "final_trialbalance.xlsx"
+
+    def default_entities(self) -> List[str]:
+        """Configured group entities, or every entity with a final TB"""
+        configured = self.config.get('entities') or []
+        if configured:
+            return [EntityConfig.normalize_entity_code(e) for e in configured]
+        return [e['code'] for e in EntityConfig.get_all_entities() if self.final_tb_path(e['code']).exists()]
+
+    def resolve_rates(self, entity: str, currency: str,
+                      spot_rates: Optional[Dict[str, Any]] = None) -> Tuple[Dict[str, float], str]:
+        """
+        Closing, average and historical rates from the entity's currency to the group currency
+
+        Per-entity overrides (entity_rates) win over per-currency rates (rates); anything
+        left unset uses the FxRateService spot rate.
+
+        Args:
+            entity: Entity code
+            currency: Entity's local currency
+            spot_rates: Spot rates already fetched in this run, by currency (updated in place)
+
+        Returns:
+            (rates by rate type, description of the source)
+        """
+        configured = {
+            **(self.config.get('rates', {}).get(currency) or {}),
+            **{k: v for k, v in (self.config.get('entity_rates', {}).get(entity) or {}).items() if v is not None},
+        }
+        rates = {t: float(configured[t]) for t in RATE_TYPES if configured.get(t) is not None}
+        source = "config"
+        missing = [t for t in RATE_TYPES if t not in rates]
+        if missing:
+            if spot_rates is None:
+                spot_rates = {}
+            if currency not in spot_rates:
+                spot_rates[currency] = self.fx_service.get_rate(currency, self.presentation_currency)
+            spot = spot_rates[currency]
+            if spot is None:
+                raise ValueError(f"No FX rate available for {currency}->{self.presentation_currency}")
+            rates.update({t: spot.rate for t in missing})
+            source = f"{spot.source} spot" if len(missing) == len(RATE_TYPES) else f"config + {spot.source} spot"
+        return rates, source
+
+    def translate_entity(self, entity: str, period: Optional[str], rates: Dict[str, float],
+                         currency: str) -> Dict[str, Any]:
+        """
+        Translate one entity's final TB, reusing the cached translation if nothing changed
+
+        Returns:
+            Dict with entity, currency, period_column, rates, cached flag and translated frame
+        """
+        path = self.final_tb_path(entity)
+        historical = sorted(self.config.get('historical_rate_majors') or [])
+        key = (file_fingerprint(path), period, currency, self.presentation_currency,
+               tuple(sorted(rates.items())), tuple(historical))
+
+        with _translations_lock:
+            entry = _translations.get(entity)
+            if entry is not None and entry[0] == key:
+                _translation_stats['hits'] += 1
+                frame, column = entry[1]
+                return {'entity': entity, 'currency': currency, 'period_column': column,
+                        'rates': rates, 'cached': True, 'frame': frame}
+            _translation_stats['misses'] += 1
+
+        df = read_excel_cached(path)
+        column = _adjusted_column(df, period)
+        if column is None:
+            wanted = f"'{period} Adjusted' column" if period else "adjusted period column"
+            raise ValueError(f"No {wanted} in the final trial balance of {entity}")
+        print(f"  🌐 Translating {entity} ({currency} → {self.presentation_currency}) from '{column}'")
+        frame = translate_trial_balance(df, column, rates, historical)
+        local_imbalance = frame['Local Amount'].sum()
+        if abs(local_imbalance) >= 1:
+            print(f"  ⚠️  {entity}: local TB does not balance ({local_imbalance:,.2f}); carried at closing rate")
+        frame.insert(0, 'Entity', entity)
+
+        with _translations_lock:
+            _translations[entity] = (key, (frame, column))
+        return {'entity': entity, 'currency': currency, 'period_column': column,
+                'rates': rates, 'cached': False, 'frame': frame}
+
+    def eliminate_intercompany(self, detail: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]:
+        """
+        Eliminate intercompany balances listed by GL code (or, for entities whose TB has
+        no GL codes, by description) in the config
+
+        Each matched line gets an elimination equal to minus its translated amount; any
+        residual left by a rule (rate differences, unmatched balances) is posted to the
+        intercompany difference line so the group TB keeps balancing.
+
+        Args:
+            detail: Translated lines of all entities
+
+        Returns:
+            (detail with an Elimination column plus difference lines, per-rule summary)
+        """
+        detail = detail.copy()
+        detail['Elimination'] = 0.0
+        gl_key = normalize_gl_code(detail['GL Code'], keep_slash=True)
+        description_key = detail['GL Description'].fillna('').astype(str).str.strip().str.lower()
+        summaries = []
+        difference_lines = []
+
+        for rule in self.config.get('intercompany') or []:
+            name = rule.get('name', 'Intercompany')
+            matched = pd.Series(False, index=detail.index)
+            for account in rule.get('accounts', []):
+                entity = EntityConfig.normalize_entity_code(account.get('entity', ''))
+                codes = normalize_gl_code(pd.Series(account.get('gl_codes', []), dtype=object), keep_slash=True)
+                descriptions = {str(d).strip().lower() for d in account.get('descriptions', [])}
+                matched |= (detail['Entity'] == entity) & (
+                    (gl_key.isin(set(codes)) & (gl_key != '')) |
+                    (gl_key.eq('') & description_key.isin(descriptions - {''}))
+                )
+
+            eliminated = -detail.loc[matched, 'Translated Amount']
+            detail.loc[matched, 'Elimination'] += eliminated
+            residual = float(eliminated.sum())
+            if abs(residual) > 0.01:
+                difference_lines.append({
+                    'Entity': 'elimination', 'GL Code': IC_DIFFERENCE_GL_CODE,
+                    'GL Description': f"{IC_DIFFERENCE_DESCRIPTION} - {name}",
+                    'BSPL': 'BS', 'Ind AS Major': 'Other equity', 'Ind AS Minor': IC_DIFFERENCE_DESCRIPTION,
+                    'Local Amount': 0.0, 'Rate Type': 'derived', 'Rate': float('nan'),
+                    'Translated Amount': 0.0, 'Elimination': -residual,
+                })
+            summaries.append({
+                'name': name,
+                'lines_eliminated': int(matched.sum()),
+                'gross_eliminated': float(eliminated.abs().sum()),
+                'difference': -residual,
+            })
+            print(f"  ✂️  {name}: {int(matched.sum())} lines eliminated, difference {-residual:,.2f}")
+
+        if difference_lines:
+            detail = pd.concat([detail, pd.DataFrame(difference_lines)], ignore_index=True)
+        detail['Group Amount'] = detail['Translated Amount'] + detail['Elimination']
+        return detail, summaries
+
+    @staticmethod
+    def build_group_tb(detail: pd.DataFrame, entities: List[str]) -> pd.DataFrame:
+        """
+        Roll the detail up to BSPL / Ind AS Major / Ind AS Minor
+
+        Returns:
+            One row per category with a translated column per entity, Eliminations and Group Total
+        """
+        by_entity = (detail[detail['Entity'].isin(entities)]
+                     .pivot_table(index=CATEGORY_COLUMNS, columns='Entity', values='Translated Amount',
+                                  aggfunc='sum', fill_value=0.0)
+                     .reindex(columns=entities, fill_value=0.0))
+        eliminations = detail.groupby(CATEGORY_COLUMNS)['Elimination'].sum().rename('Eliminations')
+        group_tb = by_entity.join(eliminations, how='outer').fillna(0.0)
+        group_tb['Group Total'] = group_tb[entities].sum(axis=1) + group_tb['Eliminations']
+        group_tb.columns.name = None
+        return group_tb.reset_index()
+
+    def consolidate(self, entities: Optional[List[str]] = None, period: Optional[str] = None,
+                    max_workers: int = GROUP_CONSOLIDATION_WORKERS, save: bool = True,
+                    progress: Optional[Callable[..., None]] = None) -> Dict[str, Any]:
+        """
+        Run the group consolidation
+
+        Args:
+            entities: Entity codes (defaults to default_entities())
+            period: Short period label such as "Mar'25"; defaults to the latest adjusted
+                column, which must then be the same period in every entity's TB
+            max_workers: Parallel entity translations
+            save: Write the group TB workbook
+            progress: Optional callback(progress, message, stage) called as each step finishes
+
+        Returns:
+            Dict with success, entities (incl. unmapped lines), group TB rows, eliminations,
+            warnings, totals and output_file
+        """
+        entities = [EntityConfig.normalize_entity_code(e) for e in (entities or self.default_entities())]
+        missing = [e for e in entities if not self.final_tb_path(e).exists()]
+        if missing:
+            return {'success': False, 'error': f"Final trial balance not found for: {', '.join(missing)}"}
+        if not entities:
+            return {'success': False, 'error': "No entities to consolidate"}
+
+        report = progress or (lambda *args: None)
+        print(f"\n🏢 Group consolidation: {len(entities)} entities → {self.presentation_currency}")
+
+        # Resolve rates up front (FxRateService keeps a shared file cache)
+        plans = []
+        spot_rates: Dict[str, Any] = {}
+        for entity in entities:
+            currency = CurrencyService.get_entity_currency(entity).default_currency.upper()
+            rates, rate_source = self.resolve_rates(entity, currency, spot_rates)
+            plans.append((entity, currency, rates, rate_source))
+        report(10, "Exchange rates resolved", "rates")
+
+        workers = max(1, min(max_workers, len(plans)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(self.translate_entity, entity, period, rates, currency)
+                       for entity, currency, rates, _ in plans]
+            for done, future in enumerate(as_completed(futures), start=1):
+                try:
+                    translated = future.result()
+                except ValueError as e:
+                    # TB without the requested period
+                    return {'success': False, 'error': str(e)}
+                report(10 + 60 * done // len(futures),
+                       f"Translated {translated['entity']} ({done}/{len(futures)})", "translation")
+            results = [future.result() for future in futures]
+
+        # Never add up different periods into one group TB
+        columns = {r['entity']: r['period_column'] for r in results}
+        if len(set(columns.values())) > 1:
+            found = ", ".join(f"{entity}: {column}" for entity, column in columns.items())
+            return {'success': False,
+                    'error': f"Entity trial balances are at different periods ({found}); pass period to choose one"}
+
+        detail = pd.concat([r['frame'] for r in results], ignore_index=True)
+        detail, eliminations = self.eliminate_intercompany(detail)
+        report(80, f"Applied {len(eliminations)} intercompany elimination rule(s)", "elimination")
+        group_tb = self.build_group_tb(detail, entities)
+
+        output_file = None
+        if save:
+            output_file = self._save(group_tb, detail)
+            report(95, "Group trial balance saved", "save")
+
+        entity_summaries = []
+        warnings = []
+        for result, (_, _, _, rate_source) in zip(results, plans):
+            frame = result['frame']
+            unmapped = unmapped_lines(frame)
+            if len(unmapped):
+                warnings.append(f"{result['entity']}: {len(unmapped)} lines without a BS/PL mapping "
+                                f"were translated at the closing rate")
+            entity_summaries.append({
+                'entity': result['entity'],
+                'currency': result['currency'],
+                'period_column': result['period_column'],
+                'rates': result['rates'],
+                'rate_source': rate_source,
+                'cached': result['cached'],
+                'translated_total': float(frame['Translated Amount'].sum()),
+                'translation_reserve': float(frame.loc[frame['GL Code'] == FCTR_GL_CODE, 'Translated Amount'].sum()),
+                'unmapped_lines': len(unmapped),
+                'unmapped_local_amount': float(unmapped['Local Amount'].sum()),
+                # Description for lines without a GL code
+                'unmapped_gl_codes': unmapped['GL Code'].where(unmapped['GL Code'] != '', unmapped['GL Description'])
+                                     .head(UNMAPPED_GL_CODES_LISTED).tolist(),
+            })
+
+        print(f"✅ Group TB: {len(group_tb)} lines "
+              f"({sum(not r['cached'] for r in results)} translated, {sum(r['cached'] for r in results)} cached)")
+        for warning in warnings:
+            print(f"  ⚠️  {warning}")
+        return {
+            'success': True,
+            'group_name': self.config.get('group_name', 'Group'),
+            'presentation_currency': self.presentation_currency,
+            'entities': entity_summaries,
+            'eliminations': eliminations,
+            'warnings': warnings,
+            'group_total': float(group_tb['Group Total'].sum()),
+            'rows': len(group_tb),
+            'group_tb': group_tb.to_dict(orient='records'),
+            'output_file': str(output_file) if output_file else None,
+        }
+
+    def _save(self, group_tb: pd.DataFrame, detail: pd.DataFrame) -> Path:
+        """Write the group TB and translated detail to data/group/output"""
+        output_dir = self.data_root / "group" / "output"
+        output_dir.mkdir(parents=True, exist_ok=True)
+        output_file = output_dir / "group_trialbalance.xlsx"
+        with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
+            group_tb.to_excel(writer, sheet_name="Group TB", index=False)
+            detail.to_excel(writer, sheet_name="Translation Detail", index=False)
+        print(f"💾 Saved: {output_file}")
+        return output_file
@@ -0,0 +1,730 @@
+"""
+Job Queue Service
+
+Durable queue for long-running pipeline steps (adjustment processing, note batches,
+statement generation):
+- Jobs, their progress and results live in SQLite (settings.JOB_DB_PATH, WAL mode), so
+  status survives restarts and every uvicorn worker can answer status polls
+- A pool of worker processes (settings.JOB_WORKERS) claims jobs by priority, oldest
+  first, while never running more than settings.JOB_MAX_PER_ENTITY jobs per entity
+- Running jobs send heartbeats; jobs whose worker died or was restarted are re-queued
+  after settings.JOB_STALE_SECONDS (up to settings.JOB_MAX_ATTEMPTS attempts)
+- Status changes, progress, stage events and the job's printed log lines are appended
+  to a per-job event log, which GET /api/jobs/{job_id}/events streams as server-sent events
+
+Usage:
+    from backend.services.job_queue_service import job_queue
+    job = job_queue.enqueue("adjustments", entity, {"period_key": "mar_2025"})
+    job_queue.get(job["id"])
+
+Standalone worker pool (e.g. with JOB_WORKERS=0 on the API):
+    python -m backend.services.job_queue_service [workers]
+"""
+
+import asyncio
+import io
+import json
+import multiprocessing
+import os
+import socket
+import sqlite3
+import sys
+import threading
+import time
+import traceback
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from backend.config.period_config import period_config
+from backend.config.settings import settings
+
+JOB_POLL_SECONDS = 1.0
+JOB_HEARTBEAT_SECONDS = 5.0
+# Printed lines kept per job in the event log (later lines are only printed)
+JOB_LOG_LINES_MAX = 5000
+
+JOB_STATUSES = ("queued", "running", "completed", "failed")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    entity TEXT NOT NULL,
+    priority INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL,
+    progress INTEGER NOT NULL DEFAULT 0,
+    message TEXT NOT NULL DEFAULT '',
+    payload TEXT NOT NULL DEFAULT '{}',
+    state TEXT,
+    result TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    heartbeat_at REAL,
+    created_at TEXT NOT NULL,
+    started_at TEXT,
+    finished_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_queue ON jobs (status, priority DESC, created_at);
+CREATE INDEX IF NOT EXISTS idx_jobs_entity ON jobs (entity, status);
+CREATE TABLE IF NOT EXISTS job_events (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id TEXT NOT NULL,
+    ts REAL NOT NULL,
+    type TEXT NOT NULL,
+    progress INTEGER,
+    message TEXT NOT NULL DEFAULT '',
+    data TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_job_events_job ON job_events (job_id, seq);
+"""
+
+# Event types: status (queued/running/completed/failed), progress, log (printed line),
+# state (kind-specific status snapshot), note (one generated note), stage (pipeline step)
+JOB_EVENT_TYPES = ("status", "progress", "log", "state", "note", "stage")
+
+_JSON_COLUMNS = ("payload", "state", "result")
+
+
+class JobQueue:
+    """SQLite-backed job store shared by the API and the worker processes"""
+
+    def __init__(self, db_path: Path):
+        """
+        Initialize queue
+
+        Args:
+            db_path: SQLite database file (created on first use)
+        """
+        self.db_path = Path(db_path)
+        self._local = threading.local()
+        self._initialized = False
+        self._init_lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Per-thread connection (sqlite3 connections can't be shared across threads)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        with self._init_lock:
+            if not self._initialized:
+                conn.executescript(_SCHEMA)
+                self._initialized = True
+        return conn
+
+    @staticmethod
+    def _to_dict(row: Optional[sqlite3.Row]) -> Optional[Dict[str, Any]]:
+        """Row to dict with JSON columns decoded"""
+        if row is None:
+            return None
+        job = dict(row)
+        for col in _JSON_COLUMNS:
+            job[col] = json.loads(job[col]) if job[col] else None
+        return job
+
+    def enqueue(self, kind: str, entity: str, payload: Optional[Dict[str, Any]] = None,
+                priority: int = 0, job_id: Optional[str] = None,
+                state: Optional[Dict[str, Any]] = None, message: str = "Queued") -> Dict[str, Any]:
+        """
+        Add a job
+
+        Args:
+            kind: Registered job kind (see JOB_HANDLERS)
+            entity: Entity the job works on (per-entity concurrency key)
+            payload: JSON-serializable handler arguments
+            priority: Higher runs first
+            job_id: Optional id (uuid4 by default)
+            state: Initial kind-specific status (e.g. batch status)
+            message: Initial status message
+
+        Returns:
+            The queued job
+        """
+        if kind not in JOB_HANDLERS:
+            raise ValueError(f"Unknown job kind: {kind}")
+        job_id = job_id or str(uuid.uuid4())
+        self._connect().execute(
+            "INSERT INTO jobs (id, kind, entity, priority, status, message, payload, state, created_at) "
+            "VALUES (?, ?, ?, ?, 'queued', ?, ?, ?, ?)",
+            (job_id, kind, entity, int(priority), message, json.dumps(payload or {}),
+             json.dumps(state) if state is not None else None, datetime.now().isoformat()),
+        )
+        self.add_event(job_id, "status", message, progress=0, data={"status": "queued"})
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Job by id, or None"""
+        row = self._connect().execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._to_dict(row)
+
+    def list_jobs(self, entity: Optional[str] = None, status: Optional[str] = None,
+                  kind: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
+        """Most recent jobs, optionally filtered by entity, status and kind"""
+        clauses, params = [], []
+        for column, value in (("entity", entity), ("status", status), ("kind", kind)):
+            if value:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self._connect().execute(
+            f"SELECT * FROM jobs {where} ORDER BY created_at DESC LIMIT ?", (*params, int(limit))
+        ).fetchall()
+        return [self._to_dict(row) for row in rows]
+
+    def claim(self, worker: str, max_per_entity: int) -> Optional[Dict[str, Any]]:
+        """
+        Atomically take the next runnable job
+
+        Highest priority first, then oldest, skipping entities that already have
+        max_per_entity running jobs.
+
+        Returns:
+            The claimed job (now running), or None if nothing is runnable
+        """
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT id FROM jobs AS j WHERE j.status = 'queued' AND "
+                "(SELECT COUNT(*) FROM jobs AS r WHERE r.status = 'running' AND r.entity = j.entity) < ? "
+                "ORDER BY j.priority DESC, j.created_at ASC LIMIT 1",
+                (max_per_entity,),
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = 'running', worker = ?, attempts = attempts + 1, "
+                "started_at = ?, heartbeat_at = ?, message = 'Running' WHERE id = ?",
+                (worker, datetime.now().isoformat(), time.time(), row["id"]),
+            )
+            self._insert_event(conn, row["id"], "status", "Running",
+                               data={"status": "running", "worker": worker})
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return self.get(row["id"])
+
+    def update(self, job_id: str, worker: Optional[str] = None, **fields) -> bool:
+        """
+        Update progress, message, state or result of a job
+
+        Args:
+            job_id: Job id
+            worker: If given, only update while this worker still owns the job
+            **fields: Columns to set (JSON columns are encoded)
+
+        Returns:
+            True if the job was updated
+        """
+        if not fields:
+            return False
+        values = [json.dumps(v, default=str) if k in _JSON_COLUMNS and v is not None else v
+                  for k, v in fields.items()]
+        sql = f"UPDATE jobs SET {', '.join(f'{k} = ?' for k in fields)} WHERE id = ?"
+        params = [*values, job_id]
+        if worker is not None:
+            sql += " AND worker = ?"
+            params.append(worker)
+        return self._connect().execute(sql, params).rowcount > 0
+
+    def heartbeat(self, job_id: str, worker: str) -> None:
+        """Mark a running job as alive"""
+        self.update(job_id, worker=worker, heartbeat_at=time.time())
+
+    def finish(self, job_id: str, worker: str, status: str, message: str,
+               result: Optional[Dict[str, Any]] = None, progress: Optional[int] = None) -> None:
+        """Record the final status of a job run by worker"""
+        fields = {"status": status, "message": message, "result": result,
+                  "finished_at": datetime.now().isoformat()}
+        if progress is not None:
+            fields["progress"] = progress
+        # Status and its event commit together, so streams never see one without the other
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if self.update(job_id, worker=worker, **fields):
+                self._insert_event(conn, job_id, "status", message, progress=progress, data={"status": status})
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def requeue_stale(self, stale_seconds: int, max_attempts: int) -> int:
+        """
+        Re-queue running jobs whose worker stopped sending heartbeats
+
+        Jobs that already used max_attempts are failed instead.
+
+        Returns:
+            Number of jobs re-queued or failed
+        """
+        cutoff = time.time() - stale_seconds
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            stale = conn.execute(
+                "SELECT id, attempts FROM jobs WHERE status = 'running' AND heartbeat_at < ?", (cutoff,)
+            ).fetchall()
+            conn.execute(
+                "UPDATE jobs SET status = 'failed', finished_at = ?, worker = NULL, "
+                "message = 'Abandoned: worker stopped responding after ' || attempts || ' attempt(s)' "
+                "WHERE status = 'running' AND heartbeat_at < ? AND attempts >= ?",
+                (datetime.now().isoformat(), cutoff, max_attempts),
+            )
+            conn.execute(
+                "UPDATE jobs SET status = 'queued', worker = NULL, "
+                "message = 'Re-queued after worker stopped responding' "
+                "WHERE status = 'running' AND heartbeat_at < ?",
+                (cutoff,),
+            )
+            for row in stale:
+                if row["attempts"] >= max_attempts:
+                    self._insert_event(conn, row["id"], "status",
+                                       f"Abandoned: worker stopped responding after {row['attempts']} attempt(s)",
+                                       data={"status": "failed"})
+                else:
+                    self._insert_event(conn, row["id"], "status", "Re-queued after worker stopped responding",
+                                       data={"status": "queued"})
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return len(stale)
+
+    @staticmethod
+    def _insert_event(conn: sqlite3.Connection, job_id: str, event_type: str, message: str = "",
+                      progress: Optional[int] = None, data: Optional[Dict[str, Any]] = None) -> None:
+        """Append an event on an open connection (joins the caller's transaction)"""
+        conn.execute(
+            "INSERT INTO job_events (job_id, ts, type, progress, message, data) VALUES (?, ?, ?, ?, ?, ?)",
+            (job_id, time.time(), event_type, progress, message,
+             json.dumps(data, default=str) if data is not None else None),
+        )
+
+    def add_event(self, job_id: str, event_type: str, message: str = "", progress: Optional[int] = None,
+                  data: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Append an event to a job's event log
+
+        Args:
+            job_id: Job id
+            event_type: One of JOB_EVENT_TYPES
+            message: Human-readable text (log line, status message, ...)
+            progress: Progress percentage at the time of the event
+            data: JSON-serializable details
+        """
+        self._insert_event(self._connect(), job_id, event_type, message, progress, data)
+
+    def events(self, job_id: str, after: int = 0, limit: int = 500) -> List[Dict[str, Any]]:
+        """
+        Events of a job in order
+
+        Args:
+            job_id: Job id
+            after: Only events with a larger seq (the last seq the client has seen)
+            limit: Maximum number of events
+
+        Returns:
+            List of event dicts (seq, job_id, ts, type, progress, message, data)
+        """
+        rows = self._connect().execute(
+            "SELECT * FROM job_events WHERE job_id = ? AND seq > ? ORDER BY seq LIMIT ?",
+            (job_id, int(after), int(limit)),
+        ).fetchall()
+        events = []
+        for row in rows:
+            event = dict(row)
+            event["data"] = json.loads(event["data"]) if event["data"] else None
+            events.append(event)
+        return events
+
+
+class JobReporter:
+    """
+    Progress handle passed to job handlers
+
+    Exposes progress/message attributes, so it can also stand in for the
+    ProcessingStatus objects AIOrchestratorService updates in place. Every change
+    is also appended to the job's event log for streaming clients.
+    """
+
+    def __init__(self, queue: JobQueue, job: Dict[str, Any], worker: str):
+        self._queue = queue
+        self._worker = worker
+        self.job_id = job["id"]
+        self._progress = job.get("progress") or 0
+        self._message = job.get("message") or ""
+        self._state_json: Optional[str] = None
+        self._log_lines = 0
+
+    @property
+    def progress(self) -> int:
+        return self._progress
+
+    @progress.setter
+    def progress(self, value: int) -> None:
+        self.update(progress=value)
+
+    @property
+    def message(self) -> str:
+        return self._message
+
+    @message.setter
+    def message(self, value: str) -> None:
+        self.update(message=value)
+
+    def update(self, progress: Optional[int] = None, message: Optional[str] = None) -> None:
+        """Set progress and/or message in one write (no-op if neither changed)"""
+        fields = {}
+        if progress is not None and int(progress) != self._progress:
+            self._progress = int(progress)
+            fields["progress"] = self._progress
+        if message is not None and message != self._message:
+            self._message = message
+            fields["message"] = message
+        if fields and self._queue.update(self.job_id, worker=self._worker, **fields):
+            self._queue.add_event(self.job_id, "progress", self._message, progress=self._progress)
+
+    def set_state(self, state: Dict[str, Any]) -> None:
+        """Store kind-specific status (read back by the status endpoints); unchanged states are skipped"""
+        state_json = json.dumps(state, default=str, sort_keys=True)
+        if state_json == self._state_json:
+            return
+        self._state_json = state_json
+        if self._queue.update(self.job_id, worker=self._worker, state=state):
+            self._queue.add_event(self.job_id, "state", self._message, progress=self._progress, data=state)
+
+    def event(self, event_type: str, message: str = "", data: Optional[Dict[str, Any]] = None) -> None:
+        """Record a stage or note event for streaming clients"""
+        self._queue.add_event(self.job_id, event_type, message, progress=self._progress, data=data)
+
+    def log(self, line: str) -> None:
+        """Record a printed line (capped at JOB_LOG_LINES_MAX per job)"""
+        if self._log_lines < JOB_LOG_LINES_MAX:
+            self._log_lines += 1
+            self._queue.add_event(self.job_id, "log", line, progress=self._progress)
+
+
+class _JobLogStream(io.TextIOBase):
+    """stdout wrapper that still prints and also records complete lines as job log events"""
+
+    def __init__(self, stream, reporter: JobReporter):
+        self._stream = stream
+        self._reporter = reporter
+        self._buffer = ""
+        self._lock = threading.Lock()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        self._stream.write(text)
+        with self._lock:
+            self._buffer += text
+            *lines, self._buffer = self._buffer.split("\n")
+        for line in lines:
+            if line.strip():
+                try:
+                    self._reporter.log(line.rstrip())
+                except sqlite3.Error:
+                    pass
+        return len(text)
+
+    def flush(self) -> None:
+        self._stream.flush()
+
+
+# ---------------------------------------------------------------------------
+# Job handlers (run inside worker processes)
+# ---------------------------------------------------------------------------
+
+def current_period_payload() -> Dict[str, Optional[str]]:
+    """
+    The period selected in this (API) process, to carry in a job payload
+
+    Returns:
+        Dictionary with period_key and period_column (None when not set)
+    """
+    return {
+        "period_key": period_config.get_current_period(),
+        "period_column": period_config.get_current_period_column(default=None),
+    }
+
+
+def _apply_period(payload: Dict[str, Any]) -> None:
+    """Select the job's period in this worker process (after a reset, so jobs don't inherit each other's)"""
+    period_key, period_column = payload.get("period_key"), payload.get("period_column")
+
+    if period_key in period_config.get_available_periods():
+        period_config.set_period(period_key)
+    if period_column and period_column != period_config.get_current_period_column(default=None):
+        period_config.set_period_column(period_column)
+
+
+def _run_adjustments_job(job: Dict[str, Any], reporter: JobReporter) -> Dict[str, Any]:
+    """AI-powered adjustment processing for one entity"""
+    from backend.services.ai_orchestrator_service import AIOrchestratorService
+
+    entity = job["entity"]
+
+    reporter.update(progress=10, message="Initializing AI orchestrator...")
+    print(f"🚀 Starting adjustment processing for {entity} (ID: {job['id']})")
+    ai_service = AIOrchestratorService(entity)
+
+    reporter.update(progress=15, message="Starting AI-powered adjustment processing...")
+    reporter.event("stage", "Orchestrator started", {"stage": "orchestrator"})
+    result = asyncio.run(ai_service.process_all_adjustments(
+        entity,
+        processing_status={job["id"]: reporter},
+        processing_id=job["id"]
+    ))
+
+    reporter.event("stage", "Orchestrator finished", {"stage": "orchestrator", "success": bool(result.get("success"))})
+    if result.get("success"):
+        result["message"] = "All adjustments processed successfully"
+        print(f"✅ Adjustment processing completed for {entity}")
+    else:
+        result["message"] = f"Failed: {result.get('error', 'Processing failed')}"
+        print(f"❌ Adjustment processing failed for {entity}: {result.get('error', 'Processing failed')}")
+    return result
+
+
+def _run_note_batch_job(job: Dict[str, Any], reporter: JobReporter) -> Dict[str, Any]:
+    """Batch note generation; the BatchGenerationStatus is mirrored into the job state"""
+    from backend.models.generation import BatchGenerationStatus
+    from backend.services.generation_service import GenerationService
+
+    payload = job["payload"]
+    batch_id = job["id"]
+    batch = BatchGenerationStatus(status="pending", total_notes=0, completed_notes=0, results=[])
+    GenerationService.batch_status[batch_id] = batch
+
+    reported = 0
+
+    def sync_state():
+        nonlocal reported
+        for note in batch.results[reported:]:
+            reporter.event(
+                "note",
+                f"{'✅' if note.success else '❌'} Note {note.note_number}: {note.message}",
+                {"note_number": note.note_number, "success": note.success, "output_file": note.output_file},
+            )
+        reported = len(batch.results)
+        reporter.set_state(batch.model_dump(mode="json"))
+        if batch.total_notes:
+            reporter.update(
+                progress=int(batch.completed_notes * 100 / batch.total_notes),
+                message=f"{batch.completed_notes}/{batch.total_notes} notes generated",
+            )
+
+    async def run():
+        async def keep_syncing():
+            while True:
+                sync_state()
+                await asyncio.sleep(JOB_POLL_SECONDS)
+
+        syncer = asyncio.create_task(keep_syncing())
+        try:
+            await GenerationService.batch_generate_notes(
+                payload["company_name"], batch_id, payload.get("category_id"),
+                use_cache=payload.get("use_cache", True),
+            )
+        finally:
+            syncer.cancel()
+
+    try:
+        asyncio.run(run())
+        sync_state()
+    finally:
+        GenerationService.batch_status.pop(batch_id, None)
+
+    return {
+        "success": batch.status == "completed",
+        "message": f"Batch {batch.status}: {batch.completed_notes - batch.failed_notes}/{batch.total_notes} notes generated",
+        "total_notes": batch.total_notes,
+        "failed_notes": batch.failed_notes,
+    }
+
+
+def _run_statements_job(job: Dict[str, Any], reporter: JobReporter) -> Dict[str, Any]:
+    """Generate all financial statements for an entity"""
+    from backend.services.financial_statement_service import FinancialStatementService
+
+    entity = job["entity"]
+    payload = job["payload"]
+    period_ended, as_at_date = payload.get("period_ended"), payload.get("as_at_date")
+    steps = (
+        ("profit-loss", "Profit & Loss", lambda: FinancialStatementService.generate_profit_loss(entity, period_ended)),
+        ("balance-sheet", "Balance Sheet", lambda: FinancialStatementService.generate_balance_sheet(entity, as_at_date)),
+        ("cash-flow", "Cash Flow", lambda: FinancialStatementService.generate_cash_flow(entity, period_ended)),
+    )
+
+    # Same result shape as FinancialStatementService.generate_all_statements, one stage per statement
+    result = {"entity": entity, "statements": {}}
+    for i, (key, label, generate) in enumerate(steps):
+        reporter.update(progress=10 + i * 30, message=f"Generating {label}...")
+        statement = generate()
+        result["statements"][key] = statement
+        reporter.event("stage", f"{label} {'generated' if statement.get('success') else 'failed'}",
+                       {"stage": key, "success": bool(statement.get("success"))})
+
+    result["success"] = all(r.get("success", False) for r in result["statements"].values())
+    result["message"] = "Financial statements generated" if result["success"] else "Statement generation failed"
+    return result
+
+
+def _run_group_consolidation_job(job: Dict[str, Any], reporter: JobReporter) -> Dict[str, Any]:
+    """Group consolidation (FX translation and intercompany eliminations)"""
+    from backend.services.group_consolidation_service import GroupConsolidationService
+
+    payload = job["payload"]
+
+    def on_progress(progress: int, message: str, stage: Optional[str] = None) -> None:
+        reporter.update(progress=progress, message=message)
+        if stage:
+            reporter.event("stage", message, {"stage": stage})
+
+    result = GroupConsolidationService().consolidate(
+        payload.get("entities"), payload.get("period"), progress=on_progress
+    )
+    result.pop("group_tb", None)  # Large; read the saved workbook instead
+    result["message"] = (f"Group TB built: {result['rows']} lines" if result.get("success")
+                         else result.get("error", "Group consolidation failed"))
+    if result.get("warnings"):
+        result["message"] += f" ({len(result['warnings'])} warning(s))"
+    return result
+
+
+JOB_HANDLERS: Dict[str, Callable[[Dict[str, Any], JobReporter], Dict[str, Any]]] = {
+    "adjustments": _run_adjustments_job,
+    "note_batch": _run_note_batch_job,
+    "statements": _run_statements_job,
+    "group_consolidation": _run_group_consolidation_job,
+}
+
+
+# ---------------------------------------------------------------------------
+# Workers
+# ---------------------------------------------------------------------------
+
+def run_job(queue: JobQueue, job: Dict[str, Any], worker: str) -> None:
+    """Run a claimed job with heartbeats and record its outcome"""
+    reporter = JobReporter(queue, job, worker)
+    stop = threading.Event()
+
+    def beat():
+        while not stop.wait(JOB_HEARTBEAT_SECONDS):
+            queue.heartbeat(job["id"], worker)
+
+    heartbeat = threading.Thread(target=beat, name=f"heartbeat-{job['id']}", daemon=True)
+    heartbeat.start()
+    stdout = sys.stdout
+    sys.stdout = _JobLogStream(stdout, reporter)
+    try:
+        period_config.reset()
+        _apply_period(job["payload"])
+        result = JOB_HANDLERS[job["kind"]](job, reporter) or {}
+        success = result.get("success", True)
+        queue.finish(
+            job["id"], worker,
+            status="completed" if success else "failed",
+            message=result.get("message") or ("Completed" if success else "Failed"),
+            result=result,
+            progress=100 if success else None,
+        )
+    except Exception as e:
+        traceback.print_exc()
+        queue.finish(job["id"], worker, status="failed", message=f"Exception: {str(e)}",
+                     result={"success": False, "error": str(e)})
+    finally:
+        sys.stdout = stdout
+        stop.set()
+        heartbeat.join()
+
+
+def worker_loop(db_path: str, worker_name: str, max_per_entity: int, stale_seconds: int,
+                max_attempts: int) -> None:
+    """Claim and run jobs until the process is terminated"""
+    queue = JobQueue(Path(db_path))
+    worker = f"{socket.gethostname()}:{os.getpid()}:{worker_name}"
+    print(f"👷 Job worker {worker} started")
+    while True:
+        try:
+            queue.requeue_stale(stale_seconds, max_attempts)
+            job = queue.claim(worker, max_per_entity)
+        except sqlite3.OperationalError as e:
+            print(f"⚠️  Job queue busy ({e}), retrying")
+            job = None
+        if job is None:
+            time.sleep(JOB_POLL_SECONDS)
+            continue
+        print(f"▶️  {worker} running {job['kind']} job {job['id']} for {job['entity']}")
+        run_job(queue, job, worker)
+
+
+class JobWorkerPool:
+    """Worker processes started with the API (or standalone via __main__)"""
+
+    def __init__(self, workers: int = settings.JOB_WORKERS):
+        self.workers = workers
+        self._processes: List[multiprocessing.Process] = []
+
+    def start(self) -> int:
+        """
+        Start the worker processes (no-op if already running or workers is 0)
+
+        Returns:
+            Number of running worker processes
+        """
+        if self._processes or self.workers <= 0:
+            return len(self._processes)
+        # Spawn so workers don't inherit the API's event loop and open sockets
+        ctx = multiprocessing.get_context("spawn")
+        for i in range(self.workers):
+            process = ctx.Process(
+                target=worker_loop,
+                args=(str(settings.JOB_DB_PATH), f"w{i}", settings.JOB_MAX_PER_ENTITY,
+                      settings.JOB_STALE_SECONDS, settings.JOB_MAX_ATTEMPTS),
+                name=f"job-worker-{i}",
+                daemon=True,
+            )
+            process.start()
+            self._processes.append(process)
+        return len(self._processes)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Terminate the worker processes; their running jobs are re-queued once stale"""
+        for process in self._processes:
+            process.terminate()
+        for process in self._processes:
+            process.join(timeout)
+        self._processes = []
+
+    def alive(self) -> int:
+        """Number of live worker processes"""
+        return sum(process.is_alive() for process in self._processes)
+
+
+# Process-wide instances
+job_queue = JobQueue(settings.JOB_DB_PATH)
+job_workers = JobWorkerPool()
+
+
+if __name__ == "__main__":
+    pool = JobWorkerPool(int(sys.argv[1]) if len(sys.argv) > 1 else max(settings.JOB_WORKERS, 1))
+    print(f"Starting {pool.start()} job worker(s) on {settings.JOB_DB_PATH}")
+    try:
+        while pool.alive():
+            time.sleep(JOB_POLL_SECONDS)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        pool.stop()
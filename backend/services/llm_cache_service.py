@@ -0,0 +1,259 @@
+"""Content-addressed cache for LLM responses."""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+from backend.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class LLMCacheService:
+    """
+    Persistent LLM response cache keyed by a hash of the prompts and provider/model.
+
+    Each response is stored as one JSON file named after its key, so entries can be
+    written by concurrent note generations without a shared index. A hit refreshes
+    the file's mtime, which makes size-based eviction least-recently-used.
+
+    Hit/miss counters are kept in the job database, so the API and the job worker
+    processes report one set of totals. If the database can't be used, counters fall
+    back to this process only.
+    """
+
+    _STATS_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS llm_cache_stats (
+        name TEXT PRIMARY KEY,
+        count INTEGER NOT NULL
+    )
+    """
+
+    _stats: Dict[str, int] = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+    _lock = threading.Lock()
+    _local = threading.local()
+
+    @staticmethod
+    def _cache_dir() -> Path:
+        """
+        Private: Get the cache directory, creating it if needed.
+
+        Returns:
+            Path to the cache directory
+        """
+        cache_dir = Path(settings.LLM_CACHE_DIR)
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        return cache_dir
+
+    @staticmethod
+    def _stats_db() -> sqlite3.Connection:
+        """Private: Per-thread connection to the job database, creating the counters table on first use."""
+        conn = getattr(LLMCacheService._local, "conn", None)
+        if conn is None:
+            db_path = Path(settings.JOB_DB_PATH)
+            db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(LLMCacheService._STATS_SCHEMA)
+            LLMCacheService._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _count(stat: str, amount: int = 1) -> None:
+        """Private: Increment a cache counter shared by all processes."""
+        try:
+            LLMCacheService._stats_db().execute(
+                "INSERT INTO llm_cache_stats (name, count) VALUES (?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET count = count + excluded.count",
+                (stat, amount),
+            )
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"⚠️  Shared LLM cache counters unavailable ({e}); counting this process only")
+            with LLMCacheService._lock:
+                LLMCacheService._stats[stat] += amount
+
+    @staticmethod
+    def make_key(system_prompt: str, user_prompt: str, provider: str, model: str) -> str:
+        """
+        Public: Build the content address for an LLM request.
+
+        Args:
+            system_prompt: System instructions
+            user_prompt: User message
+            provider: LLM provider name
+            model: Model identifier
+
+        Returns:
+            SHA-256 hex digest
+        """
+        digest = hashlib.sha256()
+        for part in (provider.lower(), model, system_prompt, user_prompt):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\x00")
+        return digest.hexdigest()
+
+    @staticmethod
+    def get(key: str) -> Optional[str]:
+        """
+        Public: Look up a cached response.
+
+        Args:
+            key: Cache key from make_key
+
+        Returns:
+            Cached response text or None on a miss or expired entry
+        """
+        cache_file = LLMCacheService._cache_dir() / f"{key}.json"
+        max_age = settings.LLM_CACHE_MAX_AGE_DAYS * 86400
+
+        try:
+            if time.time() - cache_file.stat().st_mtime > max_age:
+                cache_file.unlink(missing_ok=True)
+                LLMCacheService._count("evictions")
+                LLMCacheService._count("misses")
+                return None
+
+            with open(cache_file, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+
+            os.utime(cache_file)  # Mark as recently used
+            LLMCacheService._count("hits")
+            return entry["response"]
+
+        except FileNotFoundError:
+            LLMCacheService._count("misses")
+            return None
+        except Exception as e:
+            logger.warning(f"⚠️  Discarding unreadable LLM cache entry {key[:12]}: {e}")
+            cache_file.unlink(missing_ok=True)
+            LLMCacheService._count("misses")
+            return None
+
+    @staticmethod
+    def put(key: str, response: str, provider: str, model: str) -> None:
+        """
+        Public: Store a response and evict old entries if the cache is over its limits.
+
+        Args:
+            key: Cache key from make_key
+            response: LLM response text
+            provider: LLM provider name
+            model: Model identifier
+        """
+        cache_dir = LLMCacheService._cache_dir()
+        cache_file = cache_dir / f"{key}.json"
+        temp_file = cache_dir / f"{key}.{threading.get_ident()}.tmp"
+
+        entry = {
+            "provider": provider,
+            "model": model,
+            "created_at": datetime.now().isoformat(),
+            "response": response,
+        }
+
+        try:
+            with open(temp_file, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(temp_file, cache_file)
+            LLMCacheService._count("writes")
+        except Exception as e:
+            logger.warning(f"⚠️  Failed to write LLM cache entry: {e}")
+            temp_file.unlink(missing_ok=True)
+            return
+
+        LLMCacheService.evict()
+
+    @staticmethod
+    def evict() -> int:
+        """
+        Public: Remove expired entries, then least-recently-used ones over the size limit.
+
+        Returns:
+            Number of entries removed
+        """
+        now = time.time()
+        max_age = settings.LLM_CACHE_MAX_AGE_DAYS * 86400
+        max_bytes = settings.LLM_CACHE_MAX_MB * 1024 * 1024
+
+        entries = []
+        removed = 0
+        for cache_file in LLMCacheService._cache_dir().glob("*.json"):
+            try:
+                stat = cache_file.stat()
+            except FileNotFoundError:
+                continue
+
+            if now - stat.st_mtime > max_age:
+                cache_file.unlink(missing_ok=True)
+                removed += 1
+            else:
+                entries.append((stat.st_mtime, stat.st_size, cache_file))
+
+        total_bytes = sum(size for _, size, _ in entries)
+        for _, size, cache_file in sorted(entries):
+            if total_bytes <= max_bytes:
+                break
+            cache_file.unlink(missing_ok=True)
+            total_bytes -= size
+            removed += 1
+
+        if removed:
+            LLMCacheService._count("evictions", removed)
+        return removed
+
+    @staticmethod
+    def clear() -> int:
+        """
+        Public: Delete every cached response.
+
+        Returns:
+            Number of entries removed
+        """
+        removed = 0
+        for cache_file in LLMCacheService._cache_dir().glob("*.json"):
+            cache_file.unlink(missing_ok=True)
+            removed += 1
+        return removed
+
+    @staticmethod
+    def get_stats() -> dict:
+        """
+        Public: Get hit/miss counters and current cache size.
+
+        Counters are totals across the API and job worker processes; any counted by
+        this process while the job database was unavailable are added on top.
+
+        Returns:
+            Dictionary of cache statistics
+        """
+        files = list(LLMCacheService._cache_dir().glob("*.json"))
+        with LLMCacheService._lock:
+            stats = dict(LLMCacheService._stats)
+
+        try:
+            rows = LLMCacheService._stats_db().execute("SELECT name, count FROM llm_cache_stats").fetchall()
+            shared = True
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"⚠️  Shared LLM cache counters unavailable ({e}); reporting this process only")
+            rows, shared = [], False
+        for name, count in rows:
+            stats[name] = stats.get(name, 0) + count
+
+        lookups = stats["hits"] + stats["misses"]
+        stats.update({
+            "scope": "all_processes" if shared else "this_process",
+            "enabled": settings.LLM_CACHE_ENABLED,
+            "hit_rate": round(stats["hits"] / lookups, 3) if lookups else 0.0,
+            "entries": len(files),
+            "size_mb": round(sum(f.stat().st_size for f in files if f.exists()) / (1024 * 1024), 2),
+            "max_size_mb": settings.LLM_CACHE_MAX_MB,
+            "max_age_days": settings.LLM_CACHE_MAX_AGE_DAYS,
+        })
+        return stats
@@ -9,19 +9,209 @@ Supports:
 - Google Gemini (2.5 Pro)
 """
 
-from typing import Optional
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
 
 from backend.config.settings import settings
 
 
+# HTTP statuses and exception names that indicate a retryable provider error
+TRANSIENT_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504, 529}
+TRANSIENT_ERROR_NAMES = (
+    "RateLimit", "Timeout", "Connection", "Overloaded", "ServiceUnavailable",
+    "InternalServer", "ResourceExhausted", "DeadlineExceeded",
+)
+
+
+class TransientLLMError(Exception):
+    """Raised by a provider call when the request is worth retrying."""
+
+
+class TokenBucket:
+    """Thread-safe token bucket limiting request starts per minute."""
+
+    def __init__(self, requests_per_minute: int, burst: Optional[int] = None):
+        """
+        Initialize the bucket.
+
+        Args:
+            requests_per_minute: Sustained request rate
+            burst: Maximum tokens held at once, defaults to a fifth of a minute's budget
+        """
+        self.rate = max(requests_per_minute, 1) / 60.0
+        self.capacity = burst or max(1, requests_per_minute // 5)
+        self.tokens = float(self.capacity)
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """
+        Block until a token is available.
+
+        Returns:
+            Seconds spent waiting
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                delay = (1 - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class SharedTokenBucket(TokenBucket):
+    """
+    Token bucket kept in SQLite, so every process using the same database (the API and
+    the job workers) draws from one budget instead of one bucket each.
+
+    Falls back to the in-process bucket if the database can't be used.
+    """
+
+    _SCHEMA = """
+    CREATE TABLE IF NOT EXISTS llm_rate_limits (
+        name TEXT PRIMARY KEY,
+        tokens REAL NOT NULL,
+        updated_at REAL NOT NULL
+    )
+    """
+
+    def __init__(self, name: str, db_path: Path, requests_per_minute: int, burst: Optional[int] = None):
+        """
+        Initialize the bucket.
+
+        Args:
+            name: Bucket name (one row per name)
+            db_path: SQLite database shared by the processes
+            requests_per_minute: Sustained request rate across all processes
+            burst: Maximum tokens held at once, defaults to a fifth of a minute's budget
+        """
+        super().__init__(requests_per_minute, burst)
+        self.name = name
+        self.db_path = Path(db_path)
+        self._local = threading.local()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Per-thread connection, creating the table on first use"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(self._SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def _take(self) -> float:
+        """
+        Refill from wall-clock time and take a token in one write transaction.
+
+        Returns:
+            0 if a token was taken, else seconds until one is available
+        """
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT tokens, updated_at FROM llm_rate_limits WHERE name = ?", (self.name,)
+            ).fetchone()
+            now = time.time()
+            tokens = self.capacity if row is None else \
+                min(self.capacity, row[0] + max(now - row[1], 0.0) * self.rate)
+            delay = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                delay = (1 - tokens) / self.rate
+            conn.execute(
+                "INSERT INTO llm_rate_limits (name, tokens, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET tokens = excluded.tokens, updated_at = excluded.updated_at",
+                (self.name, tokens, now),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return delay
+
+    def acquire(self) -> float:
+        """
+        Block until a token is available in the shared bucket.
+
+        Returns:
+            Seconds spent waiting
+        """
+        waited = 0.0
+        while True:
+            try:
+                delay = self._take()
+            except sqlite3.Error as e:
+                print(f"⚠️  Shared LLM rate limit unavailable ({e}); limiting this process only")
+                return waited + super().acquire()
+            if delay <= 0:
+                return waited
+            time.sleep(delay)
+            waited += delay
+
+
 class LLMService:
     """Service for generating content using different LLM providers."""
 
+    # One bucket per provider, shared by every thread and (through the job database) by
+    # the API and job worker processes
+    _rate_limiters: Dict[str, TokenBucket] = {}
+    _rate_limiters_lock = threading.Lock()
+
+    @staticmethod
+    def _get_rate_limiter(provider: str) -> TokenBucket:
+        """
+        Private: Get the shared token bucket for a provider.
+
+        Args:
+            provider: Provider name
+
+        Returns:
+            TokenBucket instance
+        """
+        with LLMService._rate_limiters_lock:
+            if provider not in LLMService._rate_limiters:
+                LLMService._rate_limiters[provider] = SharedTokenBucket(
+                    provider, settings.JOB_DB_PATH, settings.LLM_REQUESTS_PER_MINUTE
+                )
+            return LLMService._rate_limiters[provider]
+
+    @staticmethod
+    def _is_transient_error(error: Exception) -> bool:
+        """
+        Private: Decide whether a provider exception is worth retrying.
+
+        Args:
+            error: Exception raised by the provider SDK
+
+        Returns:
+            True for rate limits, timeouts, connection and 5xx errors
+        """
+        status_code = getattr(error, "status_code", None) or getattr(error, "code", None)
+        if isinstance(status_code, int) and status_code in TRANSIENT_STATUS_CODES:
+            return True
+        return any(name in type(error).__name__ for name in TRANSIENT_ERROR_NAMES)
+
     @staticmethod
     def generate_content(system_prompt: str, user_prompt: str) -> Optional[str]:
         """
         Generate content using the configured LLM provider.
 
+        Requests are throttled by the provider's token bucket and transient
+        errors are retried with exponential backoff.
+
         Args:
             system_prompt: System instructions/prompt
             user_prompt: User message/prompt
@@ -34,13 +224,34 @@ class LLMService:
         print(f"🤖 Using LLM Provider: {provider.upper()}")
 
         if provider == "anthropic":
-            return LLMService._generate_with_anthropic(system_prompt, user_prompt)
+            generate = LLMService._generate_with_anthropic
         elif provider == "gemini":
-            return LLMService._generate_with_gemini(system_prompt, user_prompt)
+            generate = LLMService._generate_with_gemini
         else:
             print(f"❌ Unknown LLM provider: {provider}")
             return None
 
+        rate_limiter = LLMService._get_rate_limiter(provider)
+        max_retries = max(settings.LLM_MAX_RETRIES, 0)
+
+        for attempt in range(max_retries + 1):
+            waited = rate_limiter.acquire()
+            if waited >= 1:
+                print(f"   ⏳ Rate limited, waited {waited:.1f}s for a {provider} slot")
+
+            try:
+                return generate(system_prompt, user_prompt)
+            except TransientLLMError as e:
+                if attempt == max_retries:
+                    print(f"❌ Giving up after {max_retries + 1} attempts: {e}")
+                    return None
+                backoff = 2 ** (attempt + 1)
+                print(f"   🔁 Transient error, retrying in {backoff}s "
+                      f"(attempt {attempt + 1}/{max_retries}): {e}")
+                time.sleep(backoff)
+
+        return None
+
     @staticmethod
     def _generate_with_anthropic(system_prompt: str, user_prompt: str) -> Optional[str]:
         """
@@ -52,6 +263,9 @@ class LLMService:
 
         Returns:
             Generated content or None
+
+        Raises:
+            TransientLLMError: On rate limit, timeout or server errors
         """
         try:
             from anthropic import Anthropic
@@ -91,6 +305,8 @@ class LLMService:
                 return None
 
         except Exception as e:
+            if LLMService._is_transient_error(e):
+                raise TransientLLMError(str(e)) from e
             print(f"❌ Error generating with Anthropic: {e}")
             import traceback
             traceback.print_exc()
@@ -107,6 +323,9 @@ class LLMService:
 
         Returns:
             Generated content or None
+
+        Raises:
+            TransientLLMError: On rate limit, timeout or server errors
         """
         try:
             import google.generativeai as genai
@@ -141,6 +360,8 @@ class LLMService:
                 return None
 
         except Exception as e:
+            if LLMService._is_transient_error(e):
+                raise TransientLLMError(str(e)) from e
             print(f"❌ Error generating with Gemini: {e}")
             import traceback
             traceback.print_exc()
@@ -2,8 +2,11 @@
 INTEGRIS AI ADJUSTMENT ORCHESTRATOR - ALL ADJUSTMENTS PROCESSOR
 ================================================================
 
-This script processes all 6 adjustment prompts sequentially using Claude AI.
+This script processes all 6 adjustment prompts using Claude AI.
 Each prompt is sent to Claude which generates and executes the appropriate code.
+Independent adjustments run concurrently, and code that ran successfully is
+cached by prompt hash + input schema fingerprint so unchanged re-runs skip the
+LLM round trip.
 
 Usage:
     python ai_orchestrator.py [entity]
@@ -11,6 +14,12 @@ Usage:
     entity: Entity code (default: cpm)
             Examples: cpm, hausen, integris
 
+Environment:
+    RUN_AI_ADJUSTMENTS=true         Run the per-adjustment AI processing
+                                    (skipped by default)
+    AI_ADJUSTMENT_CONCURRENCY=3     Max adjustments processed at once
+    AI_CODE_CACHE=false             Bypass the generated-code cache
+
 Each adjustment:
     - Loads configuration from data/{entity}/input/config/adjustment_config.json
     - Loads prompt from backend.config.trialbalance_preparation_prompts
@@ -22,9 +31,12 @@ Each adjustment:
 """
 
 import os
+import re
 import sys
 import json
+import hashlib
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import time
 import traceback
@@ -66,6 +78,7 @@ SOURCE_FILES_DIR = DATA_DIR / "input" / "unadjusted-trialbalance"
 MANUAL_ADJUSTMENTS_DIR = DATA_DIR / "input" / "manual-adjustments"
 OUTPUT_FILES_DIR = DATA_DIR / "output" / "adjusted-trialbalance"
 DEBUG_DIR = Path(__file__).parent.parent.parent / "debug"
+AI_CODE_CACHE_DIR = DATA_DIR / "output" / ".ai_code_cache"
 
 # Ensure output directory exists
 OUTPUT_FILES_DIR.mkdir(parents=True, exist_ok=True)
@@ -244,6 +257,88 @@ def analyze_data_files(file_list):
     return context
 
 
+def file_schema_fingerprint(file_list):
+    """Describe the layout of each input file without its data values
+    
+    Mirrors the header handling in analyze_data_files, so generated code that
+    worked for one set of files is only reused for files with the same
+    columns. Values can change freely between runs.
+    """
+    fingerprint = []
+    
+    for file_name in file_list:
+        if ("Trial Balance" in file_name or 
+            file_name.startswith("TB_") or 
+            file_name.startswith("trial_balance") or 
+            "unadjusted_trialbalance" in file_name):
+            file_path = SOURCE_FILES_DIR / file_name
+        else:
+            file_path = MANUAL_ADJUSTMENTS_DIR / file_name
+        
+        if not file_path.exists():
+            fingerprint.append([file_name, None])
+            continue
+        
+        try:
+            if str(file_path).endswith('.xlsx'):
+                header_row = 2 if "Adjustment Entries" in file_name else 0
+                columns = pd.read_excel(file_path, header=header_row, nrows=0).columns
+                fingerprint.append([file_name, [str(c) for c in columns]])
+            else:
+                fingerprint.append([file_name, 'non-excel'])
+        except Exception as e:
+            fingerprint.append([file_name, f"unreadable: {type(e).__name__}"])
+    
+    return fingerprint
+
+
+def get_code_cache_key(prompt_content, data_files, output_file):
+    """Hash of everything the generated code depends on"""
+    model = os.getenv('ANTHROPIC_MODEL', 'claude-haiku-4-5-20251001')
+    payload = json.dumps({
+        'prompt': prompt_content,
+        'model': model,
+        'schema': file_schema_fingerprint(data_files),
+        'source_dir': str(SOURCE_FILES_DIR),
+        'adjustments_dir': str(MANUAL_ADJUSTMENTS_DIR),
+        'output_file': str(output_file),
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def code_cache_enabled():
+    """Whether the generated-code cache is in use (AI_CODE_CACHE=false bypasses it)"""
+    return os.getenv('AI_CODE_CACHE', 'true').lower() != 'false'
+
+
+def load_cached_code(cache_key):
+    """Return known-good code for a cache key, or None"""
+    cache_file = AI_CODE_CACHE_DIR / f"{cache_key}.py"
+    if not code_cache_enabled() or not cache_file.exists():
+        return None
+    try:
+        return cache_file.read_text(encoding='utf-8')
+    except Exception:
+        return None
+
+
+def save_cached_code(cache_key, code):
+    """Store code that executed successfully and produced its output file"""
+    if not code_cache_enabled():
+        return
+    AI_CODE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp_file = AI_CODE_CACHE_DIR / f"{cache_key}.py.tmp"
+    tmp_file.write_text(code, encoding='utf-8')
+    os.replace(tmp_file, AI_CODE_CACHE_DIR / f"{cache_key}.py")
+
+
+def invalidate_cached_code(cache_key):
+    """Drop a cached entry that no longer works"""
+    cache_file = AI_CODE_CACHE_DIR / f"{cache_key}.py"
+    if cache_file.exists():
+        cache_file.unlink()
+
+
 def extract_python_code(response_text):
     """Extract Python code from Claude's markdown response"""
     text = response_text.strip()
@@ -376,6 +471,11 @@ Return ONLY the Python code, no markdown, no explanations."""
         traceback.print_exc()
         return None, error_msg
 
+def _debug_suffix(adjustment_name):
+    """Filesystem-safe suffix so concurrent adjustments don't share debug files"""
+    return re.sub(r'[^a-z0-9]+', '_', str(adjustment_name).lower()).strip('_')[:40]
+
+
 def execute_generated_code(code_response, adjustment_name):
     """Execute Claude-generated code with detailed logging"""
     
@@ -406,7 +506,7 @@ def execute_generated_code(code_response, adjustment_name):
         print(f"   Error: {se.msg}")
         
         # Save for debugging
-        debug_file = DEBUG_DIR / "debug_syntax_error.py"
+        debug_file = DEBUG_DIR / f"debug_syntax_error_{_debug_suffix(adjustment_name)}.py"
         with open(debug_file, 'w') as f:
             f.write("# SYNTAX ERROR DETECTED\n")
             f.write(f"# Error: {se.msg} at line {se.lineno}\n\n")
@@ -444,7 +544,7 @@ def execute_generated_code(code_response, adjustment_name):
         traceback.print_exc()
         
         # Save for debugging
-        debug_file = DEBUG_DIR / "debug_runtime_error.py"
+        debug_file = DEBUG_DIR / f"debug_runtime_error_{_debug_suffix(adjustment_name)}.py"
         with open(debug_file, 'w') as f:
             f.write(f"# RUNTIME ERROR\n")
             f.write(f"# Error: {type(e).__name__}: {str(e)}\n\n")
@@ -645,6 +745,24 @@ def process_single_adjustment(client, adjustment_config):
         return False, error
     print(f" Prompt loaded successfully ({len(prompt_content)} characters)")
     
+    # Reuse known-good code when the prompt and input schemas are unchanged
+    cache_key = get_code_cache_key(prompt_content, data_files, output_file)
+    cached_code = load_cached_code(cache_key)
+    if cached_code:
+        print(f"\n Reusing cached code for unchanged inputs (key {cache_key[:12]}) - skipping Claude call")
+        if os.path.exists(output_file):
+            os.remove(output_file)
+        success, error = execute_generated_code(cached_code, adjustment_name)
+        if success and os.path.exists(output_file):
+            print(f"\n SUCCESS: Output file created from cached code")
+            print(f"\n  Completed at: {datetime.now().strftime('%H:%M:%S')}")
+            return True, None
+        print(f" Cached code no longer works ({error or 'no output file'}) - regenerating")
+        invalidate_cached_code(cache_key)
+    
+    if client is None:
+        return False, "ANTHROPIC_API_KEY not configured and no cached code available"
+    
     # Analyze data files
     print(f"\n Step 2/4: Analyzing input data files...")
     data_context = analyze_data_files(data_files)
@@ -661,8 +779,13 @@ def process_single_adjustment(client, adjustment_config):
     
     # Execute generated code
     print(f"\n Step 4/4: Executing generated code...")
+    previous_mtime = os.stat(output_file).st_mtime_ns if os.path.exists(output_file) else None
     success, error = execute_generated_code(code_response, adjustment_name)
     
+    # Only cache code that wrote the output in this run (not a file left by an earlier one)
+    if success and os.path.exists(output_file) and os.stat(output_file).st_mtime_ns != previous_mtime:
+        save_cached_code(cache_key, extract_python_code(code_response))
+    
     # Check output file
     if os.path.exists(output_file):
         file_size = os.path.getsize(output_file)
@@ -704,6 +827,46 @@ def process_single_adjustment(client, adjustment_config):
     return success, error
 
 
+def run_ai_adjustments(adjustments, max_workers=None):
+    """Process independent adjustments concurrently
+    
+    Each adjustment reads the shared source files and writes only its own
+    output file, so they can run side by side. The Claude calls dominate
+    the runtime, which makes a thread pool sufficient.
+    
+    Args:
+        adjustments: List of adjustment configs (see load_adjustment_config)
+        max_workers: Concurrency limit, defaults to AI_ADJUSTMENT_CONCURRENCY or 3
+    
+    Returns:
+        List of result dicts in the same order as adjustments
+    """
+    if max_workers is None:
+        max_workers = int(os.getenv('AI_ADJUSTMENT_CONCURRENCY', '3'))
+    
+    # The client is only needed on cache misses
+    client = get_anthropic_client() if os.getenv('ANTHROPIC_API_KEY') else None
+    
+    def _run(adjustment):
+        started = time.time()
+        try:
+            success, error = process_single_adjustment(client, adjustment)
+        except Exception as e:
+            traceback.print_exc()
+            success, error = False, f"{type(e).__name__}: {str(e)}"
+        return {
+            'id': adjustment['id'],
+            'name': adjustment['name'],
+            'status': 'SUCCESS' if success else 'FAILED',
+            'error': error,
+            'execution_time': round(time.time() - started, 2),
+            'output_file': adjustment['output_file']
+        }
+    
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        return list(executor.map(_run, adjustments))
+
+
 def main():
     """Main function to process all adjustments"""
     
@@ -768,25 +931,33 @@ def main():
     print(f"Manual Adjustments Dir: {MANUAL_ADJUSTMENTS_DIR}")
     print(f"Output Files Dir: {OUTPUT_FILES_DIR}")
     print()
-    print("NOTE: Individual reconciliation files are no longer generated.")
-    print("      Generating final adjusted trial balance directly from manual adjustments...")
-    print("=" * 80)
     
-    # Skip individual AI adjustments and reconciliation files
-    # Go directly to consolidated trial balance generation
+    run_ai = os.getenv('RUN_AI_ADJUSTMENTS', 'false').lower() == 'true'
     
-    # Track as "success" for all adjustments (no individual processing)
-    results = []
-    for adjustment in ADJUSTMENTS:
-        result = {
-            'id': adjustment['id'],
-            'name': adjustment['name'],
-            'status': 'SKIPPED',
-            'error': None,
-            'execution_time': 0,
-            'output_file': adjustment['output_file']
-        }
-        results.append(result)
+    if run_ai:
+        print("Running AI adjustment processing concurrently...")
+        print("=" * 80)
+        results = run_ai_adjustments(ADJUSTMENTS)
+    else:
+        print("NOTE: Individual reconciliation files are no longer generated.")
+        print("      Generating final adjusted trial balance directly from manual adjustments...")
+        print("=" * 80)
+        
+        # Skip individual AI adjustments and reconciliation files
+        # Go directly to consolidated trial balance generation
+        
+        # Track as "success" for all adjustments (no individual processing)
+        results = []
+        for adjustment in ADJUSTMENTS:
+            result = {
+                'id': adjustment['id'],
+                'name': adjustment['name'],
+                'status': 'SKIPPED',
+                'error': None,
+                'execution_time': 0,
+                'output_file': adjustment['output_file']
+            }
+            results.append(result)
     
     # Final summary
     end_time = datetime.now()
@@ -796,7 +967,11 @@ def main():
     print("PROCESSING SUMMARY")
     print("=" * 80)
     print(f"Total adjustments: {len(ADJUSTMENTS)}")
-    print(f"Individual reconciliation files: SKIPPED (not needed)")
+    if run_ai:
+        succeeded = sum(1 for r in results if r['status'] == 'SUCCESS')
+        print(f"Individual reconciliation files: {succeeded}/{len(results)} generated")
+    else:
+        print(f"Individual reconciliation files: SKIPPED (not needed)")
     print(f"Processing time: {total_execution_time:.2f} seconds")
     print()
     
@@ -804,7 +979,10 @@ def main():
     print("ADJUSTMENTS TO BE APPLIED:")
     print("-" * 80)
     for result in results:
-        print(f"   #{result['id']}: {result['name']}")
+        status = f" [{result['status']}]" if run_ai else ""
+        print(f"   #{result['id']}: {result['name']}{status}")
+        if result['error']:
+            print(f"      Error: {result['error']}")
     
     print("=" * 80)
     
@@ -822,7 +1000,7 @@ def main():
     print(f"\nResults saved to: {results_file}")
     
     # Generate the adjusted trial balance directly from manual adjustment files
-    all_success = True
+    all_success = all(r['status'] != 'FAILED' for r in results)
     
     print("\n" + "=" * 80)
     print("GENERATING ADJUSTED TRIAL BALANCE")
@@ -831,12 +1009,9 @@ def main():
     print()
     
     try:
-        # Set entity environment variable for the consolidation script
-        os.environ['ENTITY'] = ENTITY
-        
-        # Import from backend.utils directory
+        # Consolidate in-process for this entity (period already applied above)
         from backend.utils import generate_consolidate_tb
-        tb_success = generate_consolidate_tb.main()
+        tb_success = generate_consolidate_tb.consolidate(ENTITY)["success"]
         
         if tb_success:
             print("\n Adjusted Trial Balance created successfully!")
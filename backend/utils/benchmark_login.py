@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Login Throughput Benchmark
+==========================
+Simulate a burst of concurrent sign-ins against AuthService and compare
+password verification on the event loop (authenticate_user called from the
+async handler, as the login route used to) with verification on the password
+pool (authenticate_user_async)
+
+For each burst size it records login throughput, p50/p95/p99 latency of a
+sign-in from the start of the burst, and the longest event-loop stall seen by
+a 10 ms heartbeat task (how long any other request would have waited)
+
+Usage:
+    python backend/utils/benchmark_login.py [concurrent sign-ins ...]   # default 1 10 25 50
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.services.auth_service import PASSWORD_HASH_WORKERS, AuthService, UserStore
+
+BENCHMARK_PASSWORD = "benchmark-password"
+HEARTBEAT_SECONDS = 0.01
+
+
+def seed_users(users_file: Path, count: int) -> None:
+    """Write a users file with `count` users sharing one real bcrypt hash"""
+    hashed = AuthService._get_password_hash(BENCHMARK_PASSWORD)
+    users = {
+        f"user{i}": {
+            "id": f"user_{i}",
+            "username": f"user{i}",
+            "email": f"user{i}@example.com",
+            "full_name": f"User {i}",
+            "hashed_password": hashed,
+            "is_active": True,
+            "is_admin": False,
+            "created_at": datetime.now().isoformat(),
+        }
+        for i in range(count)
+    }
+    AuthService._user_store = UserStore(users_file)
+    AuthService._save_users(users)
+
+
+async def _heartbeat(stop: asyncio.Event, stalls: list) -> None:
+    """Record how late each 10 ms tick fires"""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(HEARTBEAT_SECONDS)
+        stalls.append(time.perf_counter() - start - HEARTBEAT_SECONDS)
+
+
+async def run_burst(concurrency: int, offloaded: bool) -> dict:
+    """
+    Sign in `concurrency` users at once
+
+    Returns:
+        Dict with throughput (logins/s), latency percentiles (ms) and max loop stall (ms)
+    """
+    latencies = []
+
+    async def sign_in(username: str, burst_start: float) -> None:
+        if offloaded:
+            user = await AuthService.authenticate_user_async(username, BENCHMARK_PASSWORD)
+        else:
+            user = AuthService.authenticate_user(username, BENCHMARK_PASSWORD)
+        assert user is not None, username
+        latencies.append(time.perf_counter() - burst_start)
+
+    stop = asyncio.Event()
+    stalls = []
+    heartbeat = asyncio.create_task(_heartbeat(stop, stalls))
+    await asyncio.sleep(HEARTBEAT_SECONDS)
+
+    burst_start = time.perf_counter()
+    await asyncio.gather(*(sign_in(f"user{i}", burst_start) for i in range(concurrency)))
+    elapsed = time.perf_counter() - burst_start
+
+    stop.set()
+    await heartbeat
+
+    p50, p95, p99 = np.percentile(np.array(latencies) * 1000, [50, 95, 99])
+    return {
+        "throughput": concurrency / elapsed,
+        "p50": p50,
+        "p95": p95,
+        "p99": p99,
+        "max_stall": max(stalls, default=0.0) * 1000,
+    }
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1, 10, 25, 50]
+
+    print("=" * 78)
+    print("LOGIN BENCHMARK - bcrypt on the event loop vs password pool")
+    print(f"(bcrypt rounds 12, PASSWORD_HASH_WORKERS={PASSWORD_HASH_WORKERS}, {os.cpu_count()} CPUs)")
+    print("=" * 78)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        seed_users(Path(tmp_dir) / "users.json", max(sizes))
+
+        print(f"\n  {'Sign-ins':>8}  {'Mode':<10}  {'Logins/s':>9}  {'p50 ms':>8}  "
+              f"{'p95 ms':>8}  {'p99 ms':>8}  {'Loop stall':>10}")
+        print("  " + "-" * 72)
+
+        for concurrency in sizes:
+            for mode, offloaded in (("inline", False), ("offloaded", True)):
+                result = asyncio.run(run_burst(concurrency, offloaded))
+                print(f"  {concurrency:>8}  {mode:<10}  {result['throughput']:>9.1f}  "
+                      f"{result['p50']:>8.0f}  {result['p95']:>8.0f}  {result['p99']:>8.0f}  "
+                      f"{result['max_stall']:>8.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
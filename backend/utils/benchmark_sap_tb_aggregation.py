@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+SAP Trial Balance Aggregation Benchmark
+=======================================
+Compare the legacy iterrows-based JournalEntryLines flattening against the
+columnar path in DataExtractor._aggregate_journal_lines and the page-streamed
+fold in DataExtractor._aggregate_journal_pages on a synthetic ledger
+
+Usage:
+    python backend/utils/benchmark_sap_tb_aggregation.py [total_lines]
+"""
+
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import pandas as pd
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.sap_connect.data_extractor import DataExtractor
+
+
+def build_synthetic_ledger(total_lines: int, lines_per_entry: int = 5,
+                           num_accounts: int = 800) -> pd.DataFrame:
+    """Build a JournalEntries DataFrame shaped like the Service Layer response"""
+    rng = random.Random(42)
+    accounts = [f"{rng.choice('123456')}{i:07d}" for i in range(num_accounts)]
+
+    entries = []
+    for jdt_num in range(total_lines // lines_per_entry):
+        lines = []
+        for line_id in range(lines_per_entry):
+            amount = round(rng.uniform(1, 100000), 2)
+            is_debit = line_id % 2 == 0
+            lines.append({
+                'Line_ID': line_id,
+                'AccountCode': rng.choice(accounts),
+                'Debit': amount if is_debit else 0.0,
+                'Credit': 0.0 if is_debit else amount,
+                'ShortName': 'Synthetic',
+                'LineMemo': 'Benchmark line',
+            })
+        entries.append({
+            'JdtNum': jdt_num,
+            'ReferenceDate': '2024-04-01',
+            'JournalEntryLines': lines,
+        })
+
+    return pd.DataFrame(entries)
+
+
+def legacy_aggregate(je_df: pd.DataFrame) -> pd.DataFrame:
+    """Previous implementation: dict per line via iterrows"""
+    all_lines = []
+    for _, je in je_df.iterrows():
+        for line in je.get('JournalEntryLines', []):
+            all_lines.append({
+                'AccountCode': line.get('AccountCode'),
+                'Debit': line.get('Debit', 0),
+                'Credit': line.get('Credit', 0)
+            })
+
+    lines_df = pd.DataFrame(all_lines)
+    return lines_df.groupby('AccountCode').agg({
+        'Debit': 'sum',
+        'Credit': 'sum'
+    }).reset_index()
+
+
+def split_pages(je_df: pd.DataFrame, page_size: int = 1000) -> list:
+    """Split the ledger into OData-sized pages of records"""
+    records = je_df.to_dict('records')
+    return [records[start:start + page_size] for start in range(0, len(records), page_size)]
+
+
+def measure(func, *args):
+    """Run func and return (result, seconds, peak MB)"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak / (1024 * 1024)
+
+
+def main():
+    total_lines = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+    print("=" * 70)
+    print(f"SAP TB AGGREGATION BENCHMARK - {total_lines:,} journal lines")
+    print("=" * 70)
+
+    je_df = build_synthetic_ledger(total_lines)
+    pages = split_pages(je_df)
+    extractor = DataExtractor.__new__(DataExtractor)
+
+    legacy, legacy_time, legacy_peak = measure(legacy_aggregate, je_df)
+    columnar, columnar_time, columnar_peak = measure(extractor._aggregate_journal_lines, je_df)
+    streamed, streamed_time, streamed_peak = measure(
+        extractor._aggregate_journal_pages, iter(pages)
+    )
+
+    for result in (columnar, streamed):
+        pd.testing.assert_frame_equal(
+            legacy.sort_values('AccountCode').reset_index(drop=True),
+            result.sort_values('AccountCode').reset_index(drop=True),
+            check_dtype=False
+        )
+
+    print(f"\n  Legacy (iterrows):  {legacy_time:8.2f}s   peak {legacy_peak:8.1f} MB")
+    print(f"  Columnar:           {columnar_time:8.2f}s   peak {columnar_peak:8.1f} MB")
+    print(f"  Streamed pages:     {streamed_time:8.2f}s   peak {streamed_peak:8.1f} MB")
+    print(f"\n  Speedup: {legacy_time / columnar_time:.1f}x   (results identical)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Trial Balance Validation Benchmark
+==================================
+Compare the legacy row-by-row implementations of the sign, data-integrity and
+accounting-equation rules against the columnar TrialBalanceValidator on
+synthetic trial balances, and the legacy write-then-format Excel report
+against the streaming report writer
+
+Usage:
+    python backend/utils/benchmark_tb_validation.py [rows ...]   # default 10000 100000 1000000
+"""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.utils.tb_validate_7_rules import DEFAULT_TOLERANCE, TrialBalanceValidator
+
+
+class LegacyTrialBalanceValidator(TrialBalanceValidator):
+    """Previous per-row implementations of rules 4, 5 and 6"""
+
+    @staticmethod
+    def get_account_type(gl_code):
+        """Account type from the first digit of the GL code"""
+        gl_str = "" if pd.isna(gl_code) else str(gl_code).strip()
+        types = {'1': "Asset", '2': "Liability", '3': "Revenue", '4': "Expense", '5': "Equity"}
+        return types.get(gl_str[:1], "Unknown")
+
+    def rule_4_no_missing_invalid_data(self):
+        issues = self.df[
+            self.df[['GL_Code', 'Description', 'Debit', 'Credit', 'Balance']].isnull().any(axis=1) |
+            ~self.df[['Debit', 'Credit', 'Balance']].apply(lambda x: x.apply(np.isreal)).all(axis=1)
+        ]
+        if len(issues) > 0:
+            self.violations["rule_4"] = issues[["GL_Code", "Description", "Debit", "Credit", "Balance"]].copy()
+        self.validation_results["rule_4"] = {"issues_count": len(issues)}
+
+    def rule_5_logical_balance_signs(self):
+        self.df["Account_Type"] = self.df["GL_Code"].apply(self.get_account_type)
+
+        violations = []
+        for _, row in self.df.iterrows():
+            code = str(row['GL_Code'])
+            balance = row['Balance']
+            if abs(balance) <= self.abs_tolerance:
+                continue
+            if code.startswith('1') and balance < 0:
+                violations.append(row)
+            elif code.startswith('2') and balance > 0:
+                violations.append(row)
+            elif code.startswith('5') and balance > 0:
+                violations.append(row)
+            elif code.startswith('3') and balance > 0:
+                violations.append(row)
+            elif code.startswith('4') and balance < 0:
+                violations.append(row)
+
+        violations_df = pd.DataFrame(violations)
+        if len(violations_df) > 0:
+            self.violations["rule_5"] = violations_df[["GL_Code", "Description", "Account_Type", "Balance"]].copy()
+        self.validation_results["rule_5"] = {"violations_count": len(violations_df)}
+
+    def _write_excel_report(self, report_df, violation_sheets):
+        from openpyxl import load_workbook
+        from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+
+        with pd.ExcelWriter(self.output_file, engine='openpyxl') as writer:
+            report_df.to_excel(writer, sheet_name="Validation Report", index=False)
+            for sheet_name, violations_df in violation_sheets:
+                violations_df.to_excel(writer, sheet_name=sheet_name, index=False)
+
+        wb = load_workbook(self.output_file)
+        ws = wb["Validation Report"]
+        for cell in ws[1]:
+            cell.fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+            cell.font = Font(color="FFFFFF", bold=True)
+        thin = Side(style='thin')
+        for row in ws.iter_rows(min_row=1, max_row=ws.max_row, min_col=1, max_col=ws.max_column):
+            for cell in row:
+                cell.border = Border(left=thin, right=thin, top=thin, bottom=thin)
+                if cell.row > 1:
+                    cell.alignment = Alignment(horizontal="left", vertical="center", wrap_text=True)
+        for sheet_name in wb.sheetnames:
+            for column in wb[sheet_name].columns:
+                max_length = max((len(str(cell.value)) for cell in column if cell.value), default=0)
+                wb[sheet_name].column_dimensions[column[0].column_letter].width = min(max_length + 2, 50)
+        wb.save(self.output_file)
+
+    def rule_6_accounting_equation(self):
+        codes = self.df['GL_Code'].astype(str)
+        self.validation_results["rule_6"] = {
+            "assets": self.df[codes.str.startswith('1')]['Balance'].sum(),
+            "liabilities": self.df[codes.str.startswith('2')]['Balance'].sum(),
+            "equity": self.df[codes.str.startswith('5')]['Balance'].sum(),
+            "revenue": self.df[codes.str.startswith('3')]['Balance'].sum(),
+            "expenses": self.df[codes.str.startswith('4')]['Balance'].sum(),
+        }
+
+
+def build_synthetic_tb(rows: int, wrong_sign_rate: float = 0.05) -> pd.DataFrame:
+    """Build a loaded-TB DataFrame with some wrong signs and missing descriptions"""
+    rng = np.random.default_rng(42)
+    prefixes = rng.choice(['1', '2', '3', '4', '5', '6'], size=rows, p=[.3, .2, .15, .25, .08, .02])
+    codes = pd.Series(prefixes).str.cat(pd.Series(np.arange(rows) % 1_000_000).astype(str).str.zfill(6))
+
+    balance = rng.uniform(1, 1_000_000, size=rows).round(2)
+    expected_negative = np.isin(prefixes, ['2', '3', '5'])
+    flip = rng.random(rows) < wrong_sign_rate
+    balance = np.where(expected_negative ^ flip, -balance, balance)
+
+    description = pd.Series([f"Account {i}" for i in range(rows)], dtype=object)
+    description[rng.random(rows) < 0.001] = None
+
+    df = pd.DataFrame({'GL_Code': codes, 'Description': description, 'Balance': balance})
+    df["Debit"] = df["Balance"].clip(lower=0)
+    df["Credit"] = (-df["Balance"]).clip(lower=0)
+    return df
+
+
+def make_validator(cls, df: pd.DataFrame) -> TrialBalanceValidator:
+    """Create a validator around an in-memory TB without touching entity folders"""
+    validator = cls.__new__(cls)
+    validator.entity = "benchmark"
+    validator.input_file = "synthetic"
+    validator.df = df.copy()
+    validator.tolerance_pct = 0.00001
+    validator.abs_tolerance = DEFAULT_TOLERANCE
+    validator.validation_results = {}
+    validator.violations = {}
+    validator.rules_config = {}
+    return validator
+
+
+def run_rules(validator: TrialBalanceValidator) -> float:
+    """Run rules 4-6 quietly and return elapsed seconds"""
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        validator.rule_4_no_missing_invalid_data()
+        validator.rule_5_logical_balance_signs()
+        validator.rule_6_accounting_equation()
+    return time.perf_counter() - start
+
+
+def time_report(validator: TrialBalanceValidator, output_file: str) -> float:
+    """Write the Excel report quietly and return elapsed seconds"""
+    validator.output_file = output_file
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        validator.generate_excel_report()
+    return time.perf_counter() - start
+
+
+def assert_same_results(legacy: TrialBalanceValidator, columnar: TrialBalanceValidator):
+    """Both engines must flag the same rows and compute the same totals"""
+    for rule in ("rule_4", "rule_5"):
+        assert rule in legacy.violations or rule not in columnar.violations, rule
+        if rule in legacy.violations:
+            old, new = legacy.violations[rule], columnar.violations[rule]
+            assert list(old.columns) == list(new.columns), rule
+            assert old.index.equals(new.index), rule
+            np.testing.assert_allclose(old["Balance"].astype(float), new["Balance"].astype(float))
+
+    for key, value in legacy.validation_results["rule_6"].items():
+        assert abs(value - columnar.validation_results["rule_6"][key]) < 1e-3, key
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 1_000_000]
+
+    print("=" * 70)
+    print("TB VALIDATION BENCHMARK - rules 4, 5, 6")
+    print("=" * 70)
+    print(f"\n  {'Rows':>10}  {'Legacy':>10}  {'Columnar':>10}  {'Speedup':>8}")
+    print("  " + "-" * 44)
+
+    for rows in sizes:
+        df = build_synthetic_tb(rows)
+        legacy = make_validator(LegacyTrialBalanceValidator, df)
+        columnar = make_validator(TrialBalanceValidator, df)
+
+        legacy_time = run_rules(legacy)
+        columnar_time = run_rules(columnar)
+        assert_same_results(legacy, columnar)
+
+        print(f"  {rows:>10,}  {legacy_time:>9.2f}s  {columnar_time:>9.3f}s  {legacy_time / columnar_time:>7.0f}x")
+
+    print("\n  Results identical across engines")
+
+    print("\n" + "=" * 70)
+    print("EXCEL REPORT BENCHMARK - legacy write+format vs streaming writer")
+    print("(every balance has the wrong sign, so nearly every row is a violation)")
+    print("=" * 70)
+    print(f"\n  {'Rows':>10}  {'Violations':>10}  {'Legacy':>10}  {'Streaming':>10}  {'Speedup':>8}")
+    print("  " + "-" * 56)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for rows in [size for size in sizes if size <= 100_000]:
+            df = build_synthetic_tb(rows, wrong_sign_rate=1.0)
+            streaming = make_validator(TrialBalanceValidator, df)
+            run_rules(streaming)
+            streaming.rules_config = {"validation_rules": {}}
+
+            # Same results and violations, only the writer differs
+            legacy = make_validator(LegacyTrialBalanceValidator, df)
+            legacy.rules_config = streaming.rules_config
+            legacy.validation_results = streaming.validation_results
+            legacy.violations = streaming.violations
+            violation_rows = sum(len(v) for v in streaming.violations.values())
+
+            legacy_time = time_report(legacy, os.path.join(tmp_dir, "legacy.xlsx"))
+            streaming_time = time_report(streaming, os.path.join(tmp_dir, "streaming.xlsx"))
+
+            print(f"  {rows:>10,}  {violation_rows:>10,}  {legacy_time:>9.2f}s  "
+                  f"{streaming_time:>9.2f}s  {legacy_time / streaming_time:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
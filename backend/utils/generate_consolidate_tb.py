@@ -19,10 +19,15 @@ Usage:
     
 Returns:
     True if successful, False otherwise
+
+In-process (no import-time side effects, safe to run for several entities at once):
+    from backend.utils.generate_consolidate_tb import consolidate
+    result = consolidate('cpm', period='jun_2025')
 """
 
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 import numpy as np
 from datetime import datetime
@@ -36,66 +41,52 @@ if str(project_root) not in sys.path:
 # Import entity configuration for proper normalization
 from backend.config.entities import EntityConfig
 from backend.config.period_config import period_config
+from backend.utils.gl_codes import normalize_gl_code
+from backend.utils.sheet_loader import frame_from_grid, load_sheet
+from backend.utils.upload_sidecar import read_sidecar
 
-# Get entity from command line argument or environment variable, default to 'cpm'
-raw_entity = sys.argv[1] if len(sys.argv) > 1 else os.getenv('ENTITY', 'cpm')
-ENTITY = EntityConfig.normalize_entity_code(raw_entity)  # Properly normalize entity code
-
-# Set up paths based on entity
-DATA_DIR = Path(__file__).parent.parent.parent / "data" / ENTITY
-SOURCE_FILES_DIR = DATA_DIR / "input" / "unadjusted-trialbalance"
-CONFIG_DIR = DATA_DIR / "input" / "config"
-OUTPUT_FILES_DIR = DATA_DIR / "output" / "adjusted-trialbalance"
-
-# Ensure output directory exists
-OUTPUT_FILES_DIR.mkdir(parents=True, exist_ok=True)
-
-# Apply period passed via environment so this separate process uses UI selection
-_ENV_PERIOD_KEY = os.getenv('PERIOD_KEY', '').strip()
-_ENV_PERIOD_COLUMN = os.getenv('PERIOD_COLUMN', '').strip()
-try:
-    if _ENV_PERIOD_KEY:
-        period_config.set_period(_ENV_PERIOD_KEY)
-    elif _ENV_PERIOD_COLUMN:
-        period_config.set_period_column(_ENV_PERIOD_COLUMN)
-except Exception:
-    # continue with defaults if anything goes wrong
-    pass
-
-
-def _normalize_gl_code(series: pd.Series, *, allow_slash: bool = None) -> pd.Series:
-    """Normalize GL Code values for reliable joins.
-
-    - Convert to string and trim whitespace
-    - Remove leading apostrophes added by Excel (e.g., '11201010)
-    - Remove trailing .0 from numeric imports (e.g., 11201010.0)
-    - Optionally keep '/' for entities that rely on it (all except CPM Malaysia)
-    - Remove other punctuation/whitespace to stabilise joins
-    - Lowercase (no-op for digits, but keeps consistent behavior)
-    """
-    if allow_slash is None:
-        allow_slash = EntityConfig.normalize_entity_code(ENTITY) != "cpm"
+DATA_ROOT = project_root / "data"
+DEFAULT_PERIOD_COLUMN = "(Unaudited) Mar'25"
 
-    # Convert to string and basic trim
-    s = series.astype(str).str.strip()
+# Manual adjustment files loaded concurrently by the consolidation step
+ADJ_LOAD_WORKERS = int(os.getenv('ADJ_LOAD_WORKERS', '4'))
 
-    # Normalize unicode whitespace and apostrophes
-    s = s.str.replace("\u2019", "'", regex=False)  # curly to straight apostrophe
-    s = s.str.lstrip("'")  # remove leading apostrophes from Excel text formatting
 
-    # Remove trailing .0 artifacts from float-looking strings
-    s = s.str.replace(r"\.0$", "", regex=True)
+def _resolve_period_column(period: str = None) -> str:
+    """Map a period key (e.g. 'jun_2025') or column name to the period column.
 
-    # Keep only letters/digits and optionally slash; remove other punctuation/spaces
-    pattern = r"[^0-9A-Za-z/]" if allow_slash else r"[^0-9A-Za-z]"
-    s = s.str.replace(pattern, "", regex=True)
+    None means the currently selected period (PeriodConfig).
+    """
+    if not period:
+        return period_config.get_current_period_column(default=DEFAULT_PERIOD_COLUMN)
+    return period_config.get_available_periods().get(period, period)
 
-    # Lowercase for consistency (digits unaffected)
-    s = s.str.lower()
 
-    # Convert placeholders to blank
-    s = s.where(~s.isin(['nan', 'none', 'null']), '')
-    return s
+class ConsolidationContext:
+    """Entity, folders and period for one consolidation run.
+
+    All per-run state lives here instead of module globals, so the
+    consolidation can run in-process for several entities at once.
+    """
+
+    def __init__(self, entity: str, period: str = None, paths: dict = None):
+        """
+        Args:
+            entity: Entity code (normalized via EntityConfig)
+            period: Period key or period column; defaults to the selected period
+            paths: Optional overrides for 'data_dir', 'source_dir', 'config_dir',
+                'manual_dir' and 'output_dir'
+        """
+        paths = paths or {}
+        self.entity = EntityConfig.normalize_entity_code(entity)
+        self.data_dir = Path(paths.get('data_dir', DATA_ROOT / self.entity))
+        self.source_dir = Path(paths.get('source_dir', self.data_dir / "input" / "unadjusted-trialbalance"))
+        self.config_dir = Path(paths.get('config_dir', self.data_dir / "input" / "config"))
+        self.manual_dir = Path(paths.get('manual_dir', self.data_dir / "input" / "manual-adjustments"))
+        self.output_dir = Path(paths.get('output_dir', self.data_dir / "output" / "adjusted-trialbalance"))
+        self.period_column = _resolve_period_column(period)
+        # Short period label (e.g. "Mar'25"), refined by load_trial_balance
+        self.short_label = _derive_period_labels(self.period_column)[1]
 
 
 def _to_numeric(series: pd.Series) -> pd.Series:
@@ -143,7 +134,7 @@ def _normalize_desc(series: pd.Series) -> pd.Series:
     return s
 
 
-def _load_desc_mapping():
+def _load_desc_mapping(ctx: ConsolidationContext):
     """Load optional description remapping rules for this entity.
 
     Path: data/{entity}/input/config/adjustment_description_map.json
@@ -152,7 +143,7 @@ def _load_desc_mapping():
     """
     try:
         import json
-        mapping_path = CONFIG_DIR / 'adjustment_description_map.json'
+        mapping_path = ctx.config_dir / 'adjustment_description_map.json'
         if mapping_path.exists():
             with open(mapping_path, 'r', encoding='utf-8') as f:
                 raw = json.load(f)
@@ -245,7 +236,7 @@ def _guess_desc_amount_columns(df: pd.DataFrame):
     return desc_col, amount_col
 
 
-def load_trial_balance():
+def load_trial_balance(ctx: ConsolidationContext):
     """Load the source unadjusted trial balance and summarize by GL Code.
 
     Be flexible about the input filename. Prefer `unadjusted_trialbalance.xlsx`,
@@ -253,7 +244,8 @@ def load_trial_balance():
     reasonable Excel file to use (names containing 'trial' or 'balance' first,
     otherwise the first .xlsx/.xls file).
     """
-    preferred = SOURCE_FILES_DIR / "unadjusted_trialbalance.xlsx"
+    source_dir = ctx.source_dir
+    preferred = source_dir / "unadjusted_trialbalance.xlsx"
 
     # Resolve trial balance path with fallbacks
     if preferred.exists():
@@ -262,44 +254,37 @@ def load_trial_balance():
         candidates = []
         # Priority 1: files containing 'trial' or 'balance'
         for ext in ("*.xlsx", "*.xls"):
-            for p in SOURCE_FILES_DIR.glob(ext):
+            for p in source_dir.glob(ext):
                 name = p.name.lower()
                 if "trial" in name or "balance" in name:
                     candidates.append(p)
         # Priority 2: any excel file
         if not candidates:
-            candidates = list(SOURCE_FILES_DIR.glob("*.xlsx")) + list(SOURCE_FILES_DIR.glob("*.xls"))
+            candidates = list(source_dir.glob("*.xlsx")) + list(source_dir.glob("*.xls"))
 
         if candidates:
             tb_path = sorted(candidates)[0]
             print(f"  Preferred file not found. Using: {tb_path}")
         else:
-            print(f" Trial Balance file not found in: {SOURCE_FILES_DIR}")
+            print(f" Trial Balance file not found in: {source_dir}")
             print("   Expected 'unadjusted_trialbalance.xlsx' or any Excel file containing 'trial'/'balance'.")
             return None
     
     try:
-        # Try to sniff header row if TB has preface rows
-        header_row = 0
-        try:
-            peek = pd.read_excel(tb_path, header=None, nrows=10)
-            for r in range(min(10, len(peek))):
-                row_vals = [str(v).strip().lower() for v in list(peek.iloc[r].values)]
-                row_text = " ".join(row_vals)
-                if ('gl' in row_text and ('code' in row_text or 'number' in row_text or 'account' in row_text)):
-                    header_row = r
-                    break
-        except Exception:
-            header_row = 0
-
-        df = pd.read_excel(tb_path, header=header_row)
+        # Prefer the normalized sidecar written at upload time
+        df = read_sidecar(tb_path)
+        if df is None:
+            # Read once; header row sniffed in memory if the TB has preface rows
+            df, _ = load_sheet(tb_path)
+        else:
+            print(f" Using columnar sidecar for {tb_path.name}")
         
         # Expected columns: GL Code, GL Description, (Unaudited) Mar'25
         print(f" Loaded Trial Balance with {len(df)} transaction rows")
         print(f"   Columns: {df.columns.tolist()}")
         
         # Normalize GL Code for matching
-        df['GL Code'] = _normalize_gl_code(df['GL Code'])
+        df['GL Code'] = normalize_gl_code(df['GL Code'], entity=ctx.entity)
         
         # Normalize column names - handle variations like "GL Description" or "GL Code Description "
         # Find the description column (could be "GL Description" or "GL Code Description " or similar)
@@ -318,7 +303,7 @@ def load_trial_balance():
         amount_col = None
         lower_map = {c: str(c).lower() for c in df.columns}
         # prioritize period-driven names
-        period_candidates, short_label = _derive_period_labels()
+        period_candidates, short_label = _derive_period_labels(ctx.period_column)
         preferred_names = [s.lower() for s in period_candidates] + [
             "closing balance", "closing_balance", "balance",
             "amount", "net amount", "net_amount"
@@ -385,9 +370,8 @@ def load_trial_balance():
         # Rename the description column to standardized name
         df_grouped.rename(columns={desc_col: 'GL Description', amount_col: f"(Unaudited) {short_label}"}, inplace=True)
         
-        # Store chosen period label globally for later output column naming
-        global _SHORT_PERIOD_LABEL
-        _SHORT_PERIOD_LABEL = short_label
+        # Store chosen period label for later output column naming
+        ctx.short_label = short_label
         
         print(f" Prepared {len(df_grouped)} TB rows")
         
@@ -403,11 +387,56 @@ def load_trial_balance():
         return None
 
 
-def load_adjustment_from_manual_file(filename, adj_column_name):
+def _detect_adjustment_header_row(grid: pd.DataFrame) -> int:
+    """Pick the header row of a manual adjustment sheet from its raw grid.
+
+    Try the first few rows as header and score each by content profile
+    (numeric/text ratio of the guessed amount/description columns and the
+    number of usable rows). Falls back to the first row if nothing scores well.
+    """
+    candidate_headers = [0, 1, 2, 3]
+    best = None
+    best_score = -1
+    for hr in candidate_headers:
+        try:
+            tmp = frame_from_grid(grid, hr)
+            dcol, acol = _guess_desc_amount_columns(tmp)
+            # score by numeric/text ratio and number of valid rows
+            if dcol and acol:
+                try:
+                    numeric_ratio = pd.to_numeric(tmp[acol], errors='coerce').notna().mean()
+                except Exception:
+                    numeric_ratio = 0.0
+                try:
+                    text_ratio = tmp[dcol].astype(str).str.strip().replace({'nan': ''}).ne('').mean()
+                except Exception:
+                    text_ratio = 0.0
+                valid_rows = 0
+                try:
+                    tt = tmp[[dcol, acol]].copy()
+                    tt[dcol] = tt[dcol].astype(str).str.strip()
+                    tt[acol] = pd.to_numeric(tt[acol], errors='coerce')
+                    valid_rows = int(((tt[dcol] != '') & tt[acol].notna()).sum())
+                except Exception:
+                    valid_rows = 0
+                score = numeric_ratio + text_ratio + min(1.0, valid_rows / 3.0)
+                if score > best_score:
+                    best_score = score
+                    best = hr
+        except Exception:
+            continue
+
+    if best is not None and best_score >= 1.2:
+        return best
+    return 0
+
+
+def load_adjustment_from_manual_file(ctx: ConsolidationContext, filename, adj_column_name):
     """
     Load adjustments directly from manual adjustment file (no reconciliation file needed)
     
     Args:
+        ctx: Consolidation context (entity and folders)
         filename: Name of the manual adjustment file (e.g., 'enc_correct_period_adjustments.xlsx')
         adj_column_name: Expected adjustment column name (e.g., 'Adj1_ENC')
     
@@ -415,8 +444,7 @@ def load_adjustment_from_manual_file(filename, adj_column_name):
         DataFrame with GL Code and adjustment column, or None if file not found
     """
     # First try to find in manual-adjustments directory
-    manual_dir = DATA_DIR / "input" / "manual-adjustments"
-    filepath = manual_dir / filename
+    filepath = ctx.manual_dir / filename
     
     if not filepath.exists():
         print(f"  Manual adjustment file not found: {filepath}")
@@ -424,47 +452,9 @@ def load_adjustment_from_manual_file(filename, adj_column_name):
         return None
     
     try:
-        # Robust header detection: try multiple header rows and pick the best by content profile
-        candidate_headers = [0, 1, 2, 3]
-        best = None
-        best_score = -1
-        for hr in candidate_headers:
-            try:
-                tmp = pd.read_excel(filepath, header=hr)
-                dcol, acol = _guess_desc_amount_columns(tmp)
-                # score by numeric/text ratio and number of valid rows
-                if dcol and acol:
-                    try:
-                        numeric_ratio = pd.to_numeric(tmp[acol], errors='coerce').notna().mean()
-                    except Exception:
-                        numeric_ratio = 0.0
-                    try:
-                        text_ratio = tmp[dcol].astype(str).str.strip().replace({'nan': ''}).ne('').mean()
-                    except Exception:
-                        text_ratio = 0.0
-                    valid_rows = 0
-                    try:
-                        tt = tmp[[dcol, acol]].copy()
-                        tt[dcol] = tt[dcol].astype(str).str.strip()
-                        tt[acol] = pd.to_numeric(tt[acol], errors='coerce')
-                        valid_rows = int(((tt[dcol] != '') & tt[acol].notna()).sum())
-                    except Exception:
-                        valid_rows = 0
-                    score = numeric_ratio + text_ratio + min(1.0, valid_rows / 3.0)
-                    if score > best_score:
-                        best_score = score
-                        best = (hr, tmp)
-            except Exception:
-                continue
+        # Read the sheet once; header row picked in memory (remembered per file version)
+        df, header_row = load_sheet(filepath, detect=_detect_adjustment_header_row)
 
-        if best is not None and best_score >= 1.2:
-            header_row = best[0]
-            df = best[1]
-        else:
-            # Fallback to simple header=0
-            header_row = 0
-            df = pd.read_excel(filepath, header=header_row)
-        
         # Expected columns vary, but we need GL Code and some amount/adjustment column
         # Common patterns: 'GL Code', 'GL_Code', 'GLCode'
         gl_code_col = None
@@ -490,7 +480,7 @@ def load_adjustment_from_manual_file(filename, adj_column_name):
         # treat it as unusable and fall back to description-based logic.
         if gl_code_col is not None:
             try:
-                gl_series = _normalize_gl_code(df[gl_code_col])
+                gl_series = normalize_gl_code(df[gl_code_col], entity=ctx.entity)
                 non_empty = gl_series[gl_series != ""]
                 if non_empty.nunique() < 2:
                     gl_code_col = None
@@ -600,14 +590,14 @@ def load_adjustment_from_manual_file(filename, adj_column_name):
                 return None
         
         # Optional description mapping (entity-specific synonyms)
-        desc_map = _load_desc_mapping() if '_load_desc_mapping' in globals() else {}
+        desc_map = _load_desc_mapping(ctx)
 
         # Build result on GL Code or Description depending on availability
         if gl_code_col is not None:
             # GL-based adjustments: aggregate by GL Code
             result_df = df[[gl_code_col, amount_col]].copy()
             result_df.columns = ['GL Code', adj_column_name]
-            result_df['GL Code'] = _normalize_gl_code(result_df['GL Code'])
+            result_df['GL Code'] = normalize_gl_code(result_df['GL Code'], entity=ctx.entity)
             result_df[adj_column_name] = _to_numeric(result_df[adj_column_name])
             result_df = result_df.groupby('GL Code', as_index=False)[adj_column_name].sum()
             print(f" Loaded {filename}: {len(df)} rows  {len(result_df)} unique GL Codes, column '{adj_column_name}'")
@@ -643,19 +633,20 @@ def load_adjustment_from_manual_file(filename, adj_column_name):
         return None
 
 
-def load_adjustment_reconciliation(filename, adj_column_name):
+def load_adjustment_reconciliation(ctx: ConsolidationContext, filename, adj_column_name):
     """
     Load an adjustment reconciliation file and extract GL Code and adjustment value.
     Falls back to manual adjustment file if reconciliation file doesn't exist.
     
     Args:
+        ctx: Consolidation context (entity and folders)
         filename: Name of the reconciliation file (e.g., 'enc_correct_period_reconciliation.xlsx')
         adj_column_name: Expected adjustment column name (e.g., 'Adj1_ENC')
     
     Returns:
         DataFrame with GL Code and adjustment column, or None if file not found
     """
-    filepath = OUTPUT_FILES_DIR / filename
+    filepath = ctx.output_dir / filename
     
     # Try reconciliation file first
     if filepath.exists():
@@ -676,7 +667,7 @@ def load_adjustment_reconciliation(filename, adj_column_name):
             result_df = df[['GL Code', adj_column_name]].copy()
             
             # Normalize GL Code and parse numeric amounts
-            result_df['GL Code'] = _normalize_gl_code(result_df['GL Code'])
+            result_df['GL Code'] = normalize_gl_code(result_df['GL Code'], entity=ctx.entity)
             result_df[adj_column_name] = _to_numeric(result_df[adj_column_name])
             
             # Group by GL Code and sum adjustments (handle duplicates from transaction detail)
@@ -706,36 +697,191 @@ def load_adjustment_reconciliation(filename, adj_column_name):
         
         manual_filename = manual_file_mapping.get(filename)
         if manual_filename:
-            return load_adjustment_from_manual_file(manual_filename, adj_column_name)
+            return load_adjustment_from_manual_file(ctx, manual_filename, adj_column_name)
         else:
             print(f"   No manual file mapping found for {filename}")
             print(f"   Filling with zeros for {adj_column_name}")
             return None
 
 
-def generate_adjusted_trial_balance():
-    """Main function to generate adjusted trial balance"""
+def _load_adjustments(ctx: ConsolidationContext, adjustments_config, max_workers=ADJ_LOAD_WORKERS):
+    """Load all manual adjustment files concurrently.
+
+    Returns a list of (adj_config, adj_df) pairs in the original file order;
+    adj_df is None for files that could not be loaded.
+    """
+    if not adjustments_config:
+        return []
+
+    print(f"   Loading {len(adjustments_config)} adjustment file(s) with up to {max_workers} worker(s)...")
+    workers = max(1, min(max_workers, len(adjustments_config)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        frames = list(pool.map(
+            lambda cfg: load_adjustment_from_manual_file(ctx, cfg['file'], cfg['column']),
+            adjustments_config
+        ))
+    print()
+    return list(zip(adjustments_config, frames))
+
+
+def _merge_adjustments(result_df, loaded_adjustments, use_gl_code):
+    """Join every loaded adjustment onto the TB with a single merge per join key.
+
+    Each adjustment is classified as a GL Code join, a 1:1 row-wise overlay,
+    a description join or a zero-filled column. GL and description joins are
+    reduced to long (key, column, amount) rows, pivoted once and merged once;
+    unmatched keys for all files come from one isin against the TB keys.
+    """
+    long_parts = {'GL Code': [], '__desc_key': []}
+    overlay_columns = {}
+    zero_columns = []
+    file_by_column = {}
+
+    tb_desc_keys = set(result_df['__desc_key'].dropna().tolist())
+    tb_desc_list = list(tb_desc_keys)
+    fuzzy_matches = {}
+
+    for idx, (adj_config, adj_df) in enumerate(loaded_adjustments, 1):
+        column = adj_config['column']
+        file_by_column[column] = adj_config['file']
+        print(f"   [{idx}/{len(loaded_adjustments)}] Merging: {adj_config['file']}")
+
+        if adj_df is None:
+            # If file not found, create column with all zeros
+            zero_columns.append(column)
+            print(f"        Created zero-filled column: {column}")
+            continue
+
+        # Decide join key: prefer GL Code only when it is
+        # actually informative on both TB and adjustment side;
+        # otherwise fall back to description-based joins.
+        gl_join_usable = False
+        if use_gl_code and 'GL Code' in adj_df.columns:
+            adj_gl = adj_df['GL Code'].astype(str).str.strip()
+            adj_non_empty = adj_gl[adj_gl != '']
+            # Require at least 2 distinct non-empty codes in the adjustment file
+            if adj_non_empty.nunique() >= 2:
+                gl_join_usable = True
+
+        if gl_join_usable:
+            long_parts['GL Code'].append(pd.DataFrame({
+                'key': adj_df['GL Code'], 'column': column, 'amount': adj_df[column]
+            }))
+            continue
+
+        if 'GL Description' not in adj_df.columns:
+            print(f"        {adj_config['file']}: No usable join key; creating zero-filled column")
+            zero_columns.append(column)
+            continue
+
+        # Special case: row-wise overlay adjustments.
+        # If the adjustment file has the same number of rows as the
+        # trial balance and the normalized descriptions match in order,
+        # we treat it as a 1:1 row overlay and apply the adjustment
+        # amounts by row instead of description-level aggregation.
+        adj_keys = _normalize_desc(adj_df['GL Description'])
+        try:
+            if len(adj_df) == len(result_df) and result_df['__desc_key'].reset_index(drop=True).equals(
+                adj_keys.reset_index(drop=True)
+            ):
+                overlay_columns[column] = adj_df[column].fillna(0.0).values
+                print(f"        {adj_config['file']}: applied row-wise matching on description")
+                continue
+        except Exception:
+            # If anything goes wrong, fall back to description-based merge
+            pass
+
+        # Fuzzy map any unmatched adjustment descriptions to the closest TB description
+        # (matches are shared across files, so each distinct description is scored once)
+        try:
+            import difflib
+            map_count = 0
+            mapped_keys = []
+            for key in adj_keys:
+                if key in tb_desc_keys or key == '':
+                    mapped_keys.append(key)
+                    continue
+                if key not in fuzzy_matches:
+                    candidates = difflib.get_close_matches(key, tb_desc_list, n=1, cutoff=0.8)
+                    fuzzy_matches[key] = candidates[0] if candidates else None
+                if fuzzy_matches[key] is not None:
+                    mapped_keys.append(fuzzy_matches[key])
+                    map_count += 1
+                else:
+                    mapped_keys.append(key)
+            adj_keys = pd.Series(mapped_keys, index=adj_keys.index)
+            if map_count:
+                print(f"        {adj_config['file']}: fuzz-mapped {map_count} description(s) to TB")
+        except Exception:
+            pass
+
+        long_parts['__desc_key'].append(pd.DataFrame({
+            'key': adj_keys, 'column': column, 'amount': adj_df[column]
+        }))
+
+    # Pivot each join key's long frame once and merge it once
+    joined_columns = []
+    for join_key, parts in long_parts.items():
+        if not parts:
+            continue
+        long_df = pd.concat(parts, ignore_index=True)
+
+        # Aggregate by key so multiple adjustment rows for the same
+        # GL Code / description never duplicate TB rows
+        wide_df = long_df.groupby(['key', 'column'], sort=False)['amount'].sum().unstack('column')
+        wide_df.columns.name = None
+        wide_df.index.name = join_key
+        result_df = result_df.merge(wide_df.reset_index(), on=join_key, how='left')
+        joined_columns.extend(wide_df.columns)
+
+        # Unmatched reporting for every file in a single set operation
+        tb_keys = result_df[join_key].dropna().astype(str).unique()
+        unmatched = long_df[long_df['key'].notna() & ~long_df['key'].astype(str).isin(tb_keys)]
+        unmatched_counts = unmatched.groupby('column', sort=False)['key'].nunique()
+        for column, count in unmatched_counts.items():
+            if join_key == 'GL Code':
+                print(f"        {file_by_column[column]}: {count} adjustment GL(s) not found in TB")
+            else:
+                print(f"        {file_by_column[column]}: {count} adjustment description(s) not found in TB (after normalization)")
+
+    # Fill NaN values with 0.0 for keys not in an adjustment file
+    for column in joined_columns:
+        result_df[column] = result_df[column].fillna(0.0)
+    for column, values in overlay_columns.items():
+        result_df[column] = values
+    for column in zero_columns:
+        result_df[column] = 0.0
+
+    return result_df
+
+
+def generate_adjusted_trial_balance(ctx: ConsolidationContext, max_workers: int = ADJ_LOAD_WORKERS):
+    """Generate and save the adjusted trial balance for one entity.
+
+    Returns:
+        Final adjusted TB DataFrame, or None on failure
+    """
     
     print("=" * 80)
     print("ADJUSTED TRIAL BALANCE GENERATOR")
     print("=" * 80)
     print(f"Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print(f"Entity: {ENTITY.upper()}")
-    print(f"Source Files: {SOURCE_FILES_DIR}")
-    print(f"Output Files: {OUTPUT_FILES_DIR}")
+    print(f"Entity: {ctx.entity.upper()}")
+    print(f"Source Files: {ctx.source_dir}")
+    print(f"Output Files: {ctx.output_dir}")
     print()
     
     # Step 1: Load Trial Balance
     print(" Step 1: Loading unadjusted_trialbalance.xlsx...")
-    tb_df = load_trial_balance()
+    tb_df = load_trial_balance(ctx)
     if tb_df is None:
-        return False
+        return None
     print()
     
     # Step 2: Discover adjustment files dynamically from manual-adjustments directory
     print(" Step 2: Discovering adjustment files (manual-adjustments)...")
     print()
-    manual_dir = DATA_DIR / "input" / "manual-adjustments"
+    manual_dir = ctx.manual_dir
     adjustments_config = []
     if manual_dir.exists():
         for ext in ("*.xlsx", "*.xls"):
@@ -747,7 +893,7 @@ def generate_adjusted_trial_balance():
     if not adjustments_config:
         print("  No adjustment files found in manual-adjustments. Proceeding with zero adjustments.")
     
-    # Step 3: Load and merge each adjustment
+    # Step 3: Load all adjustments, then merge them in one pass
     print(" Step 3: Merging adjustments with Trial Balance...")
     print()
     
@@ -770,113 +916,14 @@ def generate_adjusted_trial_balance():
 
     # Normalize description helper for description-based joins
     result_df['__desc_key'] = _normalize_desc(result_df['GL Description'])
-    
-    for idx, adj_config in enumerate(adjustments_config, 1):
-        print(f"   [{idx}/{len(adjustments_config)}] Loading: {adj_config['file']}")
-        
-        # Load directly from manual file, using filename as the result column
-        adj_df = load_adjustment_from_manual_file(adj_config['file'], adj_config['column'])
-        
-        if adj_df is not None:
-            # Decide join key: prefer GL Code only when it is
-            # actually informative on both TB and adjustment side;
-            # otherwise fall back to description-based joins.
-            gl_join_usable = False
-            if use_gl_code and 'GL Code' in adj_df.columns:
-                adj_gl = adj_df['GL Code'].astype(str).str.strip()
-                adj_non_empty = adj_gl[adj_gl != '']
-                # Require at least 2 distinct non-empty codes in the adjustment file
-                if adj_non_empty.nunique() >= 2:
-                    gl_join_usable = True
-
-            if gl_join_usable:
-                # GL-based join
-                result_df = result_df.merge(adj_df, on='GL Code', how='left')
-                # Unmatched reporting
-                try:
-                    tb_gl_set = set(result_df['GL Code'].dropna().astype(str))
-                    adj_gl_set = set(adj_df['GL Code'].dropna().astype(str))
-                    unmatched = len(adj_gl_set - tb_gl_set)
-                    if unmatched:
-                        print(f"        {adj_config['file']}: {unmatched} adjustment GL(s) not found in TB")
-                except Exception:
-                    pass
-            elif 'GL Description' in adj_df.columns:
-                adj_df = adj_df.copy()
-
-                # Special case: row-wise overlay adjustments.
-                # If the adjustment file has the same number of rows as the
-                # trial balance and the normalized descriptions match in order,
-                # we treat it as a 1:1 row overlay and apply the adjustment
-                # amounts by row instead of description-level aggregation.
-                try:
-                    if len(adj_df) == len(result_df):
-                        tb_keys_seq = _normalize_desc(result_df['GL Description'])
-                        adj_keys_seq = _normalize_desc(adj_df['GL Description'])
-                        if tb_keys_seq.reset_index(drop=True).equals(
-                            adj_keys_seq.reset_index(drop=True)
-                        ):
-                            result_df[adj_config['column']] = adj_df[adj_config['column']].fillna(0.0).values
-                            print(f"        {adj_config['file']}: applied row-wise matching on description")
-                            print()
-                            continue
-                except Exception:
-                    # If anything goes wrong, fall back to description-based merge
-                    pass
 
-                # Normalized description key for aggregation / fuzzy matching
-                adj_df['__desc_key'] = _normalize_desc(adj_df['GL Description'])
-                # Fuzzy map any unmatched adjustment descriptions to the closest TB description
-                try:
-                    import difflib
-                    tb_keys = set(result_df['__desc_key'].dropna().tolist())
-                    map_count = 0
-                    for i in adj_df.index:
-                        key = adj_df.at[i, '__desc_key']
-                        if key in tb_keys or key == '':
-                            continue
-                        candidates = difflib.get_close_matches(key, list(tb_keys), n=1, cutoff=0.8)
-                        if candidates:
-                            adj_df.at[i, '__desc_key'] = candidates[0]
-                            map_count += 1
-                    if map_count:
-                        print(f"        {adj_config['file']}: fuzz-mapped {map_count} description(s) to TB")
-                except Exception:
-                    pass
-
-                # Aggregate adjustments by normalized description to avoid
-                # duplicating rows when there are multiple adjustment rows
-                # for the same description.
-                agg_cols = [adj_config['column']]
-                agg_df = adj_df.groupby('__desc_key', as_index=False)[agg_cols].sum()
-
-                result_df = result_df.merge(agg_df, on='__desc_key', how='left')
-                # Unmatched reporting for descriptions
-                try:
-                    tb_desc_set = set(result_df['__desc_key'].dropna())
-                    adj_desc_set = set(adj_df['__desc_key'].dropna())
-                    unmatched = len(adj_desc_set - tb_desc_set)
-                    if unmatched:
-                        print(f"        {adj_config['file']}: {unmatched} adjustment description(s) not found in TB (after normalization)")
-                except Exception:
-                    pass
-            else:
-                print(f"        {adj_config['file']}: No usable join key; creating zero-filled column")
-                result_df[adj_config['column']] = 0.0
-                print()
-                continue
-            # Fill NaN values with 0.0 for GL Codes not in adjustment file
-            result_df[adj_config['column']] = result_df[adj_config['column']].fillna(0.0)
-        else:
-            # If file not found, create column with all zeros
-            result_df[adj_config['column']] = 0.0
-            print(f"        Created zero-filled column: {adj_config['column']}")
-        
-        print()
+    loaded_adjustments = _load_adjustments(ctx, adjustments_config, max_workers)
+    result_df = _merge_adjustments(result_df, loaded_adjustments, use_gl_code)
+    print()
     
     # Step 4: Calculate final adjusted value
     # Use the same short period label chosen in load_trial_balance
-    short_label = globals().get('_SHORT_PERIOD_LABEL', "Mar'25")
+    short_label = ctx.short_label
     print(f" Step 4: Calculating {short_label} Adjusted...")
     
     # Sum all dynamic adjustment columns
@@ -932,7 +979,7 @@ def generate_adjusted_trial_balance():
     
     # Step 7: Save output file
     print(" Step 7: Saving adjusted_trialbalance.xlsx...")
-    output_path = OUTPUT_FILES_DIR / "adjusted_trialbalance.xlsx"
+    output_path = ctx.output_dir / "adjusted_trialbalance.xlsx"
     
     try:
         # Delete existing file if it exists
@@ -954,7 +1001,7 @@ def generate_adjusted_trial_balance():
         print(f" Error saving file: {e}")
         import traceback
         traceback.print_exc()
-        return False
+        return None
     
     # Step 8: Display preview
     print(" Preview (first 10 rows):")
@@ -968,33 +1015,70 @@ def generate_adjusted_trial_balance():
     print(f"Finished: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print("=" * 80)
     
-    return True
+    return final_df
 
 
-def main():
-    """Entry point for the script"""
+def consolidate(entity: str, period: str = None, paths: dict = None,
+                max_workers: int = ADJ_LOAD_WORKERS) -> dict:
+    """Generate the adjusted trial balance for an entity in-process.
+
+    Reentrant: every run gets its own ConsolidationContext and nothing is
+    read from or written to module globals, so several entities can be
+    consolidated at once from a worker pool.
+
+    Args:
+        entity: Entity code (e.g., 'cpm', 'hausen')
+        period: Period key (e.g., 'jun_2025') or period column; defaults to the selected period
+        paths: Optional folder overrides (see ConsolidationContext)
+        max_workers: Threads used to load the entity's adjustment files
+
+    Returns:
+        Dict with success, entity, period_label, output_file, rows and columns
+    """
+    ctx = ConsolidationContext(entity, period, paths)
+    ctx.output_dir.mkdir(parents=True, exist_ok=True)
+
     try:
-        success = generate_adjusted_trial_balance()
-        return success
+        final_df = generate_adjusted_trial_balance(ctx, max_workers=max_workers)
     except Exception as e:
-        print(f" Unexpected error: {e}")
+        print(f" Unexpected error consolidating {ctx.entity}: {e}")
         import traceback
         traceback.print_exc()
-        return False
+        final_df = None
+
+    success = final_df is not None
+    return {
+        "success": success,
+        "entity": ctx.entity,
+        "period_label": ctx.short_label,
+        "output_file": str(ctx.output_dir / "adjusted_trialbalance.xlsx") if success else None,
+        "rows": len(final_df) if success else 0,
+        "columns": final_df.columns.tolist() if success else [],
+    }
 
 
-if __name__ == "__main__":
-    success = main()
-    sys.exit(0 if success else 1)
-def _derive_period_labels():
-    """Derive period labels from global period config.
+def _period_from_env():
+    """Period selected in the UI, passed to subprocesses via PERIOD_KEY / PERIOD_COLUMN"""
+    period_key = os.getenv('PERIOD_KEY', '').strip()
+    if period_key in period_config.get_available_periods():
+        return period_key
+    return os.getenv('PERIOD_COLUMN', '').strip() or None
+
+
+def main(entity: str = None):
+    """Entry point for the script (entity from argv, then ENTITY env, default 'cpm')"""
+    entity = entity or (sys.argv[1] if len(sys.argv) > 1 else os.getenv('ENTITY', 'cpm'))
+    return consolidate(entity, period=_period_from_env())["success"]
+
+
+def _derive_period_labels(period_column: str):
+    """Derive period labels from the selected period column.
 
     Returns a tuple of (tb_amount_candidates, short_label) where:
     - tb_amount_candidates: list of column-name candidates to look for in the TB
     - short_label: like "Mar'25" or "Jun'25" used for final column naming
     """
-    col = period_config.get_current_period_column(default="(Unaudited) Mar'25")
-    normalized = col.strip()
+    normalized = period_column.strip()
 
     # Extract month/year hints
     months_full = {
@@ -1039,3 +1123,8 @@ def _derive_period_labels():
         f"Closing {month_abbr}'{year_two}",
     ]
     return candidates, short_label
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,46 @@
+"""
+GL Code Normalization
+- One normalizer for joining GL codes across trial balances, mappings, adjustments,
+  upload sidecars and group consolidation; display values are left untouched
+- Slashes are kept (e.g. "3100/P0001") except for CPM Malaysia, whose codes are joined
+  with them stripped
+
+Usage:
+    from backend.utils.gl_codes import normalize_gl_code
+    df['__gl_norm'] = normalize_gl_code(df['GL Code'], entity='cpm')
+"""
+
+from typing import Optional
+
+import pandas as pd
+
+from backend.config.entities import EntityConfig
+
+
+def normalize_gl_code(series: pd.Series, keep_slash: Optional[bool] = None,
+                      entity: str = None) -> pd.Series:
+    """
+    Normalize GL codes for reliable joins
+
+    - Trim whitespace, curly apostrophes and the leading apostrophe Excel adds to text
+    - Remove trailing .0 from numeric imports (11201010.0)
+    - Drop other punctuation/whitespace, optionally keeping '/'
+    - Lowercase, and blank out nan/none/null placeholders
+
+    Args:
+        series: GL code values
+        keep_slash: Keep '/' in codes; decided from entity when None
+        entity: Entity code; slashes are kept for every entity except CPM
+
+    Returns:
+        Normalized GL codes as strings
+    """
+    if keep_slash is None:
+        keep_slash = entity is None or EntityConfig.normalize_entity_code(entity) != "cpm"
+
+    s = series.astype(str).str.strip()
+    s = s.str.replace("\u2019", "'", regex=False).str.lstrip("'")
+    s = s.str.replace(r"\.0$", "", regex=True)
+    pattern = r"[^0-9A-Za-z/]" if keep_slash else r"[^0-9A-Za-z]"
+    s = s.str.replace(pattern, "", regex=True).str.lower()
+    return s.where(~s.isin(['nan', 'none', 'null']), '')
@@ -2,35 +2,70 @@
 SAP Connect - Main Entry Point
 ================================
 This script uses the modular sap_connect package
+
+Usage:
+    python backend/utils/run_sap_connect.py                 # test all connections
+    python backend/utils/run_sap_connect.py extract [IDs]   # extract TB, P&L, BS
 """
 
 import sys
 from pathlib import Path
 
-# Add src to path
-sys.path.insert(0, str(Path(__file__).parent / "src"))
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.sap_connect.extraction_runner import MultiEntityRunner
+from backend.sap_connect.ledger_store import LedgerStore
+
+
+def print_connection_results(results):
+    """Print a connectivity summary table"""
+    print(f"\n{'Entity':<20} {'Type':<6} {'Time':>8}  Status")
+    print("-" * 60)
+    for result in results:
+        response_time = f"{result['response_time']:.2f}s" if result['response_time'] else "-"
+        print(f"{result['entity_id']:<20} {result['connection_type']:<6} {response_time:>8}  "
+              f"{result['status']} {result['message'][:60]}")
+
+
+def print_extraction_report(report):
+    """Print a merged extraction report"""
+    print(f"\nPeriod: {report['period']['start_date']} to {report['period']['end_date']}")
+    for entity in report['entities']:
+        symbol = "✓" if entity['success'] else "✗"
+        print(f"\n{symbol} {entity['entity_id']} ({entity['status']}, {entity['elapsed']:.1f}s)")
+        if entity['error']:
+            print(f"    {entity['error']}")
+        for name, result in entity['reports'].items():
+            if result['success']:
+                print(f"    {name}: {result['rows']} rows in {result['elapsed']:.1f}s")
+            else:
+                print(f"    {name}: FAILED - {result['error'][:80]}")
+
+    print(f"\n✓ {report['entities_succeeded']}/{report['entities_total']} entities extracted "
+          f"in {report['total_elapsed']:.1f}s")
 
-from src.sap_connect.config_manager import Config
-from src.sap_connect.connectivity_manager import ConnectivityManager
-from src.sap_connect.data_extractor import DataExtractor
-from src.sap_connect.sap_client import SAPClient
 
 def main():
     """Main execution function"""
     print("="*60)
     print("SAP CONNECT - Data Extraction Tool")
     print("="*60)
-    
-    # Load configuration
-    config = Config()
-    print("\n✓ Configuration loaded from config/sap_connect/config.json")
-    
-    # Initialize connectivity manager
-    conn_mgr = ConnectivityManager()
-    print(f"✓ Loaded {len(conn_mgr.get_all_entities())} entities")
-    
-    # You can add your data extraction logic here
-    print("\n✓ SAP Connect module is ready to use!")
+
+    runner = MultiEntityRunner(ledger_store=LedgerStore())
+    print(f"✓ Loaded {len(runner.conn_mgr.get_all_entities())} entities")
+
+    args = sys.argv[1:]
+
+    if args and args[0] == "extract":
+        output_dir = project_root / "data" / "sap_extracts"
+        report = runner.run_extractions(entity_ids=args[1:] or None, output_dir=str(output_dir))
+        print_extraction_report(report)
+        print(f"✓ Files saved to {output_dir}")
+    else:
+        print_connection_results(runner.test_connections())
+
     print("="*60)
 
 if __name__ == "__main__":
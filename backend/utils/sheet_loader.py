@@ -0,0 +1,190 @@
+"""
+Sheet Loader
+- Reads a worksheet's raw grid once (header=None, through the workbook cache) and applies
+  header rows in memory, so header detection never re-opens the workbook
+- frame_from_grid(grid, n) gives the same frame as pd.read_excel(path, header=n):
+  frame_from_rows applies read_excel's column naming, NA strings and numeric/boolean
+  text conversion with public pandas APIs only
+- The detected layout (header row) is remembered per file fingerprint and detector, so
+  later loads of an unchanged file skip detection entirely
+
+Usage:
+    from backend.utils.sheet_loader import load_sheet
+    df, header_row = load_sheet(path)
+"""
+
+import threading
+from collections import defaultdict
+from typing import Any, Callable, Collection, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from backend.utils.workbook_cache import file_fingerprint, read_excel_cached
+
+HEADER_SNIFF_ROWS = 10
+
+# Cell text read_excel treats as missing (pandas' documented default na_values)
+NA_STRINGS = frozenset({
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND',
+    '1.#QNAN', '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null',
+})
+BOOL_STRINGS = {'True': True, 'TRUE': True, 'true': True,
+                'False': False, 'FALSE': False, 'false': False}
+
+# (resolved path, mtime_ns, size, detector name) -> header row
+_layouts: Dict[tuple, int] = {}
+_layouts_lock = threading.Lock()
+
+
+def read_grid(path) -> pd.DataFrame:
+    """
+    Read the first worksheet as a raw grid (no header applied)
+
+    Cells are kept as text-level values (blanks as '', no NA conversion) so that
+    frame_from_grid can apply pandas' own NA and dtype handling per header row.
+    """
+    return read_excel_cached(path, header=None, keep_default_na=False)
+
+
+def column_names(values: Sequence[Any]) -> List[Any]:
+    """
+    Header cells as pd.read_excel names columns
+
+    Blank cells become "Unnamed: <position>" and repeated names get ".1", ".2" suffixes
+    (given names first, then the unnamed ones); other values (numbers, dates) are kept
+    as they are.
+    """
+    names: List[Any] = []
+    unnamed: List[int] = []
+    for i, value in enumerate(values):
+        if value is None or (isinstance(value, float) and np.isnan(value)) or value == '':
+            names.append(f"Unnamed: {i}")
+            unnamed.append(i)
+        else:
+            names.append(value)
+
+    counts: Dict[Any, int] = defaultdict(int)
+    for i in [i for i in range(len(names)) if i not in unnamed] + unnamed:
+        name = original = names[i]
+        count = counts[name]
+        while count > 0:
+            counts[original] = count + 1
+            name = f"{original}.{count}"
+            count = count + 1 if name in names else counts[name]
+        names[i] = name
+        counts[name] = count + 1
+    return names
+
+
+def _convert_column(values: pd.Series, infer: bool = True) -> pd.Series:
+    """
+    NA strings to NaN, then numeric or boolean text to numbers/bools if the whole column is
+    (only when infer is set; otherwise text cells stay text)
+    """
+    is_na = values.map(lambda v: v is None or (isinstance(v, str) and v in NA_STRINGS))
+    values = values.mask(is_na, np.nan)
+    present = values[~is_na]
+    if values.empty:
+        return values
+    if present.empty:
+        return values.astype(float)
+    if infer and present.map(lambda v: isinstance(v, (str, int, float)) and not isinstance(v, bool)).all():
+        try:
+            return pd.to_numeric(values)
+        except (ValueError, TypeError):
+            pass
+    if infer and not is_na.any() and present.map(lambda v: isinstance(v, bool) or v in BOOL_STRINGS).all():
+        return present.map(lambda v: BOOL_STRINGS.get(v, v)).astype(bool)
+    # Rebuilt from a list so pandas infers the dtype (text, datetime, ...) as read_excel does
+    return pd.Series(values.tolist(), index=values.index)
+
+
+def frame_from_rows(rows: Sequence[Sequence[Any]], columns: Sequence[Any],
+                    text_columns: Collection[Any] = ()) -> pd.DataFrame:
+    """
+    Build a frame from worksheet cells as pd.read_excel would
+
+    Args:
+        rows: Data rows, cells as openpyxl returns them ('' or None for blanks)
+        columns: Column names (see column_names); shorter rows are padded with blanks
+        text_columns: Column names whose text cells are never converted to numbers/bools
+
+    Returns:
+        DataFrame with NA strings as NaN and all-numeric (or all-boolean) text columns converted
+    """
+    width = len(columns)
+    data = {
+        i: _convert_column(pd.Series([row[i] if i < len(row) else None for row in rows], dtype=object),
+                           infer=columns[i] not in text_columns)
+        for i in range(width)
+    }
+    frame = pd.DataFrame(data, index=pd.RangeIndex(len(rows)))
+    frame.columns = list(columns)
+    return frame
+
+
+def frame_from_grid(grid: pd.DataFrame, header_row: int) -> pd.DataFrame:
+    """
+    Apply a header row to a raw grid in memory
+
+    Args:
+        grid: Sheet read with header=None
+        header_row: Row to use as column names (rows above it are dropped)
+
+    Returns:
+        DataFrame equivalent to pd.read_excel(path, header=header_row)
+    """
+    if header_row >= len(grid):
+        raise ValueError(f"Header row {header_row} is past the end of the sheet ({len(grid)} rows)")
+
+    rows = grid.iloc[header_row:].astype(object).values.tolist()
+    return frame_from_rows(rows[1:], column_names(rows[0]))
+
+
+def detect_header_row(grid: pd.DataFrame) -> int:
+    """
+    Find the header row of a sheet with preface rows
+
+    Args:
+        grid: Sheet read with header=None (only the first rows are inspected)
+
+    Returns:
+        Index of the first row mentioning a GL code/number/account, else 0
+    """
+    for r in range(min(HEADER_SNIFF_ROWS, len(grid))):
+        row_text = " ".join(str(v).strip().lower() for v in grid.iloc[r].values)
+        if 'gl' in row_text and ('code' in row_text or 'number' in row_text or 'account' in row_text):
+            return r
+    return 0
+
+
+def get_layout(path, detector: str) -> Optional[int]:
+    """Header row recorded for the current version of a file, if any"""
+    with _layouts_lock:
+        return _layouts.get((*file_fingerprint(path), detector))
+
+
+def remember_layout(path, detector: str, header_row: int) -> None:
+    """Record the header row detected for the current version of a file"""
+    with _layouts_lock:
+        _layouts[(*file_fingerprint(path), detector)] = header_row
+
+
+def load_sheet(path, detect: Callable[[pd.DataFrame], int] = detect_header_row) -> Tuple[pd.DataFrame, int]:
+    """
+    Read a sheet once and apply its detected header row
+
+    Args:
+        path: Workbook path
+        detect: Function mapping the raw grid to a header row
+
+    Returns:
+        (DataFrame with the header applied, header row)
+    """
+    grid = read_grid(path)
+    header_row = get_layout(path, detect.__name__)
+    if header_row is None:
+        header_row = detect(grid)
+        remember_layout(path, detect.__name__, header_row)
+    return frame_from_grid(grid, header_row), header_row
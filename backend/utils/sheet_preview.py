@@ -0,0 +1,279 @@
+"""
+Sheet Preview
+- Pages through the first worksheet of a workbook (offset/limit, optional column subset)
+  without parsing the rest of it: .xlsx/.xlsm sheets are streamed with openpyxl read_only,
+  so a page costs offset + limit rows
+- Opening a workbook parses its shared-strings table, so the last PREVIEW_OPEN_WORKBOOKS
+  read-only workbooks stay open (per file fingerprint) for the next page; FileService
+  releases a file's workbook before deleting or overwriting it
+- Row counts come from the sheet's stored dimension (constant time); sheets saved without
+  a usable one are counted by streaming once and the count is remembered per file
+  fingerprint. Trailing formatted blank rows are only dropped from the count once the
+  last page is read
+- A sheet already parsed into the workbook cache is sliced from memory instead. Pages
+  past PREVIEW_STREAM_MAX_OFFSET and formats openpyxl can't stream (.xls, .xlsb) parse
+  the sheet into the workbook cache once, so paging on through it stays cheap
+- Values and column names match pd.read_excel(path): header and page rows go through
+  sheet_loader's column_names/frame_from_rows (NA strings, numeric text, "Unnamed: n"
+  and ".1" suffixes); types are inferred per page when streamed, except that text in the
+  GL code column is never converted to numbers
+
+Usage:
+    from backend.utils.sheet_preview import preview_sheet
+    page = preview_sheet(path, offset=100, limit=50, columns=["GL Code", "Amount"])
+"""
+
+import math
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+from openpyxl import load_workbook
+
+from backend.utils.sheet_loader import column_names, frame_from_rows
+from backend.utils.upload_sidecar import find_gl_code_column
+from backend.utils.workbook_cache import file_fingerprint, read_excel_cached, workbook_cache
+
+PREVIEW_MAX_ROWS = 1000
+# Deeper pages parse the whole sheet once (streaming re-reads every skipped row per page)
+PREVIEW_STREAM_MAX_OFFSET = 2000
+EXCEL_MAX_ROWS = 1048576
+EXCEL_MAX_COLUMNS = 16384
+STREAMABLE_SUFFIXES = {'.xlsx', '.xlsm'}
+PREVIEW_OPEN_WORKBOOKS = int(os.getenv("PREVIEW_OPEN_WORKBOOKS", "8"))
+
+
+class _KeptWorkbook:
+    """Open read-only workbook; the lock serializes readers and closing"""
+
+    def __init__(self, workbook):
+        self.workbook = workbook
+        self.lock = threading.Lock()
+        self.closed = False
+
+    def close(self) -> None:
+        with self.lock:
+            self.closed = True
+            self.workbook.close()
+
+
+# (resolved path, mtime_ns, size) -> kept workbook
+_workbooks: "OrderedDict[Tuple[str, int, int], _KeptWorkbook]" = OrderedDict()
+_workbooks_lock = threading.Lock()
+
+# (resolved path, mtime_ns, size) -> data row count, for sheets without a stored dimension
+_row_counts: Dict[Tuple[str, int, int], int] = {}
+_row_counts_lock = threading.Lock()
+
+
+def _open_workbook(path: Path) -> _KeptWorkbook:
+    """Read-only workbook for path, reused while the file is unchanged"""
+    key = file_fingerprint(path)
+    with _workbooks_lock:
+        kept = _workbooks.get(key)
+        if kept is not None:
+            _workbooks.move_to_end(key)
+            return kept
+
+    opened = _KeptWorkbook(load_workbook(path, read_only=True, data_only=True))
+    evicted = []
+    with _workbooks_lock:
+        kept = _workbooks.get(key)
+        if kept is not None:
+            # Opened by another request meanwhile
+            evicted.append(opened)
+        else:
+            kept = opened
+            evicted += [_workbooks.pop(k) for k in list(_workbooks) if k[0] == key[0]]
+            _workbooks[key] = kept
+            while len(_workbooks) > max(PREVIEW_OPEN_WORKBOOKS, 1):
+                evicted.append(_workbooks.popitem(last=False)[1])
+    for stale in evicted:
+        stale.close()
+    return kept
+
+
+def release_workbook(path) -> None:
+    """Close the kept workbooks of a file and forget its row counts (before deleting or overwriting it)"""
+    resolved = str(Path(path).resolve())
+    with _workbooks_lock:
+        kept = [_workbooks.pop(k) for k in list(_workbooks) if k[0] == resolved]
+    with _row_counts_lock:
+        for key in [k for k in _row_counts if k[0] == resolved]:
+            del _row_counts[key]
+    for workbook in kept:
+        workbook.close()
+
+
+def close_workbooks() -> None:
+    """Close every kept workbook (on shutdown)"""
+    with _workbooks_lock:
+        kept = list(_workbooks.values())
+        _workbooks.clear()
+    for workbook in kept:
+        workbook.close()
+
+
+def _json_safe(value: Any) -> Any:
+    """NaN/inf and pandas NA to None"""
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    if pd.api.types.is_scalar(value) and pd.isna(value):
+        return None
+    return value
+
+
+def _select(all_columns: List[str], columns: Optional[Sequence[str]]) -> List[int]:
+    """
+    Positions of the requested columns
+
+    Raises:
+        ValueError: If a requested column doesn't exist
+    """
+    if not columns:
+        return list(range(len(all_columns)))
+    positions = {name: i for i, name in enumerate(all_columns)}
+    missing = [c for c in columns if c not in positions]
+    if missing:
+        raise ValueError(f"Unknown column(s): {', '.join(missing)}")
+    return [positions[c] for c in columns]
+
+
+def _count_rows(path: Path, worksheet) -> int:
+    """Data rows of a streamed sheet (header excluded)"""
+    # Some writers store "A1" for any sheet, and whole-column formatting stretches the
+    # dimension to the last Excel row; neither is a row count
+    if worksheet.max_row is not None and 1 < worksheet.max_row < EXCEL_MAX_ROWS:
+        return worksheet.max_row - 1
+
+    key = file_fingerprint(path)
+    with _row_counts_lock:
+        if key in _row_counts:
+            return _row_counts[key]
+
+    # No usable dimension: count once by streaming, trailing blank rows excluded like pandas
+    last = 0
+    for idx, row in enumerate(worksheet.iter_rows(values_only=True), start=1):
+        if any(v is not None for v in row):
+            last = idx
+    count = max(last - 1, 0)
+    with _row_counts_lock:
+        _row_counts[key] = count
+    return count
+
+
+def _page_from_frame(df: pd.DataFrame, offset: int, limit: int,
+                     columns: Optional[Sequence[str]]) -> Dict[str, Any]:
+    """Slice a parsed sheet; only the page is cleaned for JSON"""
+    all_columns = [str(col) if pd.notna(col) else f"Column_{i}" for i, col in enumerate(df.columns)]
+    positions = _select(all_columns, columns)
+    page = df.iloc[offset:offset + limit, positions]
+    rows = [[_json_safe(v) for v in row] for row in page.itertuples(index=False, name=None)]
+    return {
+        'all_columns': all_columns,
+        'columns': [all_columns[i] for i in positions],
+        'total_rows': len(df),
+        'rows': rows,
+        'numeric_columns': [all_columns[i] for i in positions
+                            if pd.api.types.is_numeric_dtype(df.dtypes.iloc[i])
+                            and not pd.api.types.is_bool_dtype(df.dtypes.iloc[i])],
+        'source': 'cache',
+    }
+
+
+def _excel_cell(value: Any) -> Any:
+    """Cell value as pandas' openpyxl reader passes it on ('' for blanks, whole floats as int)"""
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def _page_from_stream(path: Path, offset: int, limit: int,
+                      columns: Optional[Sequence[str]]) -> Dict[str, Any]:
+    """Stream the header row and one page of rows with openpyxl read_only"""
+    while True:
+        kept = _open_workbook(path)
+        with kept.lock:
+            if not kept.closed:
+                break
+        # Evicted by another request between lookup and lock; open it again
+
+    with kept.lock:
+        worksheet = kept.workbook.worksheets[0]
+        header = list(next(worksheet.iter_rows(min_row=1, max_row=1, values_only=True), ()))
+        while header and header[-1] is None:
+            header.pop()
+        # pandas sizes the frame by its widest row, not the header, so use the sheet width
+        width = worksheet.max_column
+        if not width or width >= EXCEL_MAX_COLUMNS:
+            width = len(header)
+        all_columns = [str(name) for name in column_names(header + [None] * (width - len(header)))]
+        _select(all_columns, columns)  # Fail on unknown columns before reading rows
+
+        total_rows = _count_rows(path, worksheet)
+        cells: List[List[Any]] = []
+        last_row = min(offset + limit, total_rows) + 1
+        if all_columns and offset + 2 <= last_row:
+            for row in worksheet.iter_rows(min_row=offset + 2, max_row=last_row,
+                                           max_col=len(all_columns), values_only=True):
+                row = list(row) + [None] * (len(all_columns) - len(row))
+                cells.append([_excel_cell(v) for v in row])
+
+    # pandas drops trailing blank rows; a stored dimension can include formatted ones
+    if offset + len(cells) == total_rows:
+        while cells and all(v == "" for v in cells[-1]):
+            cells.pop()
+        total_rows = offset + len(cells)
+
+    # Same NA and numeric-text handling as pd.read_excel, so a streamed page shows the
+    # values a parsed sheet would. Types are only seen per page, so GL codes stored as
+    # text stay text (a page of all-digit codes would otherwise turn into integers)
+    gl_column = find_gl_code_column(pd.DataFrame(columns=all_columns))
+    frame = frame_from_rows(cells, all_columns, text_columns=[gl_column] if gl_column else ())
+    page = _page_from_frame(frame, 0, len(frame), columns)
+    page.update({'total_rows': total_rows, 'source': 'stream'})
+    return page
+
+
+def preview_sheet(path, offset: int = 0, limit: int = 50,
+                  columns: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+    """
+    Read one page of the first worksheet
+
+    Args:
+        path: Workbook path
+        offset: Data rows to skip (after the header row)
+        limit: Rows to return (capped at PREVIEW_MAX_ROWS)
+        columns: Column names to return, in this order (all columns by default)
+
+    Returns:
+        Dict with columns (returned), all_columns, total_rows, offset, limit,
+        rows (list of lists), has_more, numeric_columns (judged on the page when
+        streamed) and source ("cache" or "stream")
+
+    Raises:
+        ValueError: If a requested column doesn't exist
+    """
+    path = Path(path)
+    offset = max(int(offset), 0)
+    limit = min(max(int(limit), 0), PREVIEW_MAX_ROWS)
+
+    cached = workbook_cache.peek(path)
+    if cached is not None:
+        page = _page_from_frame(cached, offset, limit, columns)
+    elif path.suffix.lower() in STREAMABLE_SUFFIXES and offset <= PREVIEW_STREAM_MAX_OFFSET:
+        page = _page_from_stream(path, offset, limit, columns)
+    else:
+        page = _page_from_frame(read_excel_cached(path), offset, limit, columns)
+
+    page.update({
+        'offset': offset,
+        'limit': limit,
+        'has_more': offset + len(page['rows']) < page['total_rows'],
+    })
+    return page
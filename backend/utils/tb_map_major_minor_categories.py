@@ -32,16 +32,8 @@ if str(project_root) not in sys.path:
     sys.path.insert(0, str(project_root))
 
 from backend.utils.entity_paths import get_entity_paths
-
-
-def _normalize_gl_code(series: pd.Series, keep_slash: bool = True) -> pd.Series:
-    """Normalize GL codes consistently for merging without altering display values."""
-    s = series.astype(str)
-    s = s.str.replace("\u2019", "'", regex=False).str.strip()
-    s = s.str.replace(r"\.0$", "", regex=True)
-    pattern = r"[^0-9A-Za-z/]" if keep_slash else r"[^0-9A-Za-z]"
-    s = s.str.replace(pattern, "", regex=True).str.lower()
-    return s.where(~s.isin(['nan', 'none', 'null']), '')
+from backend.utils.gl_codes import normalize_gl_code
+from backend.utils.workbook_cache import read_excel_cached
 
 
 def _normalize_desc(series: pd.Series) -> pd.Series:
@@ -88,12 +80,12 @@ def map_categories(entity: str = "cpm"):
         print(f"📂 Processing entity: {entity.upper()}")
         print("📂 Reading adjusted trial balance...")
         # Read the adjusted trial balance
-        df_adjusted_tb = pd.read_excel(source_file)
+        df_adjusted_tb = read_excel_cached(source_file)
         print(f"✓ Loaded {len(df_adjusted_tb)} records from adjusted trial balance")
         
         print("📂 Reading GL code mapping reference...")
         # Read the reference mapping file
-        df_mapping = pd.read_excel(reference_file)
+        df_mapping = read_excel_cached(reference_file)
         print(f"✓ Loaded {len(df_mapping)} records from mapping reference")
         
         # Clean column names (remove trailing spaces)
@@ -128,8 +120,8 @@ def map_categories(entity: str = "cpm"):
         
         df_mapping_subset = df_mapping_code[mapping_columns].copy()
         df_mapping_subset = df_mapping_subset.rename(columns={'GL Code': '_mapping_gl_code'})
-        df_mapping_subset['__gl_norm'] = _normalize_gl_code(df_mapping_subset['_mapping_gl_code'], keep_slash=True)
-        df_mapping_subset['__gl_norm_noslash'] = _normalize_gl_code(df_mapping_subset['_mapping_gl_code'], keep_slash=False)
+        df_mapping_subset['__gl_norm'] = normalize_gl_code(df_mapping_subset['_mapping_gl_code'], keep_slash=True)
+        df_mapping_subset['__gl_norm_noslash'] = normalize_gl_code(df_mapping_subset['_mapping_gl_code'], keep_slash=False)
         df_mapping_subset = df_mapping_subset.drop_duplicates(subset=['__gl_norm'], keep='first')
         # Prepare description-based mapping subset if available (use all mapping rows, including blank GL Codes)
         mapping_desc = None
@@ -139,8 +131,8 @@ def map_categories(entity: str = "cpm"):
             mapping_desc = mapping_desc.drop_duplicates(subset=['__desc_norm'], keep='first')
 
         # Add normalized keys to adjusted TB for a stable join without altering displayed GL Codes
-        df_adjusted_tb['__gl_norm'] = _normalize_gl_code(df_adjusted_tb['GL Code'], keep_slash=True)
-        df_adjusted_tb['__gl_norm_noslash'] = _normalize_gl_code(df_adjusted_tb['GL Code'], keep_slash=False)
+        df_adjusted_tb['__gl_norm'] = normalize_gl_code(df_adjusted_tb['GL Code'], keep_slash=True)
+        df_adjusted_tb['__gl_norm_noslash'] = normalize_gl_code(df_adjusted_tb['GL Code'], keep_slash=False)
         
         # Primary merge on exact slash-preserving key
         df_final = pd.merge(
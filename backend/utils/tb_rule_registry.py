@@ -0,0 +1,449 @@
+"""
+Trial Balance Rule Registry
+- Declarative registry of trial balance validation rules
+- Rules are picked from validation_rules_config.json and evaluated over shared
+  derived columns (GL prefix, computed balance, masks) that are built once per TB
+- Entities can add custom row rules in the config without writing Python
+
+Custom rule example (validation_rules_config.json):
+    "rule_7": {
+        "enabled": true,
+        "rule_number": 7,
+        "rule_name": "No Balances on Suspense Accounts",
+        "violation_expression": "Prefix == '9' and Abs_Balance > @abs_tolerance",
+        "violation_columns": ["GL_Code", "Description", "Balance"],
+        "severity": "warning"
+    }
+
+The expression is evaluated with DataFrame.eval over the TB columns plus the
+derived columns in DERIVED_COLUMNS; rows where it is True are violations.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Tuple
+
+import pandas as pd
+
+# Currency symbol for reporting
+CURRENCY_SYMBOL = "₹"
+
+# Account type by first digit of the GL code
+ACCOUNT_TYPE_PREFIXES = {
+    '1': "Asset",
+    '2': "Liability",
+    '3': "Revenue",
+    '4': "Expense",
+    '5': "Equity",
+}
+
+# Expected balance sign by first digit of the GL code (+1 positive, -1 negative)
+EXPECTED_BALANCE_SIGNS = {
+    '1': 1,   # Assets
+    '2': -1,  # Liabilities
+    '3': -1,  # Revenue
+    '4': 1,   # Expenses
+    '5': -1,  # Equity
+}
+
+
+# ========== Derived Columns ==========
+
+def _gl_str(ctx):
+    return ctx.df["GL_Code"].astype(str)
+
+
+def _prefix(ctx):
+    return ctx.column("GL_Str").str[:1]
+
+
+def _account_type(ctx):
+    gl_codes = ctx.df["GL_Code"]
+    first_digits = gl_codes.astype(str).str.strip().str[:1].where(gl_codes.notna())
+    return first_digits.map(ACCOUNT_TYPE_PREFIXES).fillna("Unknown")
+
+
+def _expected_sign(ctx):
+    return ctx.column("Prefix").map(EXPECTED_BALANCE_SIGNS).fillna(0)
+
+
+def _computed_balance(ctx):
+    return ctx.df["Debit"] - ctx.df["Credit"]
+
+
+def _balance_diff(ctx):
+    return (ctx.df["Balance"] - ctx.column("Computed_Balance")).abs()
+
+
+def _abs_balance(ctx):
+    return ctx.df["Balance"].abs()
+
+
+def _missing(ctx):
+    return ctx.df[['GL_Code', 'Description', 'Debit', 'Credit', 'Balance']].isnull().any(axis=1)
+
+
+def _invalid_amount(ctx):
+    mask = pd.Series(False, index=ctx.df.index)
+    for col in ['Debit', 'Credit', 'Balance']:
+        values = ctx.df[col]
+        if not pd.api.types.is_numeric_dtype(values) or pd.api.types.is_complex_dtype(values):
+            mask |= values.notna() & pd.to_numeric(values, errors='coerce').isna()
+    return mask
+
+
+def _duplicate(ctx):
+    return ctx.df.duplicated(subset=["GL_Code"], keep=False)
+
+
+# Name -> builder; builders may depend on other derived columns via ctx.column
+DERIVED_COLUMNS: Dict[str, Callable] = {
+    "GL_Str": _gl_str,
+    "Prefix": _prefix,
+    "Account_Type": _account_type,
+    "Expected_Sign": _expected_sign,
+    "Computed_Balance": _computed_balance,
+    "Balance_Diff": _balance_diff,
+    "Abs_Balance": _abs_balance,
+    "Missing": _missing,
+    "Invalid_Amount": _invalid_amount,
+    "Duplicate": _duplicate,
+}
+
+
+class RuleContext:
+    """Trial balance plus derived columns shared by every rule in a run"""
+
+    def __init__(self, df: pd.DataFrame, tolerance_pct: float, abs_tolerance: float):
+        """
+        Initialize the context
+
+        Args:
+            df: Loaded trial balance (GL_Code, Description, Debit, Credit, Balance)
+            tolerance_pct: Percentage tolerance as a decimal fraction
+            abs_tolerance: Absolute tolerance for row-level checks
+        """
+        self.df = df
+        self.tolerance_pct = tolerance_pct
+        self.abs_tolerance = abs_tolerance
+        self._columns: Dict[str, pd.Series] = {}
+
+    def column(self, name: str) -> pd.Series:
+        """Get a derived column, building it on first use"""
+        if name not in self._columns:
+            self._columns[name] = DERIVED_COLUMNS[name](self)
+        return self._columns[name]
+
+    def prepare(self, names: Iterable[str]) -> None:
+        """Build all derived columns needed by a set of rules in one pass"""
+        for name in names:
+            self.column(name)
+
+    def eval_mask(self, expression: str) -> pd.Series:
+        """Evaluate a boolean row expression over TB and derived columns"""
+        result = self.df.eval(
+            expression,
+            engine='python',
+            resolvers=(self._columns,),
+            local_dict={'abs_tolerance': self.abs_tolerance, 'tolerance_pct': self.tolerance_pct},
+        )
+        return pd.Series(result, index=self.df.index).fillna(False).astype(bool)
+
+
+class RegisteredRule:
+    """A validation rule: its key, the derived columns it needs and its evaluator"""
+
+    def __init__(self, key: str, rule_number: int, rule_name: str,
+                 evaluate: Callable, requires: Tuple[str, ...] = ()):
+        self.key = key
+        self.rule_number = rule_number
+        self.rule_name = rule_name
+        self.evaluate = evaluate
+        self.requires = requires
+
+
+# Built-in rules by config key
+RULE_REGISTRY: Dict[str, RegisteredRule] = {}
+
+
+def register_rule(key: str, rule_number: int, rule_name: str, requires: Tuple[str, ...] = ()):
+    """
+    Decorator registering a rule evaluator
+
+    The evaluator takes (ctx, rule_config) and returns (result dict, violations DataFrame or None).
+    """
+    def decorator(func):
+        RULE_REGISTRY[key] = RegisteredRule(key, rule_number, rule_name, func, requires)
+        return func
+    return decorator
+
+
+def _status(is_compliant: bool) -> str:
+    return "✓ PASS" if is_compliant else "✗ FAIL"
+
+
+# ========== Built-in Rules ==========
+
+@register_rule("rule_1", 1, "Total Debits Equal Total Credits")
+def rule_1_total_debits_equal_credits(ctx: RuleContext, rule_config: dict):
+    total_debits = ctx.df["Debit"].sum()
+    total_credits = ctx.df["Credit"].sum()
+    difference = total_debits - total_credits
+
+    # Percentage-based allowed variance based on total debits (if available)
+    allowed_variance = abs(total_debits) * ctx.tolerance_pct if abs(total_debits) > 0 else ctx.abs_tolerance
+    is_balanced = abs(difference) <= allowed_variance
+
+    return {
+        "rule_number": 1,
+        "rule_name": "Total Debits Equal Total Credits",
+        "status": _status(is_balanced),
+        "total_debits": total_debits,
+        "total_credits": total_credits,
+        "difference": difference,
+        "tolerance_pct": ctx.tolerance_pct,
+        "allowed_variance": allowed_variance,
+        "is_compliant": is_balanced,
+        "details": f"Debits: {CURRENCY_SYMBOL}{total_debits:,.2f}, Credits: {CURRENCY_SYMBOL}{total_credits:,.2f}, Difference: {CURRENCY_SYMBOL}{difference:,.2f}"
+    }, None
+
+
+@register_rule("rule_2", 2, "Balance Calculation Accuracy", requires=("Computed_Balance", "Balance_Diff"))
+def rule_2_balance_calculation_accuracy(ctx: RuleContext, rule_config: dict):
+    mask = ctx.column("Balance_Diff") > ctx.abs_tolerance
+    violations_count = int(mask.sum())
+
+    violations = None
+    if violations_count:
+        violations = ctx.df.loc[mask, ["GL_Code", "Description", "Debit", "Credit", "Balance"]].assign(
+            Computed_Balance=ctx.column("Computed_Balance")[mask],
+            Balance_Diff=ctx.column("Balance_Diff")[mask],
+        )
+
+    return {
+        "rule_number": 2,
+        "rule_name": "Balance Calculation Accuracy",
+        "status": _status(violations_count == 0),
+        "total_records": len(ctx.df),
+        "violations_count": violations_count,
+        "is_compliant": violations_count == 0,
+        "details": f"Found {violations_count} records with incorrect balance calculations"
+    }, violations
+
+
+@register_rule("rule_3", 3, "No Duplicate Accounts", requires=("Duplicate",))
+def rule_3_no_duplicate_accounts(ctx: RuleContext, rule_config: dict):
+    duplicates = ctx.df.loc[ctx.column("Duplicate"), ["GL_Code", "Description", "Balance"]]
+    duplicates = duplicates.sort_values("GL_Code")
+    duplicate_codes = duplicates["GL_Code"].unique()
+    is_compliant = len(duplicate_codes) == 0
+
+    return {
+        "rule_number": 3,
+        "rule_name": "No Duplicate Accounts",
+        "status": _status(is_compliant),
+        "total_records": len(ctx.df),
+        "duplicate_gl_codes": len(duplicate_codes),
+        "total_duplicate_records": len(duplicates),
+        "is_compliant": is_compliant,
+        "details": f"Found {len(duplicate_codes)} GL codes with duplicates ({len(duplicates)} total records)"
+    }, duplicates if len(duplicates) else None
+
+
+@register_rule("rule_4", 4, "No Missing or Invalid Data", requires=("Missing", "Invalid_Amount"))
+def rule_4_no_missing_invalid_data(ctx: RuleContext, rule_config: dict):
+    mask = ctx.column("Missing") | ctx.column("Invalid_Amount")
+    issues = ctx.df.loc[mask, ["GL_Code", "Description", "Debit", "Credit", "Balance"]]
+
+    return {
+        "rule_number": 4,
+        "rule_name": "No Missing or Invalid Data",
+        "status": _status(len(issues) == 0),
+        "total_records": len(ctx.df),
+        "issues_count": len(issues),
+        "is_compliant": len(issues) == 0,
+        "details": f"Found {len(issues)} records with missing or invalid data"
+    }, issues if len(issues) else None
+
+
+@register_rule("rule_5", 5, "Logical Balance Signs by Account Type",
+               requires=("GL_Str", "Prefix", "Expected_Sign", "Account_Type", "Abs_Balance"))
+def rule_5_logical_balance_signs(ctx: RuleContext, rule_config: dict):
+    expected_sign = ctx.column("Expected_Sign")
+    balance = ctx.df["Balance"]
+
+    # Opposite sign to the account type, ignoring zero or near-zero balances
+    wrong_sign = ((expected_sign > 0) & (balance < 0)) | ((expected_sign < 0) & (balance > 0))
+    mask = wrong_sign & (ctx.column("Abs_Balance") > ctx.abs_tolerance)
+    violations_count = int(mask.sum())
+
+    violations = None
+    if violations_count:
+        violations = ctx.df.loc[mask, ["GL_Code", "Description"]].assign(
+            Account_Type=ctx.column("Account_Type")[mask],
+            Balance=balance[mask],
+        )
+
+    return {
+        "rule_number": 5,
+        "rule_name": "Logical Balance Signs by Account Type",
+        "status": _status(violations_count == 0),
+        "total_records": len(ctx.df),
+        "violations_count": violations_count,
+        "is_compliant": violations_count == 0,
+        "details": f"Found {violations_count} accounts with unexpected balance signs"
+    }, violations
+
+
+@register_rule("rule_6", 6, "Accounting Equation Validation", requires=("GL_Str", "Prefix"))
+def rule_6_accounting_equation(ctx: RuleContext, rule_config: dict):
+    # Sums by account type in one grouped pass over the GL code prefix
+    prefix_totals = ctx.df["Balance"].groupby(ctx.column("Prefix")).sum()
+    assets = prefix_totals.get('1', 0.0)
+    liabilities = prefix_totals.get('2', 0.0)
+    equity = prefix_totals.get('5', 0.0)
+    revenue = prefix_totals.get('3', 0.0)
+    expenses = prefix_totals.get('4', 0.0)
+
+    # Assets = -(Liabilities + Equity + Revenue + Expenses), within a tolerance of the asset base
+    rhs = -(liabilities + equity + revenue + expenses)
+    difference = abs(assets - rhs)
+    equation_tolerance = abs(assets) * ctx.tolerance_pct if abs(assets) > 0 else ctx.abs_tolerance
+    equation_balanced = difference <= equation_tolerance
+    assets_positive = assets > 0
+    is_compliant = equation_balanced and assets_positive
+
+    return {
+        "rule_number": 6,
+        "rule_name": "Accounting Equation Validation",
+        "status": _status(is_compliant),
+        "assets": assets,
+        "liabilities": liabilities,
+        "equity": equity,
+        "revenue": revenue,
+        "expenses": expenses,
+        "rhs": rhs,
+        "difference": difference,
+        "equation_tolerance": equation_tolerance,
+        "equation_balanced": equation_balanced,
+        "assets_positive": assets_positive,
+        "is_compliant": is_compliant,
+        "details": f"Assets: {CURRENCY_SYMBOL}{assets:,.2f}, RHS: {CURRENCY_SYMBOL}{rhs:,.2f}, Diff: {CURRENCY_SYMBOL}{difference:,.2f}, Assets positive: {assets_positive}"
+    }, None
+
+
+# ========== Custom Rules ==========
+
+def compile_expression_rule(rule_key: str, rule_config: dict) -> RegisteredRule:
+    """
+    Compile a config rule with a "violation_expression" into a registered rule
+
+    Args:
+        rule_key: Config key (e.g., 'rule_7')
+        rule_config: Rule entry from validation_rules_config.json
+
+    Returns:
+        RegisteredRule flagging rows where the expression is True
+    """
+    expression = rule_config["violation_expression"]
+    rule_number = rule_config.get("rule_number", 0)
+    rule_name = rule_config.get("rule_name", rule_key)
+    violation_columns = rule_config.get("violation_columns") or []
+    requires = tuple(
+        name for name in DERIVED_COLUMNS if name in expression or name in violation_columns
+    )
+
+    def evaluate(ctx: RuleContext, config: dict):
+        mask = ctx.eval_mask(expression)
+        violations_count = int(mask.sum())
+
+        violations = None
+        if violations_count:
+            columns = config.get("violation_columns") or ["GL_Code", "Description", "Balance"]
+            violations = pd.DataFrame(
+                {col: (ctx.df[col] if col in ctx.df.columns else ctx.column(col))[mask] for col in columns}
+            )
+
+        return {
+            "rule_number": rule_number,
+            "rule_name": rule_name,
+            "status": _status(violations_count == 0),
+            "total_records": len(ctx.df),
+            "violations_count": violations_count,
+            "is_compliant": violations_count == 0,
+            "details": f"Found {violations_count} records matching: {expression}"
+        }, violations
+
+    return RegisteredRule(rule_key, rule_number, rule_name, evaluate, requires)
+
+
+def resolve_rules(rules_config: dict) -> Tuple[List[Tuple[RegisteredRule, dict]], List[str]]:
+    """
+    Pick the enabled rules from a validation rules config
+
+    Args:
+        rules_config: Parsed validation_rules_config.json
+
+    Returns:
+        ([(rule, rule_config)] in config order, [keys with no implementation])
+    """
+    rules, unknown = [], []
+    for rule_key, rule_config in rules_config.get('validation_rules', {}).items():
+        if not rule_config.get('enabled', True):
+            continue
+        if rule_config.get("violation_expression"):
+            rules.append((compile_expression_rule(rule_key, rule_config), rule_config))
+        elif rule_key in RULE_REGISTRY:
+            rules.append((RULE_REGISTRY[rule_key], rule_config))
+        else:
+            unknown.append(rule_key)
+    return rules, unknown
+
+
+def evaluate_rules(df: pd.DataFrame, rules: List[Tuple[RegisteredRule, dict]],
+                   tolerance_pct: float, abs_tolerance: float,
+                   parallel: bool = False, max_workers: int = 4
+                   ) -> Tuple[Dict[str, dict], Dict[str, pd.DataFrame], float]:
+    """
+    Evaluate rules over a trial balance
+
+    Derived columns needed by any rule are built once up front, then every rule
+    reads from them. Rules don't depend on each other, so with parallel=True
+    they run on a thread pool (pandas/numpy release the GIL for most kernels).
+
+    Args:
+        df: Loaded trial balance
+        rules: Rules from resolve_rules
+        tolerance_pct: Percentage tolerance as a decimal fraction
+        abs_tolerance: Absolute tolerance for row-level checks
+        parallel: Run rules concurrently
+        max_workers: Thread pool size when parallel
+
+    Returns:
+        (results by rule key with 'elapsed_ms', violations by rule key, prepare time in ms)
+    """
+    ctx = RuleContext(df, tolerance_pct, abs_tolerance)
+
+    start = time.perf_counter()
+    ctx.prepare(dict.fromkeys(name for rule, _ in rules for name in rule.requires))
+    prepare_ms = (time.perf_counter() - start) * 1000
+
+    def run(rule: RegisteredRule, rule_config: dict):
+        rule_start = time.perf_counter()
+        result, violations = rule.evaluate(ctx, rule_config)
+        result["elapsed_ms"] = round((time.perf_counter() - rule_start) * 1000, 3)
+        return result, violations
+
+    if parallel and len(rules) > 1:
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            outcomes = list(executor.map(lambda item: run(*item), rules))
+    else:
+        outcomes = [run(rule, rule_config) for rule, rule_config in rules]
+
+    results, violations = {}, {}
+    for (rule, _), (result, rule_violations) in zip(rules, outcomes):
+        results[rule.key] = result
+        if rule_violations is not None and len(rule_violations) > 0:
+            violations[rule.key] = rule_violations
+
+    return results, violations, prepare_ms
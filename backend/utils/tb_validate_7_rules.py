@@ -29,15 +29,11 @@ Integration: Step 5 in the Trial Balance Processing workflow
 """
 
 import pandas as pd
-import numpy as np
 import os
 import json
 import sys
 from pathlib import Path
 from datetime import datetime
-from openpyxl import load_workbook
-from openpyxl.styles import PatternFill, Font, Alignment, Border, Side
-from openpyxl.utils.dataframe import dataframe_to_rows
 
 # Add project root to Python path for imports
 project_root = Path(__file__).parent.parent.parent
@@ -46,14 +42,17 @@ if str(project_root) not in sys.path:
 
 # Import PathService from services
 from backend.services.path_service import PathService
+from backend.utils.tb_rule_registry import (
+    CURRENCY_SYMBOL,
+    RULE_REGISTRY,
+    evaluate_rules,
+    resolve_rules,
+)
+from backend.utils.workbook_cache import read_excel_cached
 
 # Default tolerance for floating-point comparisons (can be overridden by config)
 DEFAULT_TOLERANCE = 0.01
 
-# Currency symbol for reporting
-CURRENCY_SYMBOL = "₹"
-
-
 def load_validation_rules_config(entity: str) -> dict:
     """
     Load entity-specific validation rules configuration.
@@ -313,6 +312,7 @@ class TrialBalanceValidator:
         self.df = None
         self.validation_results = {}
         self.violations = {}
+        self.prepare_ms = 0.0
     
     def _find_final_trial_balance(self):
         """
@@ -352,7 +352,7 @@ class TrialBalanceValidator:
         
         if file_ext in ['.xlsx', '.xls', '.xlsb']:
             # Read Excel file
-            self.df = pd.read_excel(self.input_file)
+            self.df = read_excel_cached(self.input_file)
             print(f"✓ Loaded Excel file with {len(self.df)} records")
         elif file_ext == '.csv':
             # Read CSV, skipping comment lines (lines starting with #)
@@ -403,47 +403,13 @@ class TrialBalanceValidator:
         # If Debit and Credit columns don't exist, calculate them from Balance
         if "Debit" not in self.df.columns or "Credit" not in self.df.columns:
             print("  Calculating Debit/Credit columns from Balance...")
-            self.df["Debit"] = self.df["Balance"].apply(lambda x: x if x > 0 else 0)
-            self.df["Credit"] = self.df["Balance"].apply(lambda x: abs(x) if x < 0 else 0)
+            self.df["Debit"] = self.df["Balance"].clip(lower=0)
+            self.df["Credit"] = (-self.df["Balance"]).clip(lower=0)
         
         print(f"  Columns: {list(self.df.columns)}")
         
         return self.df
     
-    def get_account_type(self, gl_code):
-        """
-        Determine account type based on GL code prefix (simplified)
-        - 1xxxxx: Asset accounts
-        - 2xxxxx: Liability accounts
-        - 3xxxxx: Revenue accounts
-        - 4xxxxx: Expense accounts
-        - 5xxxxx: Equity accounts
-        Returns: account type string
-        """
-        if pd.isna(gl_code):
-            return "Unknown"
-        
-        gl_str = str(gl_code).strip()
-        
-        # Get first digit
-        if len(gl_str) == 0:
-            return "Unknown"
-        
-        first_digit = gl_str[0]
-        
-        if first_digit == '1':
-            return "Asset"
-        elif first_digit == '2':
-            return "Liability"
-        elif first_digit == '3':
-            return "Revenue"
-        elif first_digit == '4':
-            return "Expense"
-        elif first_digit == '5':
-            return "Equity"
-        else:
-            return "Unknown"
-    
     def is_share_capital_account(self, gl_code):
         """
         Detect Share Capital accounts (starting with 500000)
@@ -455,173 +421,72 @@ class TrialBalanceValidator:
         gl_str = str(gl_code).strip()
         return gl_str.startswith('500000')
     
-    def rule_1_total_debits_equal_credits(self):
+    def _run_rules(self, rules):
         """
-        Rule 1: Total Debits Equal Total Credits
-        The sum of all debit amounts must equal the sum of all credit amounts.
+        Evaluate registry rules over the loaded TB and store results/violations
+        Returns: dict of rule key -> result
         """
+        engine_config = self.rules_config.get('rule_engine', {})
+        results, violations, prepare_ms = evaluate_rules(
+            self.df, rules, self.tolerance_pct, self.abs_tolerance,
+            parallel=engine_config.get('parallel', False),
+            max_workers=engine_config.get('max_workers', 4)
+        )
+        self.validation_results.update(results)
+        for rule, _ in rules:
+            self.violations.pop(rule.key, None)
+        self.violations.update(violations)
+        self.prepare_ms = prepare_ms
+        return results
+    
+    def _print_rule_result(self, rule_key, result):
+        """Print a rule's status, counts and a sample of its violations"""
         print("\n" + "="*80)
-        print("RULE 1: Total Debits Equal Total Credits")
+        print(f"RULE {result['rule_number']}: {result['rule_name']}")
         print("="*80)
+        print(result["details"])
+        print(f"Status: {result['status']}  ({result['elapsed_ms']:.1f} ms)")
         
-        total_debits = self.df["Debit"].sum()
-        total_credits = self.df["Credit"].sum()
-        difference = total_debits - total_credits
-        
-        # Use percentage-based allowed variance based on total debits (if available)
-        allowed_variance = abs(total_debits) * self.tolerance_pct if abs(total_debits) > 0 else self.abs_tolerance
-        is_balanced = abs(difference) <= allowed_variance
-        
-        result = {
-            "rule_number": 1,
-            "rule_name": "Total Debits Equal Total Credits",
-            "status": "✓ PASS" if is_balanced else "✗ FAIL",
-            "total_debits": total_debits,
-            "total_credits": total_credits,
-            "difference": difference,
-            "tolerance_pct": self.tolerance_pct,
-            "allowed_variance": allowed_variance,
-            "is_compliant": is_balanced,
-            "details": f"Debits: {CURRENCY_SYMBOL}{total_debits:,.2f}, Credits: {CURRENCY_SYMBOL}{total_credits:,.2f}, Difference: {CURRENCY_SYMBOL}{difference:,.2f}"
-        }
-        
-        print(f"Total Debits:     {CURRENCY_SYMBOL}{total_debits:>20,.2f}")
-        print(f"Total Credits:    {CURRENCY_SYMBOL}{total_credits:>20,.2f}")
-        print(f"Difference:       {CURRENCY_SYMBOL}{difference:>20,.2f}")
-        print(f"Tolerance pct:    {self.tolerance_pct*100:.6f}% (amount allowed: {CURRENCY_SYMBOL}{allowed_variance:,.2f})")
-        print(f"Status: {result['status']}")
-        
-        self.validation_results["rule_1"] = result
+        violations = self.violations.get(rule_key)
+        if violations is not None and len(violations) > 0:
+            print(f"\nSample violations (first 5):")
+            for _, row in violations.head(5).iterrows():
+                print("  " + ", ".join(f"{col}: {row[col]}" for col in violations.columns[:4]))
+    
+    def _run_registered_rule(self, rule_key):
+        """Run one built-in rule on its own and print its result"""
+        rule_config = self.rules_config.get('validation_rules', {}).get(rule_key, {})
+        result = self._run_rules([(RULE_REGISTRY[rule_key], rule_config)])[rule_key]
+        self._print_rule_result(rule_key, result)
         return result
     
+    def rule_1_total_debits_equal_credits(self):
+        """
+        Rule 1: Total Debits Equal Total Credits
+        The sum of all debit amounts must equal the sum of all credit amounts.
+        """
+        return self._run_registered_rule("rule_1")
+    
     def rule_2_balance_calculation_accuracy(self):
         """
         Rule 2: Balance Calculation Accuracy
         Each row's Balance must equal (Debit - Credit).
         """
-        print("\n" + "="*80)
-        print("RULE 2: Balance Calculation Accuracy")
-        print("="*80)
-        
-        # Calculate expected balance: Balance = Debit - Credit
-        self.df["Computed_Balance"] = self.df["Debit"] - self.df["Credit"]
-        self.df["Balance_Diff"] = abs(self.df["Balance"] - self.df["Computed_Balance"])
-        
-        # Find violations using absolute rupee tolerance
-        violations = self.df[self.df["Balance_Diff"] > self.abs_tolerance].copy()
-        
-        is_compliant = len(violations) == 0
-        
-        result = {
-            "rule_number": 2,
-            "rule_name": "Balance Calculation Accuracy",
-            "status": "✓ PASS" if is_compliant else "✗ FAIL",
-            "total_records": len(self.df),
-            "violations_count": len(violations),
-            "is_compliant": is_compliant,
-            "details": f"Found {len(violations)} records with incorrect balance calculations"
-        }
-        
-        print(f"Total Records:    {len(self.df):>10}")
-        print(f"Violations:       {len(violations):>10}")
-        print(f"Status: {result['status']}")
-        
-        if len(violations) > 0:
-            print(f"\nSample violations (first 5):")
-            for idx, row in violations.head(5).iterrows():
-                print(f"  GL Code: {row['GL_Code']}, Balance: {row['Balance']:.2f}, " +
-                      f"Computed: {row['Computed_Balance']:.2f}, Diff: {row['Balance_Diff']:.2f}")
-            
-            self.violations["rule_2"] = violations[[
-                "GL_Code", "Description", "Debit", "Credit", "Balance", 
-                "Computed_Balance", "Balance_Diff"
-            ]].copy()
-        
-        self.validation_results["rule_2"] = result
-        return result
+        return self._run_registered_rule("rule_2")
     
     def rule_3_no_duplicate_accounts(self):
         """
         Rule 3: No Duplicate Accounts
         Each G/L Acct/BP Code must be unique.
         """
-        print("\n" + "="*80)
-        print("RULE 3: No Duplicate Accounts")
-        print("="*80)
-        
-        # Find duplicates
-        duplicates = self.df[self.df.duplicated(subset=["GL_Code"], keep=False)].copy()
-        duplicates = duplicates.sort_values("GL_Code")
-        
-        duplicate_codes = duplicates["GL_Code"].unique()
-        
-        is_compliant = len(duplicate_codes) == 0
-        
-        result = {
-            "rule_number": 3,
-            "rule_name": "No Duplicate Accounts",
-            "status": "✓ PASS" if is_compliant else "✗ FAIL",
-            "total_records": len(self.df),
-            "duplicate_gl_codes": len(duplicate_codes),
-            "total_duplicate_records": len(duplicates),
-            "is_compliant": is_compliant,
-            "details": f"Found {len(duplicate_codes)} GL codes with duplicates ({len(duplicates)} total records)"
-        }
-        
-        print(f"Total Records:         {len(self.df):>10}")
-        print(f"Duplicate GL Codes:    {len(duplicate_codes):>10}")
-        print(f"Total Duplicate Rows:  {len(duplicates):>10}")
-        print(f"Status: {result['status']}")
-        
-        if len(duplicates) > 0:
-            print(f"\nDuplicate GL Codes: {list(duplicate_codes[:10])}" + 
-                  ("..." if len(duplicate_codes) > 10 else ""))
-            
-            self.violations["rule_3"] = duplicates[["GL_Code", "Description", "Balance"]].copy()
-        
-        self.validation_results["rule_3"] = result
-        return result
+        return self._run_registered_rule("rule_3")
     
     def rule_4_no_missing_invalid_data(self):
         """
         Rule 4: No Missing or Invalid Data
         All rows must have valid codes, names, and numeric values.
         """
-        print("\n" + "="*80)
-        print("RULE 4: No Missing or Invalid Data")
-        print("="*80)
-        
-        # Find rows with missing or invalid data
-        issues = self.df[
-            self.df[['GL_Code', 'Description', 'Debit', 'Credit', 'Balance']].isnull().any(axis=1) |
-            ~self.df[['Debit', 'Credit', 'Balance']].apply(lambda x: x.apply(np.isreal)).all(axis=1)
-        ]
-        
-        is_compliant = len(issues) == 0
-        
-        result = {
-            "rule_number": 4,
-            "rule_name": "No Missing or Invalid Data",
-            "status": "✓ PASS" if is_compliant else "✗ FAIL",
-            "total_records": len(self.df),
-            "issues_count": len(issues),
-            "is_compliant": is_compliant,
-            "details": f"Found {len(issues)} records with missing or invalid data"
-        }
-        
-        print(f"Total Records: {len(self.df):>10}")
-        print(f"Issues Found:  {len(issues):>10}")
-        print(f"Status: {result['status']}")
-        
-        if len(issues) > 0:
-            print(f"\nSample issues (first 5):")
-            for idx, row in issues.head(5).iterrows():
-                print(f"  GL Code: {row['GL_Code']}, Description: {row.get('Description', 'N/A')}")
-            
-            self.violations["rule_4"] = issues[["GL_Code", "Description", "Debit", "Credit", "Balance"]].copy()
-        
-        self.validation_results["rule_4"] = result
-        return result
+        return self._run_registered_rule("rule_4")
     
     def rule_5_logical_balance_signs(self):
         """
@@ -634,61 +499,7 @@ class TrialBalanceValidator:
         
         Ignores zero balances.
         """
-        print("\n" + "="*80)
-        print("RULE 6: Logical Balance Signs by Account Type")
-        print("="*80)
-        
-        # Add account type column
-        self.df["Account_Type"] = self.df["GL_Code"].apply(self.get_account_type)
-        
-        violations = []
-        
-        for _, row in self.df.iterrows():
-            code = str(row['GL_Code'])
-            balance = row['Balance']
-            
-            # Skip zero or near-zero balances using absolute tolerance
-            if abs(balance) <= self.abs_tolerance:
-                continue
-            
-            # Check balance signs
-            if code.startswith('1') and balance < 0:
-                violations.append(row)
-            elif code.startswith('2') and balance > 0:
-                violations.append(row)
-            elif code.startswith('5') and balance > 0:  # Equity
-                violations.append(row)
-            elif code.startswith('3') and balance > 0:  # Revenue
-                violations.append(row)
-            elif code.startswith('4') and balance < 0:  # Expense
-                violations.append(row)
-        
-        violations_df = pd.DataFrame(violations)
-        is_compliant = len(violations_df) == 0
-        
-        result = {
-            "rule_number": 5,
-            "rule_name": "Logical Balance Signs by Account Type",
-            "status": "✓ PASS" if is_compliant else "✗ FAIL",
-            "total_records": len(self.df),
-            "violations_count": len(violations_df),
-            "is_compliant": is_compliant,
-            "details": f"Found {len(violations_df)} accounts with unexpected balance signs"
-        }
-        
-        print(f"Total Records:    {len(self.df):>10}")
-        print(f"Violations:       {len(violations_df):>10}")
-        print(f"Status: {result['status']}")
-        
-        if len(violations_df) > 0:
-            print(f"\nSample violations (first 10):")
-            for idx, row in violations_df.head(10).iterrows():
-                print(f"  {row['Account_Type']:10} GL Code: {row['GL_Code']}, Balance: {row['Balance']:>15,.2f}")
-            
-            self.violations["rule_5"] = violations_df[["GL_Code", "Description", "Account_Type", "Balance"]].copy()
-        
-        self.validation_results["rule_5"] = result
-        return result
+        return self._run_registered_rule("rule_5")
     
     def rule_6_accounting_equation(self):
         """
@@ -697,70 +508,17 @@ class TrialBalanceValidator:
         Or: Assets + Liabilities + Equity + Revenue + Expenses = 0
         Additionally: Assets should be positive
         """
-        print("\n" + "="*80)
-        print("RULE 6: Accounting Equation Validation")
-        print("="*80)
-        
-        # Ensure Account_Type column exists
-        if "Account_Type" not in self.df.columns:
-            self.df["Account_Type"] = self.df["GL_Code"].apply(self.get_account_type)
-        
-        # Calculate sums by account type
-        assets = self.df[self.df['GL_Code'].astype(str).str.startswith('1')]['Balance'].sum()
-        liabilities = self.df[self.df['GL_Code'].astype(str).str.startswith('2')]['Balance'].sum()
-        equity = self.df[self.df['GL_Code'].astype(str).str.startswith('5')]['Balance'].sum()
-        revenue = self.df[self.df['GL_Code'].astype(str).str.startswith('3')]['Balance'].sum()
-        expenses = self.df[self.df['GL_Code'].astype(str).str.startswith('4')]['Balance'].sum()
-        
-        # Calculate: Assets = -(Liabilities + Equity + Revenue + Expenses)
-        rhs = -(liabilities + equity + revenue + expenses)
-        difference = abs(assets - rhs)
-        # Use percentage-based tolerance relative to asset base
-        equation_tolerance = abs(assets) * self.tolerance_pct if abs(assets) > 0 else self.abs_tolerance
-        equation_balanced = difference <= equation_tolerance
-        
-        # Check if assets are positive (should be > 0)
-        assets_positive = assets > 0
-        
-        # Rule passes if equation is balanced AND assets are positive
-        is_compliant = equation_balanced and assets_positive
-        
-        result = {
-            "rule_number": 6,
-            "rule_name": "Accounting Equation Validation",
-            "status": "✓ PASS" if is_compliant else "✗ FAIL",
-            "assets": assets,
-            "liabilities": liabilities,
-            "equity": equity,
-            "revenue": revenue,
-            "expenses": expenses,
-            "rhs": rhs,
-            "difference": difference,
-            "equation_tolerance": equation_tolerance,
-            "equation_balanced": equation_balanced,
-            "assets_positive": assets_positive,
-            "is_compliant": is_compliant,
-            "details": f"Assets: {CURRENCY_SYMBOL}{assets:,.2f}, RHS: {CURRENCY_SYMBOL}{rhs:,.2f}, Diff: {CURRENCY_SYMBOL}{difference:,.2f}, Assets positive: {assets_positive}"
-        }
-        
-        print(f"Assets (1xxxxx):     {CURRENCY_SYMBOL}{assets:>15,.2f}")
-        print(f"Liabilities (2xxxxx): {CURRENCY_SYMBOL}{liabilities:>15,.2f}")
-        print(f"Equity (5xxxxx):      {CURRENCY_SYMBOL}{equity:>15,.2f}")
-        print(f"Revenue (3xxxxx):     {CURRENCY_SYMBOL}{revenue:>15,.2f}")
-        print(f"Expenses (4xxxxx):    {CURRENCY_SYMBOL}{expenses:>15,.2f}")
-        print(f"" + "=" * 60)
-        print(f"RHS [-(L+E+R+X)]:    {CURRENCY_SYMBOL}{rhs:>15,.2f}")
-        print(f"Difference:          {CURRENCY_SYMBOL}{difference:>15,.2f}")
-        print(f"Equation tolerance:  {CURRENCY_SYMBOL}{equation_tolerance:>15,.2f} ({self.tolerance_pct*100:.6f}%)")
-        print(f"Equation balanced:   {'✓ YES' if equation_balanced else '✗ NO'}")
-        print(f"Assets positive:     {'✓ YES' if assets_positive else '✗ NO'}")
-        print(f"Status: {result['status']}")
-        
-        self.validation_results["rule_6"] = result
-        return result
+        return self._run_registered_rule("rule_6")
     
     def validate_all_rules(self):
-        """Run all enabled validation rules (dynamic based on entity config)"""
+        """
+        Run all enabled validation rules (dynamic based on entity config)
+        
+        Enabled rules come from the rule registry (built-in rules and custom
+        "violation_expression" rules) and are evaluated together over shared
+        derived columns. Set "rule_engine": {"parallel": true} in the config
+        to evaluate them on a thread pool.
+        """
         print("\n" + "="*80)
         print("TRIAL BALANCE DYNAMIC RULE VALIDATION")
         print("="*80)
@@ -769,37 +527,25 @@ class TrialBalanceValidator:
         print(f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         print(f"Tolerance pct: {self.tolerance_pct*100:.6f}% | Absolute tol: {CURRENCY_SYMBOL}{self.abs_tolerance}")
 
-        # Show enabled rules
-        enabled_rules = [
-            rule_key for rule_key, rule_config in self.rules_config.get('validation_rules', {}).items()
-            if rule_config.get('enabled', True)
-        ]
-        print(f"Enabled rules: {len(enabled_rules)}/{len(self.rules_config.get('validation_rules', {}))}")
+        rules, unknown_rules = resolve_rules(self.rules_config)
+        print(f"Enabled rules: {len(rules) + len(unknown_rules)}/{len(self.rules_config.get('validation_rules', {}))}")
         print("="*80)
 
-        # Load data
-        self.load_trial_balance()
-
-        # Run enabled rules dynamically
-        rule_methods = {
-            'rule_1': self.rule_1_total_debits_equal_credits,
-            'rule_2': self.rule_2_balance_calculation_accuracy,
-            'rule_3': self.rule_3_no_duplicate_accounts,
-            'rule_4': self.rule_4_no_missing_invalid_data,
-            'rule_5': self.rule_5_logical_balance_signs,
-            'rule_6': self.rule_6_accounting_equation
-        }
+        # Load data (run() loads it before calling us)
+        if self.df is None:
+            self.load_trial_balance()
 
-        # Execute only enabled rules
-        for rule_key in enabled_rules:
-            if rule_key in rule_methods:
-                rule_config = self.rules_config['validation_rules'][rule_key]
-                print(f"\n🔍 Running {rule_key.upper()}: {rule_config.get('rule_name', 'Unknown')}")
-                if rule_config.get('notes'):
-                    print(f"   Note: {rule_config['notes']}")
-                rule_methods[rule_key]()
-            else:
-                print(f"\n⚠️  Warning: Rule method not found for {rule_key}")
+        for rule_key in unknown_rules:
+            print(f"\n⚠️  Warning: Rule method not found for {rule_key}")
+
+        # Evaluate every enabled rule in one pass over the shared derived columns
+        results = self._run_rules(rules)
+        print(f"\n✓ Evaluated {len(rules)} rules (derived columns built in {self.prepare_ms:.1f} ms)")
+
+        for rule, rule_config in rules:
+            if rule_config.get('notes'):
+                print(f"\n🔍 {rule.key.upper()} note: {rule_config['notes']}")
+            self._print_rule_result(rule.key, results[rule.key])
 
         # Show skipped rules
         skipped_rules = [
@@ -822,9 +568,9 @@ class TrialBalanceValidator:
         total_rules_run = len(self.validation_results)
         passed_rules = sum(1 for r in self.validation_results.values() if r["is_compliant"])
 
-        for key in sorted(self.validation_results.keys()):
-            result = self.validation_results[key]
-            print(f"Rule {result['rule_number']}: {result['status']:10} - {result['rule_name']}")
+        for key, result in sorted(self.validation_results.items(), key=lambda item: item[1]['rule_number']):
+            print(f"Rule {result['rule_number']}: {result['status']:10} - {result['rule_name']} "
+                  f"({result.get('elapsed_ms', 0):.1f} ms)")
 
         print("="*80)
         print(f"OVERALL COMPLIANCE: {passed_rules}/{total_rules_run} rules passed (out of {total_rules_run} enabled rules)")
@@ -846,6 +592,15 @@ class TrialBalanceValidator:
         if os.path.exists(output_file):
             os.remove(output_file)
 
+        report_df, violation_sheets = self._build_report_data()
+        self._write_excel_report(report_df, violation_sheets)
+        print(f"✓ Report saved: {self.output_file}")
+    
+    def _build_report_data(self):
+        """
+        Build the report sheet rows and the list of violation sheets
+        Returns: (report DataFrame, [(sheet name, violations DataFrame)])
+        """
         # Create comprehensive report data
         print("Creating comprehensive validation report...")
         report_data = []
@@ -1147,6 +902,35 @@ class TrialBalanceValidator:
                 "Status": ""
             })
             report_data.append({"Section": "", "Rule": "", "Metric": "", "Value": "", "Status": ""})
+
+        # Custom rules from the entity config
+        custom_rule_keys = [key for key in self.validation_results if key not in RULE_REGISTRY]
+        for rule_key in custom_rule_keys:
+            custom = self.validation_results[rule_key]
+            section = f"RULE {custom['rule_number']}"
+            report_data.append({
+                "Section": section,
+                "Rule": custom["rule_name"],
+                "Metric": "Status",
+                "Value": "",
+                "Status": custom["status"]
+            })
+            report_data.append({
+                "Section": section,
+                "Rule": "",
+                "Metric": "Violations Found",
+                "Value": custom["violations_count"],
+                "Status": ""
+            })
+            if rule_key in self.violations and len(self.violations[rule_key]) > 0:
+                report_data.append({
+                    "Section": section,
+                    "Rule": "",
+                    "Metric": "Violation Details",
+                    "Value": f"See '{section.title()} Violations' sheet",
+                    "Status": ""
+                })
+            report_data.append({"Section": "", "Rule": "", "Metric": "", "Value": "", "Status": ""})
         
         # Summary section
         total_rules = len(self.validation_results)
@@ -1185,117 +969,128 @@ class TrialBalanceValidator:
         # Create DataFrame
         report_df = pd.DataFrame(report_data)
         
-        # Create Excel writer and write main report
-        with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
-            # Main comprehensive report
-            report_df.to_excel(writer, sheet_name="Validation Report", index=False)
-            
-            # Add violation details sheets if violations exist
-            if "rule_3" in self.violations and len(self.violations["rule_3"]) > 0:
-                print("Adding Rule 3 violations sheet...")
-                self.violations["rule_3"].to_excel(writer, sheet_name="Rule 3 Violations", index=False)
-            
-            if "rule_4" in self.violations and len(self.violations["rule_4"]) > 0:
-                print("Adding Rule 4 violations sheet...")
-                self.violations["rule_4"].to_excel(writer, sheet_name="Rule 4 Violations", index=False)
-            
-            if "rule_5" in self.violations and len(self.violations["rule_5"]) > 0:
-                print("Adding Rule 5 violations sheet...")
-                self.violations["rule_5"].to_excel(writer, sheet_name="Rule 5 Violations", index=False)
-            
-            if "rule_6" in self.violations and len(self.violations["rule_6"]) > 0:
-                print("Adding Rule 6 violations sheet...")
-                self.violations["rule_6"].to_excel(writer, sheet_name="Rule 6 Violations", index=False)
-        
-        # Format the workbook
-        print("Formatting workbook...")
-        wb = load_workbook(self.output_file)
+        # Violation detail sheets, only for rules that found violations
+        violation_sheets = []
+        for rule_key in ["rule_3", "rule_4", "rule_5", "rule_6"] + custom_rule_keys:
+            if rule_key in self.violations and len(self.violations[rule_key]) > 0:
+                sheet_name = f"Rule {self.validation_results[rule_key]['rule_number']} Violations"
+                violation_sheets.append((sheet_name[:31], self.violations[rule_key]))
         
-        # Format main report sheet
-        if "Validation Report" in wb.sheetnames:
-            ws = wb["Validation Report"]
-            self._format_validation_report_sheet(ws)
-        
-        # Format other sheets
-        for sheet_name in wb.sheetnames:
-            ws = wb[sheet_name]
-            self._auto_adjust_columns(ws)
-        
-        wb.save(self.output_file)
-        print(f"✓ Report saved: {self.output_file}")
+        return report_df, violation_sheets
     
-    def _format_validation_report_sheet(self, worksheet):
-        """Apply formatting to the comprehensive validation report sheet"""
-        # Header formatting
-        header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-        header_font = Font(color="FFFFFF", bold=True)
-        
-        for cell in worksheet[1]:
-            cell.fill = header_fill
-            cell.font = header_font
-            cell.alignment = Alignment(horizontal="center", vertical="center")
+    def _write_excel_report(self, report_df, violation_sheets):
+        """
+        Write the report with xlsxwriter in constant_memory mode
         
-        # Section headers formatting (HEADER, RULE 1-6, SUMMARY)
-        section_fill = PatternFill(start_color="D9E1F2", end_color="D9E1F2", fill_type="solid")
-        section_font = Font(bold=True, size=11)
+        Rows are streamed to disk as they are written and styles come from a
+        handful of shared formats, so the workbook is never re-opened to be
+        formatted. Column widths are estimated from column string lengths.
+        """
+        import xlsxwriter
         
-        # Status formatting
-        pass_fill = PatternFill(start_color="C6EFCE", end_color="C6EFCE", fill_type="solid")
-        pass_font = Font(color="006100", bold=True)
-        fail_fill = PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid")
-        fail_font = Font(color="9C0006", bold=True)
+        workbook = xlsxwriter.Workbook(self.output_file, {
+            'constant_memory': True,
+            'strings_to_formulas': False,
+            'strings_to_urls': False,
+        })
+        formats = {
+            'header': workbook.add_format({
+                'bold': True, 'font_color': '#FFFFFF', 'bg_color': '#366092',
+                'align': 'center', 'valign': 'vcenter', 'border': 1
+            }),
+            'cell': workbook.add_format({'border': 1, 'align': 'left', 'valign': 'vcenter', 'text_wrap': True}),
+            'section': workbook.add_format({
+                'bold': True, 'font_size': 11, 'bg_color': '#D9E1F2',
+                'border': 1, 'align': 'left', 'valign': 'vcenter', 'text_wrap': True
+            }),
+            'pass': workbook.add_format({
+                'bold': True, 'font_color': '#006100', 'bg_color': '#C6EFCE',
+                'border': 1, 'align': 'left', 'valign': 'vcenter', 'text_wrap': True
+            }),
+            'fail': workbook.add_format({
+                'bold': True, 'font_color': '#9C0006', 'bg_color': '#FFC7CE',
+                'border': 1, 'align': 'left', 'valign': 'vcenter', 'text_wrap': True
+            }),
+            'plain_header': workbook.add_format({'bold': True, 'border': 1, 'align': 'center'}),
+        }
         
-        for row in range(2, worksheet.max_row + 1):
-            section_cell = worksheet[f"A{row}"]
-            status_cell = worksheet[f"E{row}"]
+        try:
+            self._write_validation_report_sheet(workbook, formats, report_df)
             
-            # Format section headers
-            if section_cell.value and section_cell.value in ["HEADER", "RULE 1", "RULE 2", "RULE 3", "RULE 4", "RULE 5", "RULE 6", "SUMMARY"]:
-                for col in ["A", "B", "C", "D", "E"]:
-                    cell = worksheet[f"{col}{row}"]
-                    cell.fill = section_fill
-                    cell.font = section_font
+            for sheet_name, violations_df in violation_sheets:
+                print(f"Adding {sheet_name} sheet...")
+                self._write_dataframe_sheet(workbook, sheet_name, violations_df, formats['plain_header'])
+        finally:
+            workbook.close()
+    
+    def _write_validation_report_sheet(self, workbook, formats, report_df):
+        """Write the comprehensive validation report sheet with section and status styles"""
+        worksheet = workbook.add_worksheet("Validation Report")
+        
+        # Widths must be set before rows are streamed
+        for col_idx, width in enumerate(self._estimate_column_widths(report_df)):
+            worksheet.set_column(col_idx, col_idx, width)
+        
+        worksheet.write_row(0, 0, list(report_df.columns), formats['header'])
+        
+        status_col = report_df.columns.get_loc("Status")
+        for row_idx, row in enumerate(report_df.itertuples(index=False, name=None), start=1):
+            section = str(row[0])
+            # Section headers formatting (HEADER, RULE N, SUMMARY)
+            is_section = section in ("HEADER", "SUMMARY") or section.startswith("RULE ")
+            row_format = formats['section'] if is_section else formats['cell']
             
-            # Format status cells
-            status_value = str(status_cell.value)
-            if "PASS" in status_value or "COMPLIANT" in status_value:
-                status_cell.fill = pass_fill
-                status_cell.font = pass_font
-            elif "FAIL" in status_value or "NON-COMPLIANT" in status_value:
-                status_cell.fill = fail_fill
-                status_cell.font = fail_font
+            for col_idx, value in enumerate(row):
+                cell_format = row_format
+                if col_idx == status_col:
+                    status_value = str(value)
+                    if "PASS" in status_value or "COMPLIANT" in status_value:
+                        cell_format = formats['fail'] if "NON-COMPLIANT" in status_value else formats['pass']
+                    elif "FAIL" in status_value:
+                        cell_format = formats['fail']
+                worksheet.write(row_idx, col_idx, value, cell_format)
+    
+    def _write_dataframe_sheet(self, workbook, sheet_name, df, header_format):
+        """
+        Stream a DataFrame to a new sheet row by row
         
-        # Add borders
-        thin_border = Border(
-            left=Side(style='thin'),
-            right=Side(style='thin'),
-            top=Side(style='thin'),
-            bottom=Side(style='thin')
-        )
+        Each column gets a type-specific writer up front (numbers, strings or
+        generic) so the per-cell loop does no type sniffing for clean columns.
+        """
+        worksheet = workbook.add_worksheet(sheet_name)
+        
+        for col_idx, width in enumerate(self._estimate_column_widths(df)):
+            worksheet.set_column(col_idx, col_idx, width)
+        
+        worksheet.write_row(0, 0, [str(col) for col in df.columns], header_format)
+        
+        writers, columns = [], []
+        for col in df.columns:
+            values = df[col]
+            if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values) \
+                    and not values.isna().any():
+                writers.append(worksheet.write_number)
+                columns.append(values.astype(float).tolist())
+            elif pd.api.types.is_string_dtype(values) and values.map(type).eq(str).all():
+                writers.append(worksheet.write_string)
+                columns.append(values.tolist())
+            else:
+                writers.append(worksheet.write)
+                columns.append(values.astype(object).where(values.notna(), None).tolist())
         
-        for row in worksheet.iter_rows(min_row=1, max_row=worksheet.max_row, 
-                                       min_col=1, max_col=worksheet.max_column):
-            for cell in row:
-                cell.border = thin_border
-                # Align text
-                if cell.row > 1:
-                    cell.alignment = Alignment(horizontal="left", vertical="center", wrap_text=True)
+        for row_idx, row in enumerate(zip(*columns), start=1):
+            for col_idx, (write, value) in enumerate(zip(writers, row)):
+                write(row_idx, col_idx, value)
     
-    def _auto_adjust_columns(self, worksheet):
-        """Auto-adjust column widths"""
-        for column in worksheet.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            
-            for cell in column:
-                try:
-                    if cell.value:
-                        max_length = max(max_length, len(str(cell.value)))
-                except:
-                    pass
-            
-            adjusted_width = min(max_length + 2, 50)
-            worksheet.column_dimensions[column_letter].width = adjusted_width
+    @staticmethod
+    def _estimate_column_widths(df):
+        """Estimate column widths from header and value string lengths, capped at 50"""
+        widths = []
+        for col in df.columns:
+            lengths = df[col].dropna().astype(str).str.len()
+            max_length = max(len(str(col)), int(lengths.max()) if len(lengths) else 0)
+            widths.append(min(max_length + 2, 50))
+        return widths
     
     def run(self):
         """Main execution flow"""
@@ -1393,6 +1188,10 @@ def validate_final_trial_balance(entity: str = "cpm", input_file=None, output_fi
                 "violations_count": {
                     rule_key: len(violations_df) 
                     for rule_key, violations_df in validator.violations.items()
+                },
+                "rule_timings_ms": {
+                    rule_key: result.get("elapsed_ms", 0)
+                    for rule_key, result in validator.validation_results.items()
                 }
             }
             
@@ -0,0 +1,185 @@
+"""
+Upload Sidecars
+- Uploaded trial balances and adjustments are parsed once and saved as a normalized
+  columnar sidecar next to the source: {upload dir}/.sidecar/{filename}.parquet
+- Sidecars are only written by the upload handlers; readers fall back to parsing the
+  source and never write one themselves
+- Normalization: header row detected (first row mentioning a GL code/number/account),
+  GL code column normalized with normalize_gl_code (slashes kept; callers apply
+  entity-specific rules on top), numeric-looking text columns coerced to floats
+- Parquet (memory-mapped reads) when pyarrow is installed, pandas pickle otherwise
+- A sidecar is only used while it is at least as new as its source, so re-uploading or
+  editing the workbook falls back to parsing it again
+
+Usage:
+    from backend.utils.upload_sidecar import read_sidecar, write_sidecar
+    write_sidecar(saved_path)            # upload handler, after saving the file
+    df = read_sidecar(path)              # pipeline step; None -> parse the source
+"""
+
+import os
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+
+from backend.utils.sheet_loader import load_sheet
+from backend.utils.gl_codes import normalize_gl_code
+
+try:
+    import pyarrow  # noqa: F401
+    SIDECAR_FORMAT = "parquet"
+except ImportError:
+    SIDECAR_FORMAT = "pickle"
+
+SIDECAR_DIR_NAME = ".sidecar"
+SIDECAR_SUFFIX = ".parquet" if SIDECAR_FORMAT == "parquet" else ".pkl"
+
+# Header cells that identify the GL code column
+GL_CODE_SYNONYMS = [
+    ('gl', 'code'), ('gl', 'number'), ('gl', 'no'), ('gl', 'id'),
+    ('account', 'code'), ('account', 'number'), ('acc', 'code'), ('acc', 'no')
+]
+
+
+def sidecar_path(source) -> Path:
+    """Path of the sidecar for a source file"""
+    source = Path(source)
+    return source.parent / SIDECAR_DIR_NAME / f"{source.name}{SIDECAR_SUFFIX}"
+
+
+def find_gl_code_column(df: pd.DataFrame) -> Optional[str]:
+    """Find the GL code column by header name, skipping description columns"""
+    if 'GL Code' in df.columns:
+        return 'GL Code'
+    for col in df.columns:
+        lower = str(col).lower().strip()
+        if 'desc' in lower:
+            continue
+        if any(a in lower and b in lower for a, b in GL_CODE_SYNONYMS):
+            return col
+    return None
+
+
+def _coerce_numeric(series: pd.Series) -> Optional[pd.Series]:
+    """
+    Convert an amount column stored as text to floats
+
+    Handles thousand separators, (123.45) negatives, unicode minus and stray
+    apostrophes. Returns None if any non-blank value isn't a number.
+    """
+    s = series.astype(str)
+    s = s.str.replace("\u2212", "-", regex=False).str.replace("\u2019", "'", regex=False)
+    s = s.str.strip().str.lstrip("'")
+    blank = series.isna() | s.isin(['', 'nan', 'None', 'NaN'])
+    neg_mask = s.str.match(r"^\(.*\)$")
+    parsed = pd.to_numeric(s.str.replace(r"[(),]", "", regex=True).where(~blank), errors='coerce')
+    if parsed[~blank].isna().any() or blank.all():
+        return None
+    return parsed.where(~neg_mask, -parsed.abs()).astype(float)
+
+
+def normalize_table(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Normalize a parsed upload for the sidecar
+
+    Args:
+        df: Sheet read with its header row
+
+    Returns:
+        Copy with the GL code column normalized and numeric text columns coerced
+    """
+    df = df.copy()
+    gl_col = find_gl_code_column(df)
+    if gl_col is not None:
+        df[gl_col] = normalize_gl_code(df[gl_col], keep_slash=True)
+
+    for col in df.columns:
+        if col == gl_col or pd.api.types.is_numeric_dtype(df[col]):
+            continue
+        coerced = _coerce_numeric(df[col])
+        if coerced is not None:
+            df[col] = coerced
+        elif SIDECAR_FORMAT == "parquet" and df[col].dtype == object:
+            # Parquet needs one type per column; keep mixed text columns as strings
+            df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+    return df
+
+
+def parse_source(source) -> pd.DataFrame:
+    """
+    Parse an uploaded workbook or CSV with its header row detected
+
+    Args:
+        source: Path to .xlsx/.xls/.xlsb/.csv file
+
+    Returns:
+        Parsed (not yet normalized) DataFrame
+    """
+    source = Path(source)
+    if source.suffix.lower() == '.csv':
+        return pd.read_csv(source)
+    df, _ = load_sheet(source)
+    return df
+
+
+def write_sidecar(source, df: pd.DataFrame = None) -> Optional[Path]:
+    """
+    Write the normalized sidecar for an uploaded file
+
+    Args:
+        source: Path to the uploaded file
+        df: Already parsed sheet (header applied); parsed from source if None
+
+    Returns:
+        Sidecar path, or None if it couldn't be written (the source stays usable)
+    """
+    source = Path(source)
+    target = sidecar_path(source)
+    temp = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+    try:
+        table = normalize_table(parse_source(source) if df is None else df)
+        if SIDECAR_FORMAT == "parquet" and not all(isinstance(c, str) for c in table.columns):
+            print(f"  ⚠️  Sidecar skipped for {source.name}: non-text column headers")
+            return None
+
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if SIDECAR_FORMAT == "parquet":
+            table.to_parquet(temp, index=False)
+        else:
+            table.to_pickle(temp)
+        os.replace(temp, target)
+        return target
+    except Exception as e:
+        print(f"  ⚠️  Could not write sidecar for {source.name}: {e}")
+        temp.unlink(missing_ok=True)
+        return None
+
+
+def read_sidecar(source) -> Optional[pd.DataFrame]:
+    """
+    Read the normalized sidecar for a source file
+
+    Args:
+        source: Path to the uploaded file
+
+    Returns:
+        Normalized DataFrame, or None if there is no sidecar or it is older than the source
+    """
+    target = sidecar_path(source)
+    try:
+        if target.stat().st_mtime_ns < Path(source).stat().st_mtime_ns:
+            return None
+        if SIDECAR_FORMAT == "parquet":
+            return pd.read_parquet(target, memory_map=True)
+        return pd.read_pickle(target)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print(f"  ⚠️  Ignoring unreadable sidecar {target.name}: {e}")
+        return None
+
+
+def remove_sidecar(source) -> None:
+    """Delete the sidecar of a removed source file"""
+    sidecar_path(source).unlink(missing_ok=True)
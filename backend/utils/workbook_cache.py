@@ -0,0 +1,200 @@
+"""
+Workbook Cache
+- Process-wide cache of parsed Excel sheets, shared by utils, services and routes
+- Keyed by file fingerprint (resolved path, mtime, size) plus read options such as the
+  header row, so a workbook is parsed once per change instead of once per request
+- LRU eviction within a memory budget (WORKBOOK_CACHE_MAX_MB, default 256)
+- Callers get their own copy: a shallow copy-on-write view on pandas >= 3 (or with
+  copy_on_write enabled), otherwise a deep copy, so mutating it never touches the cache
+
+Usage:
+    from backend.utils.workbook_cache import read_excel_cached
+    df = read_excel_cached(path, header=2)
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import pandas as pd
+
+# Read options that don't change the parsed result
+IGNORED_READ_OPTIONS = {'engine'}
+
+
+def _copy_on_write_enabled() -> bool:
+    """Whether pandas copy-on-write semantics are active"""
+    if int(pd.__version__.split('.')[0]) >= 3:
+        return True
+    return pd.options.mode.copy_on_write is True
+
+
+def file_fingerprint(path) -> Tuple[str, int, int]:
+    """
+    Identify a file version by resolved path, mtime and size
+
+    Args:
+        path: File path
+
+    Returns:
+        (resolved path, mtime in ns, size in bytes)
+    """
+    resolved = Path(path).resolve()
+    stat = resolved.stat()
+    return str(resolved), stat.st_mtime_ns, stat.st_size
+
+
+def _freeze(value: Any):
+    """Make read options hashable for use in a cache key"""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, set)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+class WorkbookCache:
+    """LRU cache of parsed DataFrames with a memory budget and hit/miss metrics"""
+
+    def __init__(self, max_bytes: int):
+        """
+        Initialize the cache
+
+        Args:
+            max_bytes: Memory budget for cached DataFrames
+        """
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[tuple, Tuple[pd.DataFrame, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'invalidations': 0}
+
+    def _view(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Return a caller-owned DataFrame backed by the cached one"""
+        return df.copy(deep=not _copy_on_write_enabled())
+
+    @staticmethod
+    def _key(path, read_options: Dict[str, Any]) -> tuple:
+        """Cache key: file fingerprint plus the read options that affect the result"""
+        resolved, mtime_ns, size = file_fingerprint(path)
+        options = _freeze({k: v for k, v in read_options.items() if k not in IGNORED_READ_OPTIONS})
+        return resolved, mtime_ns, size, options
+
+    def read_excel(self, path, **read_options) -> pd.DataFrame:
+        """
+        pd.read_excel with caching
+
+        Args:
+            path: Workbook path
+            **read_options: Any pd.read_excel options (header, sheet_name, nrows, ...)
+
+        Returns:
+            Parsed DataFrame owned by the caller
+        """
+        key = self._key(path, read_options)
+        resolved, mtime_ns, size = key[:3]
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._stats['hits'] += 1
+                return self._view(entry[0])
+            self._stats['misses'] += 1
+
+        df = pd.read_excel(resolved, **read_options)
+        if not isinstance(df, pd.DataFrame):
+            # sheet_name=None / list returns a dict of sheets; don't cache those
+            return df
+
+        nbytes = int(df.memory_usage(deep=True).sum())
+        with self._lock:
+            # Drop entries for older versions of the same file
+            for stale_key in [k for k in self._entries if k[0] == resolved and k[1:3] != (mtime_ns, size)]:
+                self._bytes -= self._entries.pop(stale_key)[1]
+                self._stats['invalidations'] += 1
+
+            if nbytes <= self.max_bytes and key not in self._entries:
+                self._entries[key] = (df, nbytes)
+                self._bytes += nbytes
+                while self._bytes > self.max_bytes:
+                    _, (_, evicted_bytes) = self._entries.popitem(last=False)
+                    self._bytes -= evicted_bytes
+                    self._stats['evictions'] += 1
+
+        return self._view(df)
+
+    def peek(self, path, **read_options) -> Optional[pd.DataFrame]:
+        """
+        Cached sheet if it is already parsed, without parsing it otherwise
+
+        Args:
+            path: Workbook path
+            **read_options: Same options the sheet was read with
+
+        Returns:
+            DataFrame owned by the caller, or None on a miss (not counted as a miss)
+        """
+        key = self._key(path, read_options)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            self._stats['hits'] += 1
+            return self._view(entry[0])
+
+    def invalidate(self, path) -> int:
+        """
+        Drop every cached sheet for a file
+
+        Args:
+            path: File path
+
+        Returns:
+            Number of entries removed
+        """
+        resolved = str(Path(path).resolve())
+        with self._lock:
+            keys = [k for k in self._entries if k[0] == resolved]
+            for key in keys:
+                self._bytes -= self._entries.pop(key)[1]
+            self._stats['invalidations'] += len(keys)
+        return len(keys)
+
+    def clear(self) -> None:
+        """Drop all cached sheets"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache metrics
+
+        Returns:
+            Dict with hits, misses, evictions, invalidations, hit_rate, entries and memory use
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            lookups = stats['hits'] + stats['misses']
+            stats.update({
+                'hit_rate': round(stats['hits'] / lookups, 3) if lookups else 0.0,
+                'entries': len(self._entries),
+                'memory_mb': round(self._bytes / (1024 * 1024), 2),
+                'max_memory_mb': round(self.max_bytes / (1024 * 1024), 2),
+                'copy_on_write': _copy_on_write_enabled(),
+            })
+        return stats
+
+
+# Process-wide instance
+workbook_cache = WorkbookCache(max_bytes=int(os.getenv("WORKBOOK_CACHE_MAX_MB", "256")) * 1024 * 1024)
+
+
+def read_excel_cached(path, **read_options) -> pd.DataFrame:
+    """Read an Excel sheet through the process-wide workbook cache"""
+    return workbook_cache.read_excel(path, **read_options)
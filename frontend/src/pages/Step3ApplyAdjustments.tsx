@@ -1,6 +1,6 @@
-import React, { useState } from 'react';
+import React, { useEffect, useState } from 'react';
 import { useNavigate } from 'react-router-dom';
-import { useMutation, useQuery } from 'react-query';
+import { useMutation, useQuery, useQueryClient } from 'react-query';
 import {
   PlayIcon,
   CheckCircleIcon,
@@ -16,12 +16,16 @@ import { useCurrencySelection } from '../contexts/CurrencySelectionContext';
 
 const PLAINFLOW_RED = 'rgb(139, 0, 16)';
 const PLAINFLOW_RED_HOVER = 'rgb(110, 0, 13)';
+// Job status -> processing status, as the backend's status endpoint maps them
+const PROCESSING_STATUS_NAMES: Record<string, string> = { queued: 'started', running: 'processing' };
 
 const Step3ApplyAdjustments: React.FC = () => {
   const navigate = useNavigate();
+  const queryClient = useQueryClient();
   const { getCompanyName } = useEntity();
   const { currentPeriod, currentPeriodColumn } = usePeriod();
   const [processingId, setProcessingId] = useState<string | null>(null);
+  const [streamFailed, setStreamFailed] = useState(false);
   const {
     currencyInfo: ctxCurrencyInfo,
     fxRates,
@@ -81,8 +85,8 @@ const Step3ApplyAdjustments: React.FC = () => {
     }
   );
 
-  // Poll processing status
-  const { data: statusResponse } = useQuery(
+  // Processing status: pushed over server-sent events, polled only if streaming fails
+  const { data: statusResponse, refetch: refetchStatus } = useQuery(
     ['processing-status', processingId],
     () => apiService.getProcessingStatus(processingId!),
     {
@@ -104,13 +108,42 @@ const Step3ApplyAdjustments: React.FC = () => {
           setProcessingId(null);
           return false;
         }
-        return 2000;
+        return streamFailed ? 2000 : false;
       },
     }
   );
 
+  useEffect(() => {
+    if (!processingId) return;
+    setStreamFailed(false);
+    return apiService.subscribeJobEvents(processingId, {
+      onEvent: (event) => {
+        if (event.type !== 'progress' && event.type !== 'status') return;
+        // Final status comes from one refetch on 'end', which runs the completion handling above
+        if (event.type === 'status' && ['completed', 'failed'].includes(event.data?.status)) return;
+        queryClient.setQueryData(['processing-status', processingId], (prev: any) => prev && ({
+          ...prev,
+          data: {
+            ...prev.data,
+            // Same names as the polled status: queued -> started, running -> processing
+            status: event.type === 'status'
+              ? (PROCESSING_STATUS_NAMES[event.data?.status] ?? prev.data.status)
+              : 'processing',
+            progress: event.progress ?? prev.data.progress,
+            message: event.message || prev.data.message,
+          },
+        }));
+      },
+      onEnd: () => refetchStatus(),
+      onError: () => {
+        setStreamFailed(true);
+        refetchStatus();
+      },
+    });
+  }, [processingId, queryClient, refetchStatus]);
+
   const status = statusResponse?.data;
-  const isProcessing = !!processingId && status?.status === 'processing';
+  const isProcessing = !!processingId && (status?.status === 'started' || status?.status === 'processing');
 
   // Fetch currency info for the selected entity
   const convertValue = (value: number): number => {
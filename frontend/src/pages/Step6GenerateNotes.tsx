@@ -1,4 +1,4 @@
-import React, { useState, useEffect, useCallback } from 'react';
+import React, { useState, useEffect, useCallback, useRef } from 'react';
 import { useNavigate } from 'react-router-dom';
 import toast from 'react-hot-toast';
 import { apiService } from '../services/api';
@@ -21,6 +21,7 @@ const Step6GenerateNotes: React.FC = () => {
   const [generatedNote, setGeneratedNote] = useState<GenerationResponse | null>(null);
   const [batchStatus, setBatchStatus] = useState<BatchStatus | null>(null);
   const [batchId, setBatchId] = useState<string | null>(null);
+  const [streamFailed, setStreamFailed] = useState(false);
   const [batchLoading, setBatchLoading] = useState(false);
   const [loading, setLoading] = useState(true);
   const [retryCount, setRetryCount] = useState(0);
@@ -56,13 +57,58 @@ const Step6GenerateNotes: React.FC = () => {
     loadCategories();
   }, [loadCategories]);
 
-  // Poll batch status with improved error handling
+  // Toast and refresh once a batch finishes
+  const handleBatchFinished = useCallback((status: BatchStatus) => {
+    // Reload categories to show newly generated notes
+    loadCategories();
+
+    if (status.status === 'completed') {
+      const successCount = status.results.filter(r => r.success).length;
+      const failCount = status.results.filter(r => !r.success).length;
+
+      if (failCount === 0) {
+        toast.success(`✅ All ${successCount} notes generated successfully!`);
+      } else {
+        toast.success(`Batch completed: ${successCount} succeeded, ${failCount} failed`);
+      }
+    } else {
+      toast.error('Batch generation encountered errors. Check the progress modal for details.');
+    }
+  }, [loadCategories]);
+
+  const handleBatchFinishedRef = useRef(handleBatchFinished);
+  handleBatchFinishedRef.current = handleBatchFinished;
+
+  // Follow batch progress over server-sent events (each state event is a full batch status)
+  useEffect(() => {
+    if (!batchId) return;
+    setStreamFailed(false);
+    return apiService.subscribeJobEvents(batchId, {
+      onEvent: (event) => {
+        if (event.type === 'state' && event.data) {
+          setBatchStatus(event.data);
+        }
+      },
+      onEnd: async () => {
+        try {
+          const status = await apiService.getBatchStatus(batchId);
+          setBatchStatus(status);
+          handleBatchFinishedRef.current(status);
+        } catch (err) {
+          console.error('Error fetching final batch status:', err);
+        }
+      },
+      onError: () => setStreamFailed(true),
+    });
+  }, [batchId]);
+
+  // Poll batch status when streaming is unavailable
   useEffect(() => {
     let interval: NodeJS.Timeout;
     let consecutiveErrors = 0;
     const maxConsecutiveErrors = 5;
     
-    if (batchId && (batchStatus?.status === 'running' || batchStatus?.status === 'pending')) {
+    if (streamFailed && batchId && (batchStatus?.status === 'running' || batchStatus?.status === 'pending')) {
       interval = setInterval(async () => {
         try {
           const status = await apiService.getBatchStatus(batchId);
@@ -71,22 +117,7 @@ const Step6GenerateNotes: React.FC = () => {
           
           if (status.status === 'completed' || status.status === 'failed') {
             clearInterval(interval);
-            
-            // Reload categories to show newly generated notes
-            loadCategories();
-            
-            if (status.status === 'completed') {
-              const successCount = status.results.filter(r => r.success).length;
-              const failCount = status.results.filter(r => !r.success).length;
-              
-              if (failCount === 0) {
-                toast.success(`✅ All ${successCount} notes generated successfully!`);
-              } else {
-                toast.success(`Batch completed: ${successCount} succeeded, ${failCount} failed`);
-              }
-            } else {
-              toast.error('Batch generation encountered errors. Check the progress modal for details.');
-            }
+            handleBatchFinished(status);
           }
         } catch (err: any) {
           consecutiveErrors++;
@@ -103,7 +134,7 @@ const Step6GenerateNotes: React.FC = () => {
     return () => {
       if (interval) clearInterval(interval);
     };
-  }, [batchId, batchStatus?.status, loadCategories]);
+  }, [batchId, batchStatus?.status, streamFailed, handleBatchFinished]);
 
   // Generate a single note
   const handleGenerateNote = async (noteNumber: string) => {
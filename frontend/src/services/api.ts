@@ -88,6 +88,26 @@ export interface ProcessingStatus {
   };
 }
 
+// Job progress events streamed from /api/jobs/{jobId}/events
+export interface JobEvent {
+  seq: number;
+  job_id: string;
+  ts: number;
+  type: 'status' | 'progress' | 'log' | 'state' | 'note' | 'stage';
+  progress: number | null;
+  message: string;
+  data: any;
+}
+
+export interface JobEventHandlers {
+  onSnapshot?: (job: any) => void;
+  onEvent?: (event: JobEvent) => void;
+  onEnd?: (job: any) => void;
+  onError?: () => void;
+}
+
+const JOB_EVENT_TYPES = ['status', 'progress', 'log', 'state', 'note', 'stage'];
+
 export interface EntityInfo {
   code: string;
   name: string;
@@ -1552,6 +1572,33 @@ export const apiService = {
   getProcessingStatus: (processingId: string) =>
     api.get<ProcessingStatus>(`/api/process/status/${processingId}`),
 
+  // Follow a queued job (adjustments, note batch, statements) over server-sent events.
+  // EventSource reconnects on its own and resumes from the last event it received.
+  // Returns a function that closes the stream; onError fires if streaming is unavailable.
+  subscribeJobEvents: (jobId: string, handlers: JobEventHandlers): (() => void) => {
+    if (typeof EventSource === 'undefined') {
+      handlers.onError?.();
+      return () => {};
+    }
+    const source = new EventSource(`${API_BASE_URL}/api/jobs/${encodeURIComponent(jobId)}/events`);
+
+    source.addEventListener('snapshot', (e) => handlers.onSnapshot?.(JSON.parse((e as MessageEvent).data)));
+    JOB_EVENT_TYPES.forEach((type) => {
+      source.addEventListener(type, (e) => handlers.onEvent?.(JSON.parse((e as MessageEvent).data)));
+    });
+    source.addEventListener('end', (e) => {
+      source.close();
+      handlers.onEnd?.(JSON.parse((e as MessageEvent).data));
+    });
+    source.onerror = () => {
+      // CLOSED means the browser gave up (e.g. 404 or proxy without streaming)
+      if (source.readyState === EventSource.CLOSED) {
+        handlers.onError?.();
+      }
+    };
+    return () => source.close();
+  },
+
   // Get detailed adjustment information after processing
   getAdjustmentDetails: (processingId: string) =>
     api.get(`/api/adjustments/details/${processingId}`),